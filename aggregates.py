@@ -0,0 +1,306 @@
+import numpy as np
+import pandas as pd
+import analytics
+from analytics_frame import AnalyticsFrame
+
+
+def _add_counts(target, names, counts):
+    #adds the rows of counts to the arrays of target keyed by name
+    for name, row in zip(names, counts):
+        if name in target:
+            target[name] += row
+        else:
+            target[name] = row.copy()
+
+
+class CompletionTotals:
+    """
+    Mergeable done/total counts per habit and per category.
+
+    Holds two integers per habit and per category whatever the number of
+    logs, so any number of chunks can be consumed in constant memory, in any
+    order, and partial totals built on separate chunks can be merged.
+
+    Example:
+        >>> totals = CompletionTotals()
+        >>> for chunk in habit_log_dao.iter_all_habits_logs(batches= True):
+        ...     totals.update(chunk)
+        >>> totals.completion_rate()
+        (52, 18, 74.28571428571429)
+    """
+    def __init__(self) -> None:
+        self.habits = {}
+        self.categories = {}
+
+    def update(self, habit_logs):
+        """
+        Adds a chunk of logs.
+
+        Args:
+            habit_logs (list[dict]): Logs with habit_name, category_name and
+                done keys, e.g. a batch of HabitLogDAO.iter_all_habits_logs.
+
+        Returns:
+            CompletionTotals: self, for chaining.
+        """
+        return self.update_frame(AnalyticsFrame.from_logs(habit_logs))
+
+    def update_frame(self, frame):
+        """Adds a chunk already parsed into an AnalyticsFrame, returns self."""
+        for target, codes, names in ((self.habits, frame.habit_codes, frame.habit_names),
+                                     (self.categories, frame.category_codes, frame.category_names)):
+            done = np.bincount(codes, weights= frame.done, minlength= len(names)).astype(np.int64)
+            total = np.bincount(codes, minlength= len(names)).astype(np.int64)
+            _add_counts(target, names, np.column_stack([done, total]))
+        return self
+
+    def merge(self, other):
+        """Adds the totals of another CompletionTotals, returns self."""
+        _add_counts(self.habits, other.habits.keys(), other.habits.values())
+        _add_counts(self.categories, other.categories.keys(), other.categories.values())
+        return self
+
+    def completion_rate(self, habit_name = None, category_name = None):
+        """
+        Same result as analytics.completion_rate over all the consumed logs,
+        or analytics.habit_completion_rate for one habit.
+
+        Returns:
+            tuple: done (int), not_done (int), rate (float).
+        """
+        if habit_name is not None:
+            done, total = self.habits.get(habit_name, (0, 0))
+        elif category_name is not None:
+            done, total = self.categories.get(category_name, (0, 0))
+        else:
+            done, total = sum(self.categories.values(), np.zeros(2, dtype= np.int64))
+        if total == 0:
+            return 0,0,0
+        return int(done), int(total - done), (done/total)*100
+
+    def category_completion_rate(self):
+        """
+        Same result as analytics.category_completion_rate(logs, None).
+
+        Returns:
+            pd.DataFrame: Columns 'category_name', 'completed', 'total' and
+                'completion_rate', empty DataFrame without logs.
+        """
+        if not self.categories:
+            return pd.DataFrame()
+        names = sorted(self.categories)
+        counts = np.array([self.categories[name] for name in names])
+        result = pd.DataFrame({"category_name": names, "completed": counts[:, 0], "total": counts[:, 1]})
+        result["completion_rate"] = result["completed"]/result["total"]
+        return result
+
+
+class HourHistogram:
+    """
+    Mergeable 24-bin histogram of completion hours.
+
+    Args:
+        start (datetime.date, optional): First day counted.
+        end (datetime.date, optional): Last day counted.
+        habit_name (str, optional): Only the logs of this habit.
+        category_name (str, optional): Only the logs of this category.
+
+    Example:
+        >>> hours = HourHistogram(category_name= "Health")
+        >>> for chunk in habit_log_dao.iter_all_habits_logs(batches= True):
+        ...     hours.update(chunk)
+        >>> analytics.best_period(hours.result())
+        '7-8'
+    """
+    def __init__(self, start = None, end = None, habit_name = None, category_name = None) -> None:
+        self.filters = {"start": start, "end": end, "habit_name": habit_name, "category_name": category_name}
+        self.completions = np.zeros(24, dtype= np.int64)
+
+    def update(self, habit_logs):
+        """Adds the completions of a chunk of logs, returns self."""
+        return self.update_frame(AnalyticsFrame.from_logs(habit_logs))
+
+    def update_frame(self, frame):
+        """Adds a chunk already parsed into an AnalyticsFrame, returns self."""
+        self.completions += frame.productivity_histogram(**self.filters)["completions"].to_numpy()
+        return self
+
+    def merge(self, other):
+        """
+        Adds the counts of another HourHistogram with the same filters, returns self.
+
+        Raises:
+            ValueError: If the two histograms do not count the same logs.
+        """
+        if other.filters != self.filters:
+            raise ValueError("Cannot merge hour histograms with different filters.")
+        self.completions += other.completions
+        return self
+
+    def result(self):
+        """
+        Returns:
+            pd.DataFrame: Same as analytics.productivity_histogram on all the consumed logs.
+        """
+        return analytics.hour_counts_frame(self.completions)
+
+
+class StreakSummary:
+    """
+    Mergeable streak state of every habit.
+
+    For each habit only six numbers are kept: first and last completed
+    day, length of the run starting on the first day (head) and ending on
+    the last day (tail), longest run, and whether all its completions form
+    a single run. Two summaries covering successive periods merge by
+    joining the tail of the first with the head of the second when the
+    days touch, so a history is reduced in constant memory per habit.
+
+    Each chunk must extend the completions already consumed of a habit at
+    one end: all its days come before them or all after them. Chunks read
+    in date order (iter_all_habits_logs(ordered= True)) or in reverse date
+    order qualify, as do two summaries built on disjoint date ranges. A
+    chunk falling between two consumed ones raises ValueError, the gap
+    between them is no longer known once they are joined.
+
+    Example:
+        >>> streaks = StreakSummary()
+        >>> for chunk in habit_log_dao.iter_all_habits_logs(batches= True, ordered= True):
+        ...     streaks.update(chunk)
+        >>> streaks.habit_streaks(date.today())
+    """
+    FIELDS = ("first", "last", "head", "tail", "longest", "single")
+
+    def __init__(self) -> None:
+        self.habits = {}
+
+    @staticmethod
+    def _summarise(codes, days, group_count):
+        #one summary row per group from the completed days
+        if len(days) == 0:
+            return {}
+        first = np.full(group_count, days.max())
+        np.minimum.at(first, codes, days)
+        last = np.full(group_count, days.min())
+        np.maximum.at(last, codes, days)
+        #the tail is the current streak as of the last day, the head the same read backwards from the first day
+        tail, longest = analytics.grouped_streaks(codes, days, group_count, last)
+        head, _ = analytics.grouped_streaks(codes, -days, group_count, -first)
+        return {code: [int(first[code]), int(last[code]), int(head[code]), int(tail[code]), int(longest[code]),
+                       bool(last[code] - first[code] + 1 == longest[code])]
+                for code in np.unique(codes)}
+
+    @staticmethod
+    def _join(earlier, later):
+        #summary of a habit over two periods, earlier ending before later starts
+        if earlier[1] >= later[0]:
+            raise ValueError("Cannot merge streak summaries whose completions interleave, read the logs in date order.")
+        first, last, head, tail, longest, single = earlier
+        touching = last + 1 == later[0]
+        if touching:
+            longest = max(longest, later[4], tail + later[2])
+        else:
+            longest = max(longest, later[4])
+        return [
+            first,
+            later[1],
+            head + later[2] if single and touching else head,
+            tail + later[3] if later[5] and touching else later[3],
+            longest,
+            single and later[5] and touching,
+        ]
+
+    def _merge_habit(self, name, summary):
+        current = self.habits.get(name)
+        if current is None:
+            self.habits[name] = summary
+        elif current[0] <= summary[0]:
+            self.habits[name] = self._join(current, summary)
+        else:
+            self.habits[name] = self._join(summary, current)
+
+    def update(self, habit_logs):
+        """
+        Adds a chunk of logs.
+
+        Raises:
+            ValueError: If a habit's completions in the chunk do not all come
+                before or all after the ones already consumed.
+
+        Returns:
+            StreakSummary: self, for chaining.
+        """
+        return self.update_frame(AnalyticsFrame.from_logs(habit_logs))
+
+    def update_frame(self, frame):
+        """Adds a chunk already parsed into an AnalyticsFrame, returns self."""
+        done = frame.done.astype(bool)
+        summary = self._summarise(frame.habit_codes[done], frame.dates[done].astype(np.int64), len(frame.habit_names))
+        for code, row in summary.items():
+            self._merge_habit(frame.habit_names[code], row)
+        return self
+
+    def merge(self, other):
+        """Combines the summaries of another StreakSummary, returns self. See update()."""
+        for name, row in other.habits.items():
+            self._merge_habit(name, list(row))
+        return self
+
+    def habit_streaks(self, today_date = None):
+        """
+        Returns:
+            pd.DataFrame: Same as analytics.habit_streaks on all the consumed logs.
+        """
+        names = sorted(self.habits)
+        today_day = None if today_date is None else int(np.datetime64(today_date, "D").astype(np.int64))
+        current = [row[3] if today_day is not None and today_day - row[1] <= 1 else 0 for row in map(self.habits.get, names)]
+        return pd.DataFrame({
+            "habit_name": np.asarray(names, dtype= object),
+            "current_streak": np.array(current, dtype= np.int64),
+            "longest_streak": np.array([self.habits[name][4] for name in names], dtype= np.int64),
+        })
+
+
+class LogAggregates:
+    """
+    The completion totals, hour histogram and streak summary of a log stream.
+
+    Example:
+        >>> aggregates = LogAggregates.from_chunks(habit_log_dao.iter_all_habits_logs(batches= True, ordered= True))
+        >>> aggregates.totals.category_completion_rate()
+    """
+    def __init__(self) -> None:
+        self.totals = CompletionTotals()
+        self.hours = HourHistogram()
+        self.streaks = StreakSummary()
+
+    def update(self, habit_logs):
+        """Adds a chunk of logs to every aggregate, parsing it once, returns self."""
+        frame = AnalyticsFrame.from_logs(habit_logs)
+        self.totals.update_frame(frame)
+        self.hours.update_frame(frame)
+        self.streaks.update_frame(frame)
+        return self
+
+    def merge(self, other):
+        """Merges another LogAggregates into this one, returns self."""
+        self.totals.merge(other.totals)
+        self.hours.merge(other.hours)
+        self.streaks.merge(other.streaks)
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Consumes an iterable of log chunks, holding one chunk at a time.
+
+        Args:
+            chunks (Iterable[list[dict]]): e.g. HabitLogDAO.iter_all_habits_logs(batches= True, ordered= True).
+
+        Returns:
+            LogAggregates: The aggregates of all the chunks.
+        """
+        aggregates = cls()
+        for chunk in chunks:
+            aggregates.update(chunk)
+        return aggregates
@@ -1,6 +1,88 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from functools import lru_cache
+
+#Distinct dates kept by parse_date, about 180 years of days
+DATE_CACHE_SIZE = 65536
+#Day names as stored in HabitSchedule, bit i of a schedule mask is WEEKDAYS[i]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+EVERY_DAY_MASK = 0b1111111
+#Labels of the 24 hour bins of the productivity histograms
+HOUR_RANGES = [f"{h}-{h+1}" for h in range(24)]
+#_SCHEDULE_BITS[mask, weekday] is 1 if the weekday is in the mask, _SCHEDULED_BEFORE[mask, weekday]
+#counts the days of the mask earlier in the week, both indexed with 0 = Monday
+_SCHEDULE_BITS = (np.arange(EVERY_DAY_MASK + 1)[:, None] >> np.arange(7)) & 1
+_SCHEDULED_BEFORE = np.hstack([np.zeros((EVERY_DAY_MASK + 1, 1), dtype= np.int64), np.cumsum(_SCHEDULE_BITS, axis= 1)])
+
+
+@lru_cache(maxsize= DATE_CACHE_SIZE)
+def parse_date(value):
+    """
+    Parses a 'YYYY-MM-DD' string into a datetime.date, memoised.
+
+    A history holds a few thousand distinct dates repeated on every log, so
+    each string is parsed once and every later call returns the same
+    (interned) date object from a bounded LRU cache.
+
+    Example:
+        >>> parse_date("2026-03-13") is parse_date("2026-03-13")
+        True
+    """
+    return date.fromisoformat(value)
+
+@lru_cache(maxsize= DATE_CACHE_SIZE)
+def date_label(value):
+    """Memoised 'Friday - 13-03' label of a 'YYYY-MM-DD' string."""
+    return parse_date(value).strftime("%A - %d-%m")
+
+#SQL execution mode: the rate functions below also accept a HabitLogDAO in place of the
+#log dicts, and then only the rows aggregated by HabitLogDAO.aggregate_logs reach Python
+def is_sql_source(habit_logs):
+    """True when habit_logs is a DAO with aggregate_logs rather than a list of log dicts."""
+    return hasattr(habit_logs, "aggregate_logs")
+
+def _rate(done, total):
+    if total == 0:
+        return 0,0,0
+    return done, total - done, (done/total)*100
+
+def _sql_completion_rate(habit_log_dao, **filters):
+    row = habit_log_dao.aggregate_logs(**filters)[0]
+    return _rate(row["completed"], row["total"])
+
+def _sql_rates_frame(habit_log_dao, group_by, **filters):
+    rows = habit_log_dao.aggregate_logs(group_by, **filters)
+    df = pd.DataFrame(list(map(dict, rows)), columns= [*group_by, "completed", "total"])
+    df["completion_rate"] = df["completed"]/df["total"]
+    return df
 
+def best_weekday(completed):
+    """
+    Pick the most productive day out of completions per weekday.
+
+    The one tie rule of every best-day report: the most completions, ties
+    to the first day name in alphabetical order (what idxmax over a pandas
+    groupby of day names gives).
+
+    Args:
+        completed (dict): Day names mapped to their completions, only the
+            days with logs.
+
+    Returns:
+        str: Day name, None if there is no day.
+
+    Example:
+        >>> best_weekday({"Monday": 3, "Friday": 3, "Sunday": 1})
+        'Friday'
+    """
+    if not completed:
+        return None
+    return min(completed, key= lambda day: (-completed[day], day))
+
+def _sql_best_weekday(habit_log_dao, **filters):
+    rows = habit_log_dao.aggregate_logs(["weekday_name"], **filters)
+    return best_weekday({row["weekday_name"]: row["completed"] for row in rows})
 
 #For the daily
 def current_daystreak(habit_logs, today_date):
@@ -23,7 +105,7 @@ def current_daystreak(habit_logs, today_date):
     """
     if not habit_logs:
         return 0
-    dates = sorted(set(map(lambda log: datetime.strptime(log["date"], "%Y-%m-%d").date(), habit_logs)), reverse= True)
+    dates = sorted(set(map(lambda log: parse_date(log["date"]), habit_logs)), reverse= True)
     last_completed = dates[0]
 
     if (today_date - last_completed).days > 1:
@@ -59,7 +141,7 @@ def longuest_daystreak(habit_logs):
     if not habit_logs:
         return 0
     else:
-        dates = sorted(set(map(lambda log: datetime.strptime(log["date"], "%Y-%m-%d").date(), habit_logs)))
+        dates = sorted(set(map(lambda log: parse_date(log["date"]), habit_logs)))
 
         max_streak= 1 
         current_streak= 1
@@ -76,8 +158,9 @@ def completion_rate(habit_logs):
     Calculate the overall completion rate from a list of habit logs.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries, each containing
-            a 'done' key with an integer value (1 = done, 0 = not done).
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries, each containing
+            a 'done' key with an integer value (1 = done, 0 = not done), or a
+            HabitLogDAO to count them in SQL.
 
     Returns:
         tuple: A tuple containing:
@@ -90,6 +173,8 @@ def completion_rate(habit_logs):
         >>> completion_rate(logs)
         (2, 1, 66.67)
     """
+    if is_sql_source(habit_logs):
+        return _sql_completion_rate(habit_logs)
     total= len(habit_logs)
     if total ==0:
         return 0,0,0
@@ -102,8 +187,9 @@ def daily_completion_rate(habit_logs, today):
     Calculate the completion rate for a specific day.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries, each containing
-            a 'date' key in 'YYYY-MM-DD' format and a 'done' key.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries, each containing
+            a 'date' key in 'YYYY-MM-DD' format and a 'done' key, or a
+            HabitLogDAO to count them in SQL.
         today (datetime.date): The date to filter logs by.
 
     Returns:
@@ -114,7 +200,9 @@ def daily_completion_rate(habit_logs, today):
         >>> daily_completion_rate(logs, date(2026, 3, 13))
         (1, 0, 100.0)
     """
-    filtered = list(filter(lambda log: datetime.strptime(log["date"], "%Y-%m-%d").date() == today, habit_logs))
+    if is_sql_source(habit_logs):
+        return _sql_completion_rate(habit_logs, start_date= today, end_date= today)
+    filtered = list(filter(lambda log: parse_date(log["date"]) == today, habit_logs))
     return completion_rate(filtered)
 
 def productivity_comparaison(habit_logs_per_date, today_date):
@@ -136,14 +224,89 @@ def productivity_comparaison(habit_logs_per_date, today_date):
     """
     yesterday_date = today_date - timedelta(1)
 
-    today_logs = list(filter(lambda log: datetime.strptime(log["date"], "%Y-%m-%d").date() == today_date, habit_logs_per_date))
-    yesterday_logs = list(filter(lambda log: datetime.strptime(log["date"], "%Y-%m-%d").date() == yesterday_date, habit_logs_per_date))
+    #one parse per row for both days
+    dated_logs = list(map(lambda log: (parse_date(log["date"]), log), habit_logs_per_date))
+    today_logs = list(map(lambda pair: pair[1], filter(lambda pair: pair[0] == today_date, dated_logs)))
+    yesterday_logs = list(map(lambda pair: pair[1], filter(lambda pair: pair[0] == yesterday_date, dated_logs)))
 
     _, _, today_completion_rate = completion_rate(today_logs)
     _, _, yesterday_completion_rate = completion_rate(yesterday_logs)
     productivity_rate = today_completion_rate - yesterday_completion_rate
     return int(productivity_rate)
 
+def hour_histogram(hours):
+    """
+    24-bin histogram of completion hours with np.bincount.
+
+    Args:
+        hours (np.ndarray): Hour of completion of each log, negative values
+            (logs not completed) are left out.
+
+    Returns:
+        pd.DataFrame: Columns 'hour', 'hour_range' (e.g. '8-9'), 'completions'
+            and 'share' (fraction of all completions, 0 without any), one row
+            per hour of the day.
+
+    Example:
+        >>> hour_histogram(np.array([8, 8, 21, -1]))["completions"].iloc[8]
+        2
+    """
+    hours = np.asarray(hours, dtype= np.int64)
+    return hour_counts_frame(np.bincount(hours[hours >= 0], minlength= 24))
+
+def hour_counts_frame(completions):
+    """The hour_histogram DataFrame of 24 completion counts."""
+    completions = np.asarray(completions, dtype= np.int64)
+    total = completions.sum()
+    return pd.DataFrame({
+        "hour": np.arange(24),
+        "hour_range": HOUR_RANGES,
+        "completions": completions,
+        "share": completions/total if total else np.zeros(24),
+    })
+
+def best_period(histogram):
+    """Hour range with the most completions of an hour_histogram, None without any (ties to the earliest)."""
+    if histogram["completions"].sum() == 0:
+        return None
+    return histogram["hour_range"].iloc[int(np.argmax(histogram["completions"].to_numpy()))]
+
+def completion_hours(habit_logs):
+    """Hours of the 'complete_at' timestamps of logs, parsed in one vectorised conversion."""
+    complete_at = np.array(list(map(lambda log: log["complete_at"], habit_logs)), dtype= "datetime64[s]")
+    return ((complete_at - complete_at.astype("datetime64[D]")).astype(np.int64) // 3600).astype(np.int64)
+
+def productivity_histogram(habit_logs, start = None, end = None, habit_name = None, category_name = None):
+    """
+    Completions per hour of the day over any range, habit or category.
+
+    Args:
+        habit_logs (list[dict]): List of habit log dictionaries containing
+            'habit_name', 'category_name', 'date' and 'complete_at' keys.
+        start (datetime.date, optional): First day (inclusive).
+        end (datetime.date, optional): Last day (inclusive).
+        habit_name (str, optional): Only the logs of this habit.
+        category_name (str, optional): Only the logs of this category.
+
+    Returns:
+        pd.DataFrame: See hour_histogram.
+
+    Example:
+        >>> histogram = productivity_histogram(logs, date(2026, 3, 9), date(2026, 3, 15), category_name= "Health")
+        >>> best_period(histogram)
+        '7-8'
+    """
+    filtered = list(filter(lambda log: log["complete_at"] is not None
+                           and (habit_name is None or log["habit_name"] == habit_name)
+                           and (category_name is None or log["category_name"] == category_name), habit_logs))
+    dates = np.array(list(map(lambda log: log["date"], filtered)), dtype= "datetime64[D]")
+    mask = np.ones(len(filtered), dtype= bool)
+    if start is not None:
+        mask &= dates >= np.datetime64(start, "D")
+    if end is not None:
+        mask &= dates <= np.datetime64(end, "D")
+    return hour_histogram(completion_hours(filtered)[mask])
+
 def best_productivity_period(today_habit_logs):
     """
     Identify the most productive hours of the day based on completed habits.
@@ -168,15 +331,14 @@ def best_productivity_period(today_habit_logs):
     filtered = list(filter(lambda log: log["complete_at"] is not None, today_habit_logs))
     if not filtered:
         return None, None
-    filtered = (list(map(lambda log: {**log, "complete_at": datetime.strptime(log["complete_at"], "%Y-%m-%d %H:%M:%S"),
-                                      'hour': datetime.strptime(log["complete_at"],"%Y-%m-%d %H:%M:%S").hour},filtered)))
-    
-    df = pd.DataFrame(filtered)
-    bins = list(range(0,25))
-    labels = [f"{h}-{h+1}" for h in range(24)]
-    df["hour_range"] = pd.cut(df["hour"], bins, right= False, labels= labels)
-        
-    activity_per_hours = df.groupby("hour_range", observed= False).size()
+    hours = completion_hours(filtered)
+    df = pd.DataFrame(list(map(dict, filtered)))
+    df["complete_at"] = pd.to_datetime(df["complete_at"], format= "%Y-%m-%d %H:%M:%S")
+    df["hour"] = hours
+    df["hour_range"] = pd.Categorical.from_codes(hours, categories= HOUR_RANGES, ordered= True)
+
+    histogram = hour_histogram(hours)
+    activity_per_hours = pd.Series(histogram["completions"].to_numpy(), index= pd.CategoricalIndex(HOUR_RANGES, categories= HOUR_RANGES, ordered= True, name= "hour_range"))
 
     return activity_per_hours, df
 
@@ -187,8 +349,8 @@ def weekly_completion_rate(habit_logs, week_start, week_end):
     Calculate the completion rate for a specific week.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'date' and 'done' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'date' and 'done' keys, or a HabitLogDAO to count them in SQL.
         week_start (datetime.date): Start date of the week (inclusive).
         week_end (datetime.date): End date of the week (inclusive).
 
@@ -199,7 +361,9 @@ def weekly_completion_rate(habit_logs, week_start, week_end):
         >>> weekly_completion_rate(logs, date(2026, 3, 9), date(2026, 3, 15))
         (10, 4, 71.43)
     """
-    filtered = list(filter(lambda log: week_start <= datetime.strptime(log["date"], "%Y-%m-%d").date() <= week_end, habit_logs))
+    if is_sql_source(habit_logs):
+        return _sql_completion_rate(habit_logs, start_date= week_start, end_date= week_end)
+    filtered = list(filter(lambda log: week_start <= parse_date(log["date"]) <= week_end, habit_logs))
     return completion_rate(filtered)
 
 def weekly_completion_day_per_day(habit_logs, week_start, week_end):
@@ -207,8 +371,8 @@ def weekly_completion_day_per_day(habit_logs, week_start, week_end):
     Calculate the completion rate for each day of a given week.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'date' and 'done' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'date' and 'done' keys, or a HabitLogDAO to group them in SQL.
         week_start (datetime.date): Start date of the week (inclusive).
         week_end (datetime.date): End date of the week (inclusive).
 
@@ -219,18 +383,231 @@ def weekly_completion_day_per_day(habit_logs, week_start, week_end):
     Example:
         >>> df = weekly_completion_day_per_day(logs, date(2026, 3, 9), date(2026, 3, 15))
     """
-    filtered = list(filter(lambda log: week_start <=  datetime.strptime(log["date"], "%Y-%m-%d").date() <= week_end, habit_logs))
-    filtered = list(map(lambda log : {**log, 'date_label': datetime.strptime(log["date"], "%Y-%m-%d").date().strftime("%A - %d-%m")}, filtered))
+    if is_sql_source(habit_logs):
+        return _sql_rates_frame(habit_logs, ["date", "date_label"], start_date= week_start, end_date= week_end)
+    filtered = list(filter(lambda log: week_start <=  parse_date(log["date"]) <= week_end, habit_logs))
+    filtered = list(map(lambda log : {**log, 'date_label': date_label(log["date"])}, filtered))
     df = pd.DataFrame(filtered)
     result = df.groupby(["date", "date_label"])["done"].agg(completed = "sum", total ="count").reset_index()
     result["completion_rate"] = result["completed"]/result["total"]
     return result
-def weekly_best_productivity_day():
-    pass
-def weekly_best_productivity_period():
-    pass
+def weekly_best_productivity_day(habit_logs, week_start, week_end):
+    """
+    Find the day of a week with the most completed habits.
+
+    Args:
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'date' and 'done' keys, or a HabitLogDAO to group them in SQL.
+        week_start (datetime.date): Start date of the week (inclusive).
+        week_end (datetime.date): End date of the week (inclusive).
+
+    Returns:
+        str: Name of the most productive day (e.g. 'Monday'), None if the
+            week has no logs.
+
+    Example:
+        >>> weekly_best_productivity_day(logs, date(2026, 3, 9), date(2026, 3, 15))
+        'Tuesday'
+    """
+    if is_sql_source(habit_logs):
+        return _sql_best_weekday(habit_logs, start_date= week_start, end_date= week_end)
+    filtered = list(filter(lambda log: week_start <= parse_date(log["date"]) <= week_end, habit_logs))
+    if not filtered:
+        return None
+    df = pd.DataFrame(filtered)
+    df["date"]= pd.to_datetime(df["date"]).dt.day_name()
+    return best_weekday(df.groupby("date")["done"].sum().to_dict())
+def weekly_best_productivity_period(habit_logs, week_start, week_end):
+    """
+    Find the hour range with the most completions of a week.
+
+    Args:
+        habit_logs (list[dict]): List of habit log dictionaries containing
+            'date' and 'complete_at' keys.
+        week_start (datetime.date): Start date of the week (inclusive).
+        week_end (datetime.date): End date of the week (inclusive).
+
+    Returns:
+        str: Hour range like '7-8', None if nothing was completed.
+
+    Example:
+        >>> weekly_best_productivity_period(logs, date(2026, 3, 9), date(2026, 3, 15))
+        '7-8'
+    """
+    return best_period(productivity_histogram(habit_logs, week_start, week_end))
 
 #For habit
+def grouped_streaks(group_codes, day_numbers, group_count, today_day = None):
+    """
+    Current and longest streak of every group in one pass over sorted arrays.
+
+    The logs are sorted by group then day, a new run starts wherever the
+    group changes or the gap to the previous day is not exactly one, and
+    the run lengths are reduced per group. Duplicate days count once.
+
+    Args:
+        group_codes (np.ndarray): Integer group (habit) code of each completed log.
+        day_numbers (np.ndarray): Integer day number of each completed log.
+        group_count (int): Number of groups, codes go from 0 to group_count - 1.
+        today_day (int or np.ndarray, optional): Day number of today, or one
+            per group. A run ending today or the day before is the current
+            streak, no current streak if None.
+
+    Returns:
+        tuple: current (np.ndarray), longest (np.ndarray), one int per group.
+
+    Example:
+        >>> grouped_streaks(np.array([0, 0, 1]), np.array([10, 11, 11]), 2, 11)
+        (array([2, 1]), array([2, 1]))
+    """
+    current = np.zeros(group_count, dtype= np.int64)
+    longest = np.zeros(group_count, dtype= np.int64)
+    if len(day_numbers) == 0:
+        return current, longest
+    order = np.lexsort((day_numbers, group_codes))
+    codes = np.asarray(group_codes)[order]
+    days = np.asarray(day_numbers, dtype= np.int64)[order]
+    same_group = codes[1:] == codes[:-1]
+    #duplicated day of the same group
+    keep = np.ones(len(days), dtype= bool)
+    keep[1:] = ~(same_group & (days[1:] == days[:-1]))
+    codes, days = codes[keep], days[keep]
+
+    run_start = np.ones(len(days), dtype= bool)
+    run_start[1:] = (codes[1:] != codes[:-1]) | (np.diff(days) != 1)
+    starts = np.flatnonzero(run_start)
+    lengths = np.diff(np.append(starts, len(days)))
+    run_codes = codes[starts]
+    np.maximum.at(longest, run_codes, lengths)
+
+    if today_day is not None:
+        last_run = np.append(run_codes[1:] != run_codes[:-1], True)
+        last_day = days[starts + lengths - 1][last_run]
+        today = np.broadcast_to(np.asarray(today_day, dtype= np.int64), (group_count,))[run_codes[last_run]]
+        current[run_codes[last_run]] = np.where(today - last_day <= 1, lengths[last_run], 0)
+    return current, longest
+
+def habit_streaks(habit_logs, today_date = None):
+    """
+    Calculate the current and longest streak of every habit at once.
+
+    Args:
+        habit_logs (list[dict]): List of habit log dictionaries containing
+            'habit_name', 'done', and 'date' keys.
+        today_date (datetime.date, optional): Today's date for the current
+            streak, current streaks are 0 if None.
+
+    Returns:
+        pd.DataFrame: Columns 'habit_name', 'current_streak' and
+            'longest_streak', one row per habit with at least one completion.
+
+    Example:
+        >>> habit_streaks(logs, date(2026, 3, 13))
+             habit_name  current_streak  longest_streak
+        0    Meditation               0               3
+        1   Morning Run               2               7
+    """
+    done_logs = list(filter(lambda log: log["done"] == 1, habit_logs))
+    codes, names = pd.factorize(pd.Series(list(map(lambda log: log["habit_name"], done_logs)), dtype= object), sort= True)
+    days = np.array(list(map(lambda log: log["date"], done_logs)), dtype= "datetime64[D]").astype(np.int64)
+    today_day = None if today_date is None else np.datetime64(today_date, "D").astype(np.int64)
+    current, longest = grouped_streaks(codes, days, len(names), today_day)
+    return pd.DataFrame({"habit_name": np.asarray(names, dtype= object), "current_streak": current, "longest_streak": longest})
+
+def schedule_mask(days):
+    """
+    Encodes a list of day names as a 7-bit schedule mask (bit 0 = Monday).
+
+    Example:
+        >>> schedule_mask(["Monday", "Wednesday"])
+        5
+    """
+    return sum(map(lambda day: 1 << WEEKDAYS.index(day), set(days)))
+
+def scheduled_day_index(day_numbers, masks):
+    """
+    Ordinal of each day among the scheduled days of its mask.
+
+    Counts the scheduled days from the Monday before the epoch up to each
+    day with whole weeks and a per-mask prefix table, so consecutive
+    scheduled days of a habit get consecutive ordinals whatever the gap in
+    calendar days. Unscheduled days share the ordinal of the next
+    scheduled day.
+
+    Args:
+        day_numbers (np.ndarray): Days since 1970-01-01.
+        masks (np.ndarray): Schedule mask of each day, 0 is read as every day.
+
+    Returns:
+        np.ndarray: Scheduled day ordinals as int64.
+    """
+    masks = np.where(np.asarray(masks) == 0, EVERY_DAY_MASK, masks)
+    #1970-01-01 was a Thursday, count from Monday 1969-12-29
+    days_since_monday = np.asarray(day_numbers, dtype= np.int64) + 3
+    weeks, weekday = np.divmod(days_since_monday, 7)
+    return weeks * _SCHEDULED_BEFORE[masks, 7] + _SCHEDULED_BEFORE[masks, weekday]
+
+def is_scheduled_day(day_numbers, masks):
+    """Boolean array, True where the day is in its schedule mask (0 is read as every day)."""
+    masks = np.where(np.asarray(masks) == 0, EVERY_DAY_MASK, masks)
+    return _SCHEDULE_BITS[masks, (np.asarray(day_numbers, dtype= np.int64) + 3) % 7].astype(bool)
+
+def grouped_scheduled_streaks(group_codes, day_numbers, group_masks, today_day = None):
+    """
+    grouped_streaks over scheduled day ordinals instead of calendar days.
+
+    Args:
+        group_codes (np.ndarray): Integer group (habit) code of each completed log.
+        day_numbers (np.ndarray): Integer day number of each completed log.
+        group_masks (np.ndarray): Schedule mask of every group.
+        today_day (int, optional): Day number of today. A run ending on the
+            next scheduled day from today or the one before is current.
+
+    Returns:
+        tuple: current (np.ndarray), longest (np.ndarray), one int per group.
+    """
+    group_masks = np.asarray(group_masks, dtype= np.int64)
+    codes = np.asarray(group_codes, dtype= np.int64)
+    masks = group_masks[codes]
+    scheduled = is_scheduled_day(day_numbers, masks)
+    ordinals = scheduled_day_index(np.asarray(day_numbers)[scheduled], masks[scheduled])
+    today_ordinal = None if today_day is None else scheduled_day_index(np.full(len(group_masks), today_day), group_masks)
+    return grouped_streaks(codes[scheduled], ordinals, len(group_masks), today_ordinal)
+
+def schedule_streaks(habit_logs, schedule_masks, today_date = None):
+    """
+    Calculate the current and longest streak of every habit over its scheduled days only.
+
+    A Monday to Friday habit done every weekday keeps its streak over the
+    weekend, and a weekly habit done four weeks in a row has a streak of 4.
+    Completions on unscheduled days are ignored.
+
+    Args:
+        habit_logs (list[dict]): List of habit log dictionaries containing
+            'habit_name', 'done', and 'date' keys.
+        schedule_masks (dict): Habit names mapped to their schedule mask, as
+            returned by HabitDAO.fetch_schedule_masks. Missing habits are
+            read as scheduled every day.
+        today_date (datetime.date, optional): Today's date for the current
+            streak, current streaks are 0 if None.
+
+    Returns:
+        pd.DataFrame: Columns 'habit_name', 'current_streak' and
+            'longest_streak', counted in scheduled days.
+
+    Example:
+        >>> schedule_streaks(logs, {"Morning Run": schedule_mask(WEEKDAYS[:5])}, date(2026, 3, 16))
+            habit_name  current_streak  longest_streak
+        0  Morning Run              10              10
+    """
+    done_logs = list(filter(lambda log: log["done"] == 1, habit_logs))
+    codes, names = pd.factorize(pd.Series(list(map(lambda log: log["habit_name"], done_logs)), dtype= object), sort= True)
+    days = np.array(list(map(lambda log: log["date"], done_logs)), dtype= "datetime64[D]").astype(np.int64)
+    habit_masks = np.array(list(map(lambda name: schedule_masks.get(name, EVERY_DAY_MASK), names)), dtype= np.int64)
+    today_day = None if today_date is None else np.datetime64(today_date, "D").astype(np.int64)
+    current, longest = grouped_scheduled_streaks(codes, days, habit_masks, today_day)
+    return pd.DataFrame({"habit_name": np.asarray(names, dtype= object), "current_streak": current, "longest_streak": longest})
+
 def longuest_habit_streak(habit_logs):
     """
     Calculate the longest streak for each habit.
@@ -247,23 +624,8 @@ def longuest_habit_streak(habit_logs):
         >>> longuest_habit_streak(logs)
         {"Morning Run": 7, "Meditation": 3}
     """
-    done_logs = list(filter(lambda log: log["done"] == 1, habit_logs))
-    habits_names = list(set(map(lambda log: log["habit_name"], done_logs)))
-    def streak_for_habit(name):
-        dates = sorted(set(map(lambda log : datetime.strptime(log["date"], "%Y-%m-%d").date(), filter(lambda log : log["habit_name"] == name, done_logs))))
-        if not dates:
-            return 0
-        max_streak = 1
-        current_streak = 1
-        for i in range(1,len(dates)):
-            if dates[i] ==dates[i-1] + timedelta(1):
-                current_streak +=1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 1
-        return max_streak
-    
-    return dict(map(lambda name: (name, streak_for_habit(name)), habits_names))
+    streaks = habit_streaks(habit_logs)
+    return dict(zip(streaks["habit_name"], map(int, streaks["longest_streak"])))
 
 def longuest_habit_streak_by_habit(habit_logs, habit_name):
     """
@@ -281,28 +643,15 @@ def longuest_habit_streak_by_habit(habit_logs, habit_name):
         >>> longuest_habit_streak_by_habit(logs, "Morning Run")
         7
     """
-    done_logs = list(filter(lambda log: log["done"] == 1 and log["habit_name"] == habit_name, habit_logs))
-
-    dates = sorted(set(map(lambda log : datetime.strptime(log["date"], "%Y-%m-%d").date(), filter(lambda log : log["habit_name"] == habit_name, done_logs))))
-    if not dates:
-        return 0
-    max_streak = 1
-    current_streak = 1
-    for i in range(1,len(dates)):
-        if dates[i] ==dates[i-1] + timedelta(1):
-            current_streak +=1
-            max_streak = max(max_streak, current_streak)
-        else:
-            current_streak = 1
-
-    return max_streak
+    filtered = list(filter(lambda log: log["habit_name"] == habit_name, habit_logs))
+    return longuest_habit_streak(filtered).get(habit_name, 0)
 def group_habit_for_plot(habit_logs):
     """
     Group habit logs by habit name and sum completions for plotting.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'habit_name' and 'done' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'habit_name' and 'done' keys, or a HabitLogDAO to count them in SQL.
 
     Returns:
         pd.DataFrame: DataFrame with columns 'habit_name' and 'done'
@@ -311,44 +660,123 @@ def group_habit_for_plot(habit_logs):
     Example:
         >>> df = group_habit_for_plot(logs)
     """
+    if is_sql_source(habit_logs):
+        df = _sql_rates_frame(habit_logs, ["habit_name"])
+        return df[["habit_name", "completed"]].rename(columns= {"completed": "done"})
     df = pd.DataFrame(habit_logs)
     result = df.groupby("habit_name")["done"].sum().reset_index()
     return result
-def habit_productivity_plot(habit_logs, habit_name):
-    df = pd.DataFrame(habit_logs)
-    df['date'] = pd.to_datetime(df['date']).dt.date
-    #I want to do a plot who show the productivity like "you've done this habit % more this week " or less
-def habit_most_productive_period():
-    pass
+def rolling_completion_rates(daily, windows = (7, 30, 90)):
+    """
+    Rolling completion rates of a per-day series, one pass per window.
+
+    Args:
+        daily (pd.DataFrame): Columns 'completed' and 'total' indexed by
+            every day of the range, days without logs at 0.
+        windows (tuple[int]): Window lengths in days.
+
+    Returns:
+        pd.DataFrame: Columns 'date', 'window', 'completed', 'total',
+            'completion_rate' and 'week_over_week', the change of the rate
+            against 7 days before. Windows are truncated at the first day and
+            the rate is NaN for a window without logs.
+    """
+    def window_rates(window):
+        sums = daily.rolling(window, min_periods= 1).sum().astype(np.int64)
+        rate = (sums["completed"]/sums["total"].where(sums["total"] > 0))
+        return pd.DataFrame({
+            "date": daily.index,
+            "window": window,
+            "completed": sums["completed"].to_numpy(),
+            "total": sums["total"].to_numpy(),
+            "completion_rate": rate.to_numpy(),
+            "week_over_week": (rate - rate.shift(7)).to_numpy(),
+        })
+    return pd.concat(list(map(window_rates, windows)), ignore_index= True)
+
+def habit_productivity_plot(habit_logs, habit_name, windows = (7, 30, 90)):
+    """
+    Rolling 7/30/90-day completion rates of a habit, ready for plotting.
+
+    Each window is computed with one rolling sum over the habit's per-day
+    totals, so the cost grows with the number of days, not days x window.
+
+    Args:
+        habit_logs (list[dict]): List of habit log dictionaries containing
+            'habit_name', 'done', and 'date' keys.
+        habit_name (str): Name of the habit to analyse.
+        windows (tuple[int]): Window lengths in days.
+
+    Returns:
+        pd.DataFrame: Columns 'date', 'name', 'window', 'completed', 'total',
+            'completion_rate' and 'week_over_week' (see
+            rolling_completion_rates), one row per day and window from the
+            first to the last log of the habit. Empty if the habit has no logs.
+
+    Example:
+        >>> df = habit_productivity_plot(logs, "Morning Run")
+        >>> df[df["window"] == 7]["week_over_week"].iloc[-1]
+        0.2
+    """
+    columns = ["date", "name", "window", "completed", "total", "completion_rate", "week_over_week"]
+    filtered = list(filter(lambda log: log["habit_name"] == habit_name, habit_logs))
+    if not filtered:
+        return pd.DataFrame(columns= columns)
+    df = pd.DataFrame(filtered)
+    df["date"] = pd.to_datetime(df["date"])
+    daily = df.groupby("date")["done"].agg(completed = "sum", total = "count")
+    daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max(), freq= "D"), fill_value= 0)
+    result = rolling_completion_rates(daily, windows)
+    result["name"] = habit_name
+    return result[columns]
+def habit_most_productive_period(habit_logs, habit_name):
+    """
+    Find the hour range a habit is most often completed in.
+
+    Args:
+        habit_logs (list[dict]): List of habit log dictionaries containing
+            'habit_name' and 'complete_at' keys.
+        habit_name (str): Name of the habit to analyse.
+
+    Returns:
+        str: Hour range like '7-8', None if the habit was never completed.
+
+    Example:
+        >>> habit_most_productive_period(logs, "Morning Run")
+        '6-7'
+    """
+    return best_period(productivity_histogram(habit_logs, habit_name= habit_name))
 def habit_most_productive_day(habit_logs, habit_name):
     """
     Find the most productive day of the week for a specific habit.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'habit_name', 'date', and 'done' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'habit_name', 'date', and 'done' keys, or a HabitLogDAO to group
+            them in SQL.
         habit_name (str): Name of the habit to analyse.
 
     Returns:
-        str: Name of the most productive day (e.g. 'Monday').
+        str: Name of the most productive day (e.g. 'Monday'), None in SQL
+            mode if the habit has no logs.
 
     Example:
         >>> habit_most_productive_day(logs, "Morning Run")
         'Monday'
     """
+    if is_sql_source(habit_logs):
+        return _sql_best_weekday(habit_logs, habit_names= [habit_name])
     filtered = list(filter(lambda log: log["habit_name"] == habit_name, habit_logs))
     df = pd.DataFrame(filtered)
     df["date"]= pd.to_datetime(df["date"]).dt.day_name()
-    result = (df.groupby("date")["done"].sum().idxmax())
-    
-    return result
+    return best_weekday(df.groupby("date")["done"].sum().to_dict())
 def habit_completion_rate(habit_logs, habit_name):
     """
     Calculate the completion rate for a specific habit.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'habit_name' and 'done' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'habit_name' and 'done' keys, or a HabitLogDAO to count them in SQL.
         habit_name (str): Name of the habit to analyse.
 
     Returns:
@@ -358,6 +786,8 @@ def habit_completion_rate(habit_logs, habit_name):
         >>> habit_completion_rate(logs, "Morning Run")
         (5, 2, 71.43)
     """
+    if is_sql_source(habit_logs):
+        return _sql_completion_rate(habit_logs, habit_names= [habit_name])
     filtered = list(filter(lambda log: log["habit_name"] == habit_name, habit_logs))
     return completion_rate(filtered)
 
@@ -368,8 +798,9 @@ def category_completion_rate(habit_logs, date):
     Calculate the completion rate per category, with optional date filtering.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'category_name', 'done', and 'date' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'category_name', 'done', and 'date' keys, or a HabitLogDAO to
+            group them in SQL.
         date: Filtering option. Can be:
             - datetime.date: Filter for a specific day.
             - list[datetime.date]: Filter between date[0] and date[1].
@@ -382,11 +813,14 @@ def category_completion_rate(habit_logs, date):
     Example:
         >>> df = category_completion_rate(logs, date(2026, 3, 13))
     """
+    if is_sql_source(habit_logs):
+        start, end = (date[0], date[1]) if isinstance(date, list) else (date, date)
+        return _sql_rates_frame(habit_logs, ["category_name"], start_date= start, end_date= end)
     filtered = habit_logs
     if isinstance(date, list):
-        filtered = list(filter(lambda log: date[0] <= datetime.strptime(log["date"], "%Y-%m-%d").date() <= date[1], habit_logs))
+        filtered = list(filter(lambda log: date[0] <= parse_date(log["date"]) <= date[1], habit_logs))
     elif date:
-        filtered =  list(filter(lambda log: datetime.strptime(log["date"], "%Y-%m-%d").date() == date, habit_logs))
+        filtered =  list(filter(lambda log: parse_date(log["date"]) == date, habit_logs))
     
 
     df = pd.DataFrame(filtered)
@@ -408,8 +842,8 @@ def category_completion_rate_per_category(habit_logs, category_name):
     Calculate the completion rate for a specific category.
 
     Args:
-        habit_logs (list[dict]): List of habit log dictionaries containing
-            'category_name' and 'done' keys.
+        habit_logs (list[dict] | HabitLogDAO): List of habit log dictionaries containing
+            'category_name' and 'done' keys, or a HabitLogDAO to count them in SQL.
         category_name (str): Name of the category to analyse.
 
     Returns:
@@ -419,6 +853,8 @@ def category_completion_rate_per_category(habit_logs, category_name):
     Example:
         >>> df = category_completion_rate_per_category(logs, "Health")
     """
+    if is_sql_source(habit_logs):
+        return _sql_rates_frame(habit_logs, ["category_name"], category_names= [category_name])
     filtered = list(filter(lambda log: log["category_name"] == category_name, habit_logs))
     df = pd.DataFrame(filtered)
     if df.empty:
@@ -0,0 +1,836 @@
+import numpy as np
+import pandas as pd
+from analytics import EVERY_DAY_MASK, best_period, best_weekday, grouped_streaks, grouped_scheduled_streaks, hour_histogram
+
+#Day names indexed like numpy/pandas weekdays (0 = Monday)
+WEEKDAY_NAMES = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
+
+
+def _factorize(values):
+    codes, names = pd.factorize(np.asarray(values, dtype= object), sort= True)
+    return codes.astype(np.int32), np.asarray(names, dtype= object)
+
+def _to_day(value):
+    return np.datetime64(value, "D")
+
+def _habit_rows(frame):
+    #one row per habit id of the frame's logs, with the name and category code of the habit
+    habit_ids, rows = np.unique(frame.habit_ids, return_inverse= True)
+    habit_names = np.empty(len(habit_ids), dtype= object)
+    habit_names[rows] = frame.habit_names[frame.habit_codes]
+    habit_categories = np.zeros(len(habit_ids), dtype= np.int64)
+    habit_categories[rows] = frame.category_codes
+    return habit_ids, rows, habit_names, habit_categories
+
+def _best_weekday(completed, present):
+    #completions per weekday array (0 = Monday), only the days with logs compete
+    return best_weekday({str(day): count for day, count in zip(WEEKDAY_NAMES[present], completed[present])})
+
+
+class AnalyticsFrame:
+    """
+    Habit logs parsed once into typed NumPy columns for vectorised analytics.
+
+    The analytics.py functions re-filter and re-parse the raw list of log
+    dicts on every call. AnalyticsFrame parses the logs a single time into
+    datetime64 dates, hour of completion, weekday, done flags and integer
+    habit and category codes, then answers the same questions with array
+    operations. Results are identical to the matching analytics.py functions.
+
+    Args:
+        dates (np.ndarray): Log dates as datetime64[D].
+        done (np.ndarray): Completion flags as uint8.
+        complete_at (np.ndarray): Completion times as datetime64[s], NaT when not done.
+        habit_codes (np.ndarray): Index of each log's habit in habit_names.
+        habit_names (np.ndarray): Sorted habit names.
+        category_codes (np.ndarray): Index of each log's category in category_names.
+        category_names (np.ndarray): Sorted category names.
+        habit_ids (np.ndarray, optional): Habit id of each log, the habit code
+            when the logs carry no id. Habits sharing a name share a code but
+            keep their own id.
+
+    Example:
+        >>> frame = AnalyticsFrame.from_logs(habit_log_dao.fetch_all_habits_logs())
+        >>> frame.completion_rate()
+        (52, 18, 74.28571428571429)
+        >>> frame.habit_most_productive_day("Morning Run")
+        'Monday'
+    """
+    def __init__(self, dates, done, complete_at, habit_codes, habit_names, category_codes, category_names, habit_ids = None) -> None:
+        self.dates = dates
+        self.done = done
+        self.complete_at = complete_at
+        self.habit_codes = habit_codes
+        self.habit_ids = (habit_codes if habit_ids is None else habit_ids).astype(np.int64)
+        self.habit_names = habit_names
+        self.category_codes = category_codes
+        self.category_names = category_names
+        #1970-01-01 was a Thursday, shift so that 0 = Monday
+        self.weekday = ((dates.astype(np.int64) + 3) % 7).astype(np.int8)
+        completed = ~np.isnat(complete_at)
+        seconds_in_day = (complete_at - complete_at.astype("datetime64[D]")).astype(np.int64)
+        self.hour = np.where(completed, seconds_in_day // 3600, -1).astype(np.int8)
+
+    @classmethod
+    def from_logs(cls, habit_logs):
+        """
+        Builds the frame from the list of dicts of HabitLogDAO.fetch_all_habits_logs.
+
+        Args:
+            habit_logs (list[dict]): Logs with habit_name, category_name,
+                done, complete_at and date keys, and optionally habit_id.
+                None is treated as no logs.
+
+        Returns:
+            AnalyticsFrame: The parsed logs.
+        """
+        habit_logs = habit_logs or []
+        habit_codes, habit_names = _factorize([log["habit_name"] for log in habit_logs])
+        category_codes, category_names = _factorize([log["category_name"] for log in habit_logs])
+        return cls(
+            np.array([log["date"] for log in habit_logs], dtype= "datetime64[D]"),
+            np.array([1 if log["done"] else 0 for log in habit_logs], dtype= np.uint8),
+            np.array([log["complete_at"] for log in habit_logs], dtype= "datetime64[s]"),
+            habit_codes, habit_names, category_codes, category_names,
+            np.array([log["habit_id"] for log in habit_logs], dtype= np.int64) if habit_logs and "habit_id" in habit_logs[0].keys() else None,
+        )
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Builds the frame from the DataFrame of HabitLogDAO.fetch_logs_columns.
+
+        No row is converted to a Python object: the categorical codes and the
+        datetime columns are reused as they are.
+
+        Returns:
+            AnalyticsFrame: The parsed logs.
+        """
+        habit_codes, habit_names = _factorize(df["habit_name"].astype(object)) if len(df) else _factorize([])
+        category_codes, category_names = _factorize(df["category_name"].astype(object)) if len(df) else _factorize([])
+        return cls(
+            df["date"].to_numpy().astype("datetime64[D]"),
+            df["done"].to_numpy().astype(np.uint8),
+            df["complete_at"].to_numpy().astype("datetime64[s]"),
+            habit_codes, habit_names, category_codes, category_names,
+            df["habit_id"].to_numpy() if "habit_id" in df else None,
+        )
+
+    @classmethod
+    def from_dao(cls, habit_log_dao):
+        """Builds the frame straight from the columnar fetch of a HabitLogDAO."""
+        return cls.from_frame(habit_log_dao.fetch_logs_columns())
+
+    def __len__(self):
+        return len(self.dates)
+
+    # ------------------------------------------------------------------
+    # Masks
+    # ------------------------------------------------------------------
+
+    def date_mask(self, start, end = None):
+        """Boolean mask of the logs between start and end (inclusive), or on start only."""
+        start = _to_day(start)
+        end = start if end is None else _to_day(end)
+        return (self.dates >= start) & (self.dates <= end)
+
+    def habit_mask(self, habit_name):
+        """Boolean mask of the logs of one habit, all False for an unknown name."""
+        index = np.searchsorted(self.habit_names, habit_name) if len(self.habit_names) else 0
+        if index >= len(self.habit_names) or self.habit_names[index] != habit_name:
+            return np.zeros(len(self), dtype= bool)
+        return self.habit_codes == index
+
+    def category_mask(self, category_name):
+        """Boolean mask of the logs of one category, all False for an unknown name."""
+        index = np.searchsorted(self.category_names, category_name) if len(self.category_names) else 0
+        if index >= len(self.category_names) or self.category_names[index] != category_name:
+            return np.zeros(len(self), dtype= bool)
+        return self.category_codes == index
+
+    # ------------------------------------------------------------------
+    # Completion rates
+    # ------------------------------------------------------------------
+
+    def completion_rate(self, mask = None):
+        """
+        Vectorised analytics.completion_rate over the logs selected by mask.
+
+        Returns:
+            tuple: done (int), not_done (int), rate (float).
+        """
+        done = self.done if mask is None else self.done[mask]
+        total = len(done)
+        if total == 0:
+            return 0,0,0
+        completed = int(np.count_nonzero(done))
+        return completed, total - completed, (completed/total)*100
+
+    def daily_completion_rate(self, today):
+        """Vectorised analytics.daily_completion_rate."""
+        return self.completion_rate(self.date_mask(today))
+
+    def weekly_completion_rate(self, week_start, week_end):
+        """Vectorised analytics.weekly_completion_rate."""
+        return self.completion_rate(self.date_mask(week_start, week_end))
+
+    def habit_completion_rate(self, habit_name):
+        """Vectorised analytics.habit_completion_rate."""
+        return self.completion_rate(self.habit_mask(habit_name))
+
+    def weekly_completion_day_per_day(self, week_start, week_end):
+        """
+        Vectorised analytics.weekly_completion_day_per_day.
+
+        Returns:
+            pd.DataFrame: Columns 'date', 'date_label', 'completed', 'total'
+                and 'completion_rate', one row per day with logs.
+        """
+        mask = self.date_mask(week_start, week_end)
+        days, index = np.unique(self.dates[mask], return_inverse= True)
+        completed = np.bincount(index, weights= self.done[mask], minlength= len(days)).astype(np.int64)
+        total = np.bincount(index, minlength= len(days)).astype(np.int64)
+        result = pd.DataFrame({
+            "date": np.datetime_as_string(days, unit= "D").astype(object),
+            "date_label": pd.DatetimeIndex(days).strftime("%A - %d-%m"),
+            "completed": completed,
+            "total": total,
+        })
+        result["completion_rate"] = result["completed"]/result["total"]
+        return result
+
+    def category_completion_rate(self, date):
+        """
+        Vectorised analytics.category_completion_rate.
+
+        Args:
+            date: A datetime.date, a [start, end] list or None for all logs.
+
+        Returns:
+            pd.DataFrame: Columns 'category_name', 'completed', 'total' and
+                'completion_rate', empty DataFrame if no logs match.
+        """
+        if isinstance(date, list):
+            mask = self.date_mask(date[0], date[1])
+        elif date:
+            mask = self.date_mask(date)
+        else:
+            mask = np.ones(len(self), dtype= bool)
+        if not mask.any():
+            return pd.DataFrame()
+        codes = self.category_codes[mask]
+        completed = np.bincount(codes, weights= self.done[mask], minlength= len(self.category_names)).astype(np.int64)
+        total = np.bincount(codes, minlength= len(self.category_names)).astype(np.int64)
+        present = total > 0
+        result = pd.DataFrame({
+            "category_name": self.category_names[present],
+            "completed": completed[present],
+            "total": total[present],
+        })
+        result["completion_rate"] = result["completed"]/result["total"]
+        return result
+
+    def habit_most_productive_day(self, habit_name):
+        """
+        Vectorised analytics.habit_most_productive_day.
+
+        Ties resolve like the pandas version, to the first day name in
+        alphabetical order among the days the habit has logs on.
+
+        Returns:
+            str: Day name, or None if the habit has no logs.
+        """
+        mask = self.habit_mask(habit_name)
+        if not mask.any():
+            return None
+        weekday = self.weekday[mask]
+        completed = np.bincount(weekday, weights= self.done[mask], minlength= 7)
+        return _best_weekday(completed, np.bincount(weekday, minlength= 7) > 0)
+
+    def productivity_histogram(self, start = None, end = None, habit_name = None, category_name = None):
+        """
+        Vectorised analytics.productivity_histogram, one bincount over the selected hours.
+
+        Returns:
+            pd.DataFrame: Columns 'hour', 'hour_range', 'completions' and 'share'.
+        """
+        mask = np.ones(len(self), dtype= bool)
+        if start is not None:
+            mask &= self.dates >= _to_day(start)
+        if end is not None:
+            mask &= self.dates <= _to_day(end)
+        if habit_name is not None:
+            mask &= self.habit_mask(habit_name)
+        if category_name is not None:
+            mask &= self.category_mask(category_name)
+        return hour_histogram(self.hour[mask])
+
+    def weekly_best_productivity_period(self, week_start, week_end):
+        """Vectorised analytics.weekly_best_productivity_period."""
+        return best_period(self.productivity_histogram(week_start, week_end))
+
+    def habit_most_productive_period(self, habit_name):
+        """Vectorised analytics.habit_most_productive_period."""
+        return best_period(self.productivity_histogram(habit_name= habit_name))
+
+    def habit_streaks(self, today_date = None):
+        """
+        Vectorised analytics.habit_streaks.
+
+        Returns:
+            pd.DataFrame: Columns 'habit_name', 'current_streak' and
+                'longest_streak', one row per habit with at least one completion.
+        """
+        done = self.done.astype(bool)
+        today_day = None if today_date is None else _to_day(today_date).astype(np.int64)
+        current, longest = grouped_streaks(self.habit_codes[done], self.dates[done].astype(np.int64), len(self.habit_names), today_day)
+        completed = np.bincount(self.habit_codes[done], minlength= len(self.habit_names)) > 0
+        return pd.DataFrame({
+            "habit_name": self.habit_names[completed],
+            "current_streak": current[completed],
+            "longest_streak": longest[completed],
+        })
+
+    def schedule_streaks(self, schedule_masks, today_date = None):
+        """
+        Vectorised analytics.schedule_streaks.
+
+        Args:
+            schedule_masks (dict): Habit names mapped to their schedule mask.
+            today_date (datetime.date, optional): Today's date for the current streak.
+
+        Returns:
+            pd.DataFrame: Columns 'habit_name', 'current_streak' and
+                'longest_streak' counted in scheduled days.
+        """
+        done = self.done.astype(bool)
+        habit_masks = np.array([schedule_masks.get(name, EVERY_DAY_MASK) for name in self.habit_names], dtype= np.int64)
+        today_day = None if today_date is None else _to_day(today_date).astype(np.int64)
+        current, longest = grouped_scheduled_streaks(self.habit_codes[done], self.dates[done].astype(np.int64), habit_masks, today_day)
+        completed = np.bincount(self.habit_codes[done], minlength= len(self.habit_names)) > 0
+        return pd.DataFrame({
+            "habit_name": self.habit_names[completed],
+            "current_streak": current[completed],
+            "longest_streak": longest[completed],
+        })
+
+
+class CompletionIndex:
+    """
+    Per-day cumulative sums of done and scheduled logs, per habit and per category.
+
+    Rows are keyed by habit id, so habits sharing a name keep their own sums;
+    a habit_name filter adds up the rows of that name, like the analytics.py
+    functions grouping the logs by name. Row i of done_cum holds, for habit i,
+    the number of completions strictly
+    before each day of the indexed range (one extra column at the end), so
+    the totals of any [start, end] range are two lookups whatever its
+    length. The same sums are kept per category and for all habits.
+    record() applies a change in place, growing the range or the habits as
+    needed, so a long-lived index never has to be rebuilt.
+
+    Args:
+        first_day (int): Day number of the first indexed day.
+        habit_ids (np.ndarray): Habit ids, row order of the habit sums.
+        habit_names (np.ndarray): Name of every habit row, for display and name filters.
+        habit_categories (np.ndarray): Category code of every habit.
+        category_names (np.ndarray): Category names, row order of the category sums.
+        done_counts (np.ndarray): Completions per habit and day, shape (habits, days).
+        total_counts (np.ndarray): Logs per habit and day, shape (habits, days).
+
+    Example:
+        >>> index = CompletionIndex.from_frame(AnalyticsFrame.from_dao(habit_log_dao))
+        >>> index.completion_rate(week_start, week_end)
+        (20, 8, 71.42857142857143)
+        >>> index.completion_rate(week_start, week_end, category_name= "Health")
+        (9, 1, 90.0)
+    """
+    def __init__(self, first_day, habit_ids, habit_names, habit_categories, category_names, done_counts, total_counts) -> None:
+        self.first_day = int(first_day)
+        self.habit_ids = [int(habit_id) for habit_id in habit_ids]
+        self.habit_names = list(habit_names)
+        self.habit_categories = list(habit_categories)
+        self.category_names = list(category_names)
+        self._habit_rows = {habit_id: i for i, habit_id in enumerate(self.habit_ids)}
+        self._category_rows = {name: i for i, name in enumerate(self.category_names)}
+        self.done_cum = self._cumulate(done_counts)
+        self.total_cum = self._cumulate(total_counts)
+        self._aggregate()
+
+    @staticmethod
+    def _cumulate(counts):
+        counts = np.asarray(counts, dtype= np.int64)
+        return np.hstack([np.zeros((len(counts), 1), dtype= np.int64), np.cumsum(counts, axis= 1)])
+
+    def _aggregate(self):
+        #category and global rows are sums of the habit rows
+        categories = np.asarray(self.habit_categories, dtype= np.int64)
+        days = self.done_cum.shape[1]
+        self.category_done_cum = np.zeros((len(self.category_names), days), dtype= np.int64)
+        self.category_total_cum = np.zeros((len(self.category_names), days), dtype= np.int64)
+        np.add.at(self.category_done_cum, categories, self.done_cum)
+        np.add.at(self.category_total_cum, categories, self.total_cum)
+        self.all_done_cum = self.done_cum.sum(axis= 0)
+        self.all_total_cum = self.total_cum.sum(axis= 0)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Builds the index from an AnalyticsFrame with one bincount per sum.
+
+        Returns:
+            CompletionIndex: The index over the days between the first and
+                the last log of the frame.
+        """
+        day_numbers = frame.dates.astype(np.int64)
+        first_day = int(day_numbers.min()) if len(frame) else 0
+        days = int(day_numbers.max()) - first_day + 1 if len(frame) else 0
+        habit_ids, rows, habit_names, habit_categories = _habit_rows(frame)
+        habit_count = len(habit_ids)
+        cells = rows.astype(np.int64) * days + (day_numbers - first_day)
+        done_counts = np.bincount(cells, weights= frame.done, minlength= habit_count * days).reshape(habit_count, days)
+        total_counts = np.bincount(cells, minlength= habit_count * days).reshape(habit_count, days)
+        return cls(first_day, habit_ids, habit_names, habit_categories, frame.category_names, done_counts, total_counts)
+
+    @classmethod
+    def from_dao(cls, habit_log_dao):
+        """Builds the index straight from the columnar fetch of a HabitLogDAO."""
+        return cls.from_frame(AnalyticsFrame.from_dao(habit_log_dao))
+
+    @property
+    def days(self):
+        """Number of indexed days."""
+        return self.done_cum.shape[1] - 1
+
+    def _bounds(self, start, end):
+        #columns of the cumulative sums framing [start, end], clipped to the indexed days
+        first = self._day(start) - self.first_day if start is not None else 0
+        last = self._day(end) - self.first_day + 1 if end is not None else self.days
+        return int(np.clip(first, 0, self.days)), int(np.clip(max(first, last), 0, self.days))
+
+    @staticmethod
+    def _day(value):
+        return int(_to_day(value).astype(np.int64))
+
+    def _named_rows(self):
+        #sums of the habit rows added up per habit name, names sorted
+        codes, names = _factorize(self.habit_names)
+        done_cum = np.zeros((len(names), self.done_cum.shape[1]), dtype= np.int64)
+        total_cum = np.zeros((len(names), self.total_cum.shape[1]), dtype= np.int64)
+        np.add.at(done_cum, codes, self.done_cum)
+        np.add.at(total_cum, codes, self.total_cum)
+        return list(names), done_cum, total_cum
+
+    def totals(self, start = None, end = None, habit_name = None, category_name = None, habit_id = None):
+        """
+        Completions and logs between start and end (inclusive) in two lookups.
+
+        Args:
+            start (datetime.date, optional): First day, from the first log if None.
+            end (datetime.date, optional): Last day, up to the last log if None.
+            habit_name (str, optional): Restricts the totals to the habits of this name.
+            category_name (str, optional): Restricts the totals to one category.
+            habit_id (int, optional): Restricts the totals to one habit.
+
+        Returns:
+            tuple: done (int), total (int), 0 for an unknown habit or category.
+        """
+        if habit_id is not None:
+            row = self._habit_rows.get(habit_id)
+            done_cum, total_cum = (None, None) if row is None else (self.done_cum[row], self.total_cum[row])
+        elif habit_name is not None:
+            rows = [i for i, name in enumerate(self.habit_names) if name == habit_name]
+            done_cum, total_cum = (self.done_cum[rows].sum(axis= 0), self.total_cum[rows].sum(axis= 0)) if rows else (None, None)
+        elif category_name is not None:
+            row = self._category_rows.get(category_name)
+            done_cum, total_cum = (None, None) if row is None else (self.category_done_cum[row], self.category_total_cum[row])
+        else:
+            done_cum, total_cum = self.all_done_cum, self.all_total_cum
+        if done_cum is None:
+            return 0, 0
+        first, last = self._bounds(start, end)
+        return int(done_cum[last] - done_cum[first]), int(total_cum[last] - total_cum[first])
+
+    def completion_rate(self, start = None, end = None, habit_name = None, category_name = None, habit_id = None):
+        """
+        Range completion rate, same result as analytics.completion_rate on the matching logs.
+
+        Returns:
+            tuple: done (int), not_done (int), rate (float).
+        """
+        done, total = self.totals(start, end, habit_name, category_name, habit_id)
+        if total == 0:
+            return 0,0,0
+        return done, total - done, (done/total)*100
+
+    def weekly_completion_day_per_day(self, week_start, week_end):
+        """
+        AnalyticsFrame.weekly_completion_day_per_day read from the global sums.
+
+        Returns:
+            pd.DataFrame: Columns 'date', 'date_label', 'completed', 'total'
+                and 'completion_rate', one row per day with logs.
+        """
+        first, last = self._bounds(week_start, week_end)
+        completed = np.diff(self.all_done_cum[first:last + 1])
+        total = np.diff(self.all_total_cum[first:last + 1])
+        days = (np.arange(first, last) + self.first_day).astype("datetime64[D]")[total > 0]
+        result = pd.DataFrame({
+            "date": np.datetime_as_string(days, unit= "D").astype(object),
+            "date_label": pd.DatetimeIndex(days).strftime("%A - %d-%m"),
+            "completed": completed[total > 0],
+            "total": total[total > 0],
+        })
+        result["completion_rate"] = result["completed"]/result["total"]
+        return result
+
+    def category_completion_rate(self, date):
+        """
+        AnalyticsFrame.category_completion_rate in two lookups per category.
+
+        Args:
+            date: A datetime.date, a [start, end] list or None for all logs.
+
+        Returns:
+            pd.DataFrame: Columns 'category_name', 'completed', 'total' and
+                'completion_rate', without rows if no logs match.
+        """
+        if isinstance(date, list):
+            first, last = self._bounds(date[0], date[1])
+        elif date:
+            first, last = self._bounds(date, date)
+        else:
+            first, last = self._bounds(None, None)
+        completed = self.category_done_cum[:, last] - self.category_done_cum[:, first]
+        total = self.category_total_cum[:, last] - self.category_total_cum[:, first]
+        present = total > 0
+        result = pd.DataFrame({
+            "category_name": np.asarray(self.category_names, dtype= object)[present],
+            "completed": completed[present],
+            "total": total[present],
+        })
+        result["completion_rate"] = result["completed"]/result["total"]
+        return result
+
+    def rolling_completion_rates(self, windows = (7, 30, 90), by = "habit", name = None):
+        """
+        Rolling completion rates of every habit or category from the cumulative sums.
+
+        Each window ending on day d is cum[d] - cum[d - window], so all the
+        windows of all the rows cost one subtraction per day, whatever the
+        window length. Same rows as analytics.habit_productivity_plot.
+
+        Args:
+            windows (tuple[int]): Window lengths in days.
+            by (str): "habit", "category" or None for all habits together
+                (named "All").
+            name (str, optional): Restricts the result to one habit or category.
+
+        Returns:
+            pd.DataFrame: Columns 'date', 'name', 'window', 'completed',
+                'total', 'completion_rate' and 'week_over_week', one row per
+                name, window and day between the first and last log of the name.
+        """
+        if by == "habit":
+            names, done_cum, total_cum = self._named_rows()
+        elif by == "category":
+            names, done_cum, total_cum = self.category_names, self.category_done_cum, self.category_total_cum
+        else:
+            names, done_cum, total_cum = ["All"], self.all_done_cum[None, :], self.all_total_cum[None, :]
+        if name is not None:
+            rows = [i for i, row_name in enumerate(names) if row_name == name]
+            names, done_cum, total_cum = [name] * len(rows), done_cum[rows], total_cum[rows]
+        columns = np.arange(1, self.days + 1)
+        dates = (columns - 1 + self.first_day).astype("datetime64[D]")
+        #days from the first to the last log of each row
+        logged = (total_cum[:, columns] > 0) & (total_cum[:, columns - 1] < total_cum[:, -1:])
+        windows = np.asarray(windows, dtype= np.int64)
+        #shape (rows, windows, days), raveled in the name, window, date order of the result
+        previous = np.maximum(columns[None, :] - windows[:, None], 0)
+        completed = done_cum[:, columns][:, None, :] - done_cum[:, previous]
+        total = total_cum[:, columns][:, None, :] - total_cum[:, previous]
+        rate = np.divide(completed, total, out= np.full(total.shape, np.nan), where= total > 0)
+        week_over_week = np.full(rate.shape, np.nan)
+        week_over_week[..., 7:] = rate[..., 7:] - rate[..., :-7]
+        shape = (len(names), len(windows), len(columns))
+        keep = np.broadcast_to(logged[:, None, :], shape).ravel()
+        return pd.DataFrame({
+            "date": np.broadcast_to(dates, shape).ravel()[keep],
+            "name": np.broadcast_to(np.asarray(names, dtype= object)[:, None, None], shape).ravel()[keep],
+            "window": np.broadcast_to(windows[None, :, None], shape).ravel()[keep],
+            "completed": completed.ravel()[keep],
+            "total": total.ravel()[keep],
+            "completion_rate": rate.ravel()[keep],
+            "week_over_week": week_over_week.ravel()[keep],
+        })
+
+    def week_over_week(self, end, by = "habit"):
+        """
+        Completion rate of the 7 days ending on end against the 7 days before.
+
+        Args:
+            end (datetime.date): Last day of the current week window.
+            by (str): "habit", "category" or None for all habits together.
+
+        Returns:
+            pd.DataFrame: Columns 'name', 'this_week', 'last_week' and 'delta',
+                rates as fractions, NaN for a week without logs.
+        """
+        if by == "habit":
+            names = self._named_rows()[0]
+            totals = lambda start, stop, name: self.totals(start, stop, habit_name= name)
+        elif by == "category":
+            names = self.category_names
+            totals = lambda start, stop, name: self.totals(start, stop, category_name= name)
+        else:
+            names = ["All"]
+            totals = lambda start, stop, name: self.totals(start, stop)
+        end = _to_day(end)
+        def rate(start, stop, name):
+            done, total = totals(start, stop, name)
+            return done/total if total else np.nan
+        this_week = np.array([rate(end - 6, end, name) for name in names], dtype= float)
+        last_week = np.array([rate(end - 13, end - 7, name) for name in names], dtype= float)
+        return pd.DataFrame({"name": np.asarray(names, dtype= object), "this_week": this_week, "last_week": last_week, "delta": this_week - last_week})
+
+    def _grow(self, day):
+        #extends the indexed range so that it covers day
+        if self.days == 0:
+            self.first_day = day
+        before = max(self.first_day - day, 0)
+        after = max(day - (self.first_day + self.days - 1), 0)
+        if before == 0 and after == 0:
+            return
+        #the first column is always 0 and the last one the running total, repeating them pads correctly
+        for name in ("done_cum", "total_cum", "category_done_cum", "category_total_cum", "all_done_cum", "all_total_cum"):
+            cum = getattr(self, name)
+            setattr(self, name, np.pad(cum, [(0, 0)] * (cum.ndim - 1) + [(before, after)], mode= "edge"))
+        self.first_day -= before
+
+    def _row(self, rows, keys, key, *arrays):
+        #row of key, appending an empty row to every array for a new key
+        if key not in rows:
+            rows[key] = len(keys)
+            keys.append(key)
+            for attribute in arrays:
+                cum = getattr(self, attribute)
+                setattr(self, attribute, np.vstack([cum, np.zeros((1, cum.shape[1]), dtype= np.int64)]))
+        return rows[key]
+
+    def record(self, day, habit_id, habit_name, category_name, done = 0, total = 0):
+        """
+        Applies a log change to the sums in place.
+
+        Args:
+            day (datetime.date): Day of the log.
+            habit_id (int): Habit of the log, added if unknown.
+            habit_name (str): Name of the habit, used when it is added.
+            category_name (str): Category of the habit, added if unknown.
+            done (int): Change in completions, e.g. 1 when a habit is checked.
+            total (int): Change in logs, e.g. 1 for a new log.
+
+        Example:
+            >>> index.record(date.today(), 1, "Morning Run", "Health", done= 1)
+        """
+        day = self._day(day)
+        self._grow(day)
+        category = self._row(self._category_rows, self.category_names, category_name, "category_done_cum", "category_total_cum")
+        habit = self._row(self._habit_rows, self.habit_ids, habit_id, "done_cum", "total_cum")
+        if habit == len(self.habit_categories):
+            self.habit_names.append(habit_name)
+            self.habit_categories.append(category)
+        column = day - self.first_day + 1
+        for cum, row, delta in ((self.done_cum, habit, done), (self.total_cum, habit, total),
+                                (self.category_done_cum, category, done), (self.category_total_cum, category, total)):
+            cum[row, column:] += delta
+        self.all_done_cum[column:] += done
+        self.all_total_cum[column:] += total
+
+
+class ActivityCube:
+    """
+    Habit x week x weekday cube of the logs, with the hour of completion.
+
+    HabitLog holds at most one log per habit and day, so every cell of the
+    (habit, category, week, weekday, hour) count cube is 0 or 1 and the
+    cube is stored as the hour code of each (habit, week, weekday) cell:
+    0 to 23 for a completion at that hour, DONE_NO_HOUR for a completion
+    without time, NOT_DONE for a missed log and NO_LOG for no log. The
+    category is the one of the habit. The habit axis is keyed by habit id,
+    so habits sharing a name keep their own cells; a habit_name filter
+    selects every habit of that name. Per-weekday counts, best days and
+    hour heatmaps are counts over slices of it, and record() updates a cell
+    in place on writes.
+
+    Args:
+        first_week (int): Number of the first week, counted in weeks since
+            Monday 1969-12-29.
+        habit_ids (np.ndarray): Habit ids, first axis of cells.
+        habit_names (np.ndarray): Name of every habit, for display and name filters.
+        habit_categories (np.ndarray): Category code of every habit.
+        category_names (np.ndarray): Category names.
+        cells (np.ndarray): int8 hour codes of shape (habits, weeks, 7).
+
+    Example:
+        >>> cube = ActivityCube.from_frame(AnalyticsFrame.from_dao(habit_log_dao))
+        >>> cube.weekly_best_productivity_day(week_start)
+        'Tuesday'
+        >>> cube.hour_heatmap(habit_name= "Morning Run")
+    """
+    NO_LOG = -2
+    NOT_DONE = -1
+    DONE_NO_HOUR = 24
+
+    def __init__(self, first_week, habit_ids, habit_names, habit_categories, category_names, cells) -> None:
+        self.first_week = int(first_week)
+        self.habit_ids = [int(habit_id) for habit_id in habit_ids]
+        self.habit_names = list(habit_names)
+        self.habit_categories = np.asarray(habit_categories, dtype= np.int64)
+        self.category_names = list(category_names)
+        self._habit_rows = {habit_id: i for i, habit_id in enumerate(self.habit_ids)}
+        self._category_rows = {name: i for i, name in enumerate(self.category_names)}
+        self.cells = cells
+
+    @staticmethod
+    def _week(day_number):
+        #weeks since Monday 1969-12-29, 1970-01-01 was a Thursday
+        return (day_number + 3) // 7
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Builds the cube from an AnalyticsFrame with one scatter of the hour codes.
+
+        Returns:
+            ActivityCube: The cube over the weeks between the first and the
+                last log of the frame.
+        """
+        weeks = cls._week(frame.dates.astype(np.int64))
+        first_week = int(weeks.min()) if len(frame) else 0
+        week_count = int(weeks.max()) - first_week + 1 if len(frame) else 0
+        habit_ids, rows, habit_names, habit_categories = _habit_rows(frame)
+        cells = np.full((len(habit_ids), week_count, 7), cls.NO_LOG, dtype= np.int8)
+        codes = np.where(frame.done.astype(bool), np.where(frame.hour >= 0, frame.hour, cls.DONE_NO_HOUR), cls.NOT_DONE)
+        cells[rows, weeks - first_week, frame.weekday] = codes
+        return cls(first_week, habit_ids, habit_names, habit_categories, frame.category_names, cells)
+
+    @classmethod
+    def from_dao(cls, habit_log_dao):
+        """Builds the cube straight from the columnar fetch of a HabitLogDAO."""
+        return cls.from_frame(AnalyticsFrame.from_dao(habit_log_dao))
+
+    def slice(self, week_start = None, week_end = None, habit_name = None, category_name = None, habit_id = None):
+        """
+        Cells of the weeks from week_start to week_end for a habit or a category.
+
+        Args:
+            week_start (datetime.date, optional): Any day of the first week.
+            week_end (datetime.date, optional): Any day of the last week.
+            habit_name (str, optional): Only the habits of this name.
+            category_name (str, optional): Only the habits of this category.
+            habit_id (int, optional): Only this habit.
+
+        Returns:
+            np.ndarray: Hour codes of shape (habits, weeks, 7), empty for an
+                unknown habit or category.
+        """
+        if habit_id is not None:
+            rows = [self._habit_rows[habit_id]] if habit_id in self._habit_rows else []
+        elif habit_name is not None:
+            rows = [i for i, name in enumerate(self.habit_names) if name == habit_name]
+        elif category_name is not None:
+            category = self._category_rows.get(category_name, -1)
+            rows = np.flatnonzero(self.habit_categories == category)
+        else:
+            rows = slice(None)
+        first = 0 if week_start is None else max(self._week(int(_to_day(week_start).astype(np.int64))) - self.first_week, 0)
+        last = self.cells.shape[1] if week_end is None else max(self._week(int(_to_day(week_end).astype(np.int64))) - self.first_week + 1, 0)
+        return self.cells[rows, first:last]
+
+    def weekday_counts(self, week_start = None, week_end = None, habit_name = None, category_name = None, habit_id = None):
+        """
+        Completions and logs per weekday (0 = Monday) of a slice, see slice().
+
+        Returns:
+            tuple: completed (np.ndarray), total (np.ndarray), 7 ints each.
+        """
+        cells = self.slice(week_start, week_end, habit_name, category_name, habit_id).reshape(-1, 7)
+        return np.count_nonzero(cells >= 0, axis= 0), np.count_nonzero(cells != self.NO_LOG, axis= 0)
+
+    def hour_heatmap(self, week_start = None, week_end = None, habit_name = None, category_name = None, habit_id = None):
+        """
+        Completions per weekday and hour of a slice, see slice().
+
+        Returns:
+            pd.DataFrame: One row per weekday name and one column per hour
+                range ('0-1' to '23-24'). Completions without time are left out.
+        """
+        cells = self.slice(week_start, week_end, habit_name, category_name, habit_id).reshape(-1, 7)
+        weekday = np.broadcast_to(np.arange(7), cells.shape)
+        timed = (cells >= 0) & (cells < self.DONE_NO_HOUR)
+        counts = np.bincount(weekday[timed] * 24 + cells[timed], minlength= 7 * 24).reshape(7, 24)
+        return pd.DataFrame(counts, index= WEEKDAY_NAMES, columns= [f"{h}-{h+1}" for h in range(24)])
+
+    def weekly_best_productivity_day(self, week_start, week_end = None):
+        """
+        Day name with the most completions of the weeks from week_start to week_end.
+
+        Returns:
+            str: Day name, None if the weeks have no logs. Ties like
+                AnalyticsFrame.habit_most_productive_day.
+        """
+        completed, total = self.weekday_counts(week_start, week_end if week_end is not None else week_start)
+        if not total.any():
+            return None
+        return _best_weekday(completed, total > 0)
+
+    def habit_most_productive_day(self, habit_name):
+        """Same result as AnalyticsFrame.habit_most_productive_day, None for a habit without logs."""
+        completed, total = self.weekday_counts(habit_name= habit_name)
+        if not total.any():
+            return None
+        return _best_weekday(completed, total > 0)
+
+    def record(self, day, habit_id, habit_name, category_name, done, complete_at = None):
+        """
+        Sets the log of a habit on a day, growing the weeks or habits as needed.
+
+        Args:
+            day (datetime.date): Day of the log.
+            habit_id (int): Habit of the log.
+            habit_name (str): Name of the habit, used when it is added.
+            category_name (str): Category of the habit.
+            done (int): 1 if the habit is done, 0 for a missed log, None to
+                remove the log.
+            complete_at (str, optional): Completion time 'YYYY-MM-DD HH:MM:SS'.
+
+        Example:
+            >>> cube.record(date.today(), 1, "Morning Run", "Health", 1, "2026-03-13 07:30:00")
+        """
+        day_number = int(_to_day(day).astype(np.int64))
+        week = self._week(day_number)
+        if self.cells.shape[1] == 0:
+            self.first_week = week
+        before = max(self.first_week - week, 0)
+        after = max(week - (self.first_week + self.cells.shape[1] - 1), 0)
+        if before or after:
+            self.cells = np.pad(self.cells, [(0, 0), (before, after), (0, 0)], constant_values= self.NO_LOG)
+            self.first_week -= before
+        if category_name not in self._category_rows:
+            self._category_rows[category_name] = len(self.category_names)
+            self.category_names.append(category_name)
+        if habit_id not in self._habit_rows:
+            self._habit_rows[habit_id] = len(self.habit_ids)
+            self.habit_ids.append(habit_id)
+            self.habit_names.append(habit_name)
+            self.habit_categories = np.append(self.habit_categories, self._category_rows[category_name])
+            self.cells = np.concatenate([self.cells, np.full((1,) + self.cells.shape[1:], self.NO_LOG, dtype= np.int8)])
+        if done is None:
+            code = self.NO_LOG
+        elif not done:
+            code = self.NOT_DONE
+        elif complete_at is None:
+            code = self.DONE_NO_HOUR
+        else:
+            code = int(np.datetime64(complete_at, "h").astype(np.int64) % 24)
+        self.cells[self._habit_rows[habit_id], week - self.first_week, (day_number + 3) % 7] = code
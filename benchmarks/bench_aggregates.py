@@ -0,0 +1,111 @@
+"""
+bench_aggregates.py - Streaming mergeable aggregates against in-memory analytics.
+
+Builds a file database of N logs (default 500,000), then computes the
+completion totals, hour histogram and habit streaks three ways: the whole
+history loaded as a list for analytics.py, streamed chunks folded into
+LogAggregates, and date ranges aggregated in worker processes then merged.
+Reports the time and the peak Python memory (tracemalloc) of each; the
+worker processes are not traced, only the merge in the parent.
+
+Usage:
+    python benchmarks/bench_aggregates.py [number_of_logs] [workers]
+"""
+
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics
+from aggregates import LogAggregates
+from crud import HabitLogDAO
+from database.database import migrate
+
+NUMBER_OF_HABITS = 100
+
+
+def build_database(path, number_of_logs):
+    random.seed(0)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.executemany("INSERT INTO Category (id, name) VALUES (?, ?)", [(i, f"Category {i}") for i in range(1, 6)])
+    conn.executemany("INSERT INTO Habit (id, name, category_id) VALUES (?, ?, ?)",
+                     [(i, f"Habit {i}", 1 + i % 5) for i in range(1, NUMBER_OF_HABITS + 1)])
+    days = number_of_logs // NUMBER_OF_HABITS
+    start = date.today() - timedelta(days= days)
+    def logs():
+        for offset in range(days):
+            day = (start + timedelta(days= offset)).isoformat()
+            for habit_id in range(1, NUMBER_OF_HABITS + 1):
+                done = random.random() < 0.7
+                yield habit_id, int(done), f"{day} {random.randint(6, 22):02d}:00:00" if done else None, day
+    conn.executemany("INSERT INTO HabitLog (habit_id, done, complete_at, date) VALUES (?, ?, ?, ?)", logs())
+    conn.commit()
+    conn.close()
+    return start, start + timedelta(days= days - 1)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def in_memory(path):
+    habit_logs = HabitLogDAO(_connect(path)).fetch_all_habits_logs()
+    return analytics.completion_rate(habit_logs), analytics.productivity_histogram(habit_logs), analytics.habit_streaks(habit_logs, date.today())
+
+
+def streamed(path, start_date = None, end_date = None):
+    chunks = HabitLogDAO(_connect(path)).iter_all_habits_logs(chunk_size= 10000, batches= True, start_date= start_date, end_date= end_date, ordered= True)
+    return LogAggregates.from_chunks(chunks)
+
+
+def parallel(path, first_day, last_day, workers):
+    step = (last_day - first_day).days // workers + 1
+    ranges = [(first_day + timedelta(days= i * step), first_day + timedelta(days= (i + 1) * step - 1)) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers= workers) as executor:
+        parts = list(executor.map(streamed, [path] * workers, *zip(*ranges)))
+    aggregates = parts[0]
+    for part in parts[1:]:
+        aggregates.merge(part)
+    return aggregates
+
+
+def _measure(label, function):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    #second run for the memory, tracing slows allocations down
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed:>8.2f}s {peak / 2**20:>10.1f} MiB peak")
+    return result
+
+
+def main(number_of_logs = 500_000, workers = 4):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "habit_tracker.db")
+        first_day, last_day = build_database(path, number_of_logs)
+        print(f"{number_of_logs} logs, {NUMBER_OF_HABITS} habits")
+        expected = _measure("fetch_all + analytics.py", lambda: in_memory(path))
+        aggregates = _measure("streamed LogAggregates", lambda: streamed(path))
+        merged = _measure(f"{workers} processes + merge", lambda: parallel(path, first_day, last_day, workers))
+        for result in (aggregates, merged):
+            assert result.totals.completion_rate() == expected[0]
+            assert result.hours.result().equals(expected[1])
+            assert result.streaks.habit_streaks(date.today()).equals(expected[2])
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
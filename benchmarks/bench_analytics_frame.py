@@ -0,0 +1,111 @@
+"""
+bench_analytics_frame.py - Vectorised AnalyticsFrame against analytics.py.
+
+Builds a synthetic history of N log dicts (default 1,000,000), then times
+parsing it once into an AnalyticsFrame and running the dashboard metrics,
+next to the list-based analytics.py functions on the same logs.
+
+Usage:
+    python benchmarks/bench_analytics_frame.py [number_of_logs]
+"""
+
+import os
+import sys
+import random
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics
+from analytics_frame import AnalyticsFrame, CompletionIndex, ActivityCube
+
+CATEGORIES = ["Health", "Productivity", "Lifestyle", "Learning", "Social"]
+
+
+def generate_logs(number_of_logs, number_of_habits = 200):
+    random.seed(0)
+    habits = [(f"Habit {i}", CATEGORIES[i % len(CATEGORIES)]) for i in range(number_of_habits)]
+    days = number_of_logs // number_of_habits + 1
+    start = date.today() - timedelta(days= days)
+    logs = []
+    for day_offset in range(days):
+        day = (start + timedelta(days= day_offset)).isoformat()
+        for habit_name, category_name in habits:
+            done = random.random() < 0.7
+            complete_at = f"{day} {random.randint(6, 22):02d}:{random.randint(0, 59):02d}:00" if done else None
+            logs.append({"habit_name": habit_name, "category_name": category_name, "done": int(done), "complete_at": complete_at, "date": day})
+            if len(logs) == number_of_logs:
+                return logs
+    return logs
+
+
+def _time(label, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:>8.3f}s")
+    return elapsed
+
+
+def main(number_of_logs = 1_000_000):
+    logs = generate_logs(number_of_logs)
+    today = date.today()
+    week_start = today - timedelta(days= today.weekday())
+    week_end = week_start + timedelta(6)
+    print(f"{len(logs)} logs")
+
+    frame = None
+    def build():
+        nonlocal frame
+        frame = AnalyticsFrame.from_logs(logs)
+
+    def frame_metrics():
+        frame.completion_rate()
+        frame.daily_completion_rate(today)
+        frame.weekly_completion_rate(week_start, week_end)
+        frame.weekly_completion_day_per_day(week_start, week_end)
+        frame.category_completion_rate(None)
+        frame.habit_most_productive_day("Habit 0")
+        frame.productivity_histogram(week_start, week_end)
+        frame.habit_most_productive_period("Habit 0")
+
+    def list_metrics():
+        analytics.completion_rate(logs)
+        analytics.daily_completion_rate(logs, today)
+        analytics.weekly_completion_rate(logs, week_start, week_end)
+        analytics.weekly_completion_day_per_day(logs, week_start, week_end)
+        analytics.category_completion_rate(logs, None)
+        analytics.habit_most_productive_day(logs, "Habit 0")
+        analytics.productivity_histogram(logs, week_start, week_end)
+        analytics.habit_most_productive_period(logs, "Habit 0")
+
+    total = _time("AnalyticsFrame.from_logs (parse once)", build)
+    total += _time("AnalyticsFrame metrics", frame_metrics)
+    print(f"{'AnalyticsFrame total':<40} {total:>8.3f}s")
+    _time("analytics.py metrics", list_metrics)
+
+    #scrolling the week navigator through every week of the history
+    weeks = [week_start - timedelta(weeks= i) for i in range(len(logs) // 200 // 7)]
+    index = None
+    def build_index():
+        nonlocal index
+        index = CompletionIndex.from_frame(frame)
+    _time("CompletionIndex.from_frame", build_index)
+    _time(f"{len(weeks)} weekly rates, CompletionIndex", lambda: [index.completion_rate(start, start + timedelta(6)) for start in weeks])
+    _time(f"{len(weeks)} weekly rates, AnalyticsFrame", lambda: [frame.weekly_completion_rate(start, start + timedelta(6)) for start in weeks])
+    _time("7/30/90-day rolling rates, all habits", lambda: index.rolling_completion_rates())
+    _time("analytics.habit_productivity_plot", lambda: analytics.habit_productivity_plot(logs, "Habit 0"))
+
+    cube = None
+    def build_cube():
+        nonlocal cube
+        cube = ActivityCube.from_frame(frame)
+    _time("ActivityCube.from_frame", build_cube)
+    _time(f"{len(weeks)} weekly best days, ActivityCube", lambda: [cube.weekly_best_productivity_day(start) for start in weeks])
+    _time("habit_most_productive_day, ActivityCube", lambda: cube.habit_most_productive_day("Habit 0"))
+    _time("weekday x hour heatmap, ActivityCube", lambda: cube.hour_heatmap())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,82 @@
+"""
+bench_date_parsing.py - Memoised date parsing in analytics.py.
+
+Scales the seed data up (the seed habits over many years), then times the
+list-based analytics functions with analytics.parse_date as it is (bounded
+LRU cache returning interned dates) and replaced by an uncached strptime,
+which is how every row was parsed before.
+
+Usage:
+    python benchmarks/bench_date_parsing.py [number_of_weeks]
+"""
+
+import os
+import sys
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics
+from crud import HabitLogDAO
+from database.database import migrate
+from database.seed import seed_database
+
+
+def seed_logs(number_of_weeks):
+    """The 4 seeded weeks of logs repeated back in time over number_of_weeks."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, date.today())
+    seed = HabitLogDAO(conn).fetch_all_habits_logs()
+    habit_logs = []
+    for block in range(number_of_weeks // 4):
+        shift = timedelta(weeks= 4 * block)
+        for log in seed:
+            day = (date.fromisoformat(log["date"]) - shift).isoformat()
+            complete_at = f"{day} {log['complete_at'][11:]}" if log["complete_at"] else None
+            habit_logs.append({**log, "date": day, "complete_at": complete_at})
+    return habit_logs
+
+
+def _strptime_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def run(habit_logs):
+    today = date.today()
+    week_start = today - timedelta(days= today.weekday())
+    analytics.current_daystreak(habit_logs, today)
+    analytics.longuest_daystreak(habit_logs)
+    analytics.daily_completion_rate(habit_logs, today)
+    analytics.productivity_comparaison(habit_logs, today)
+    analytics.weekly_completion_rate(habit_logs, week_start, week_start + timedelta(6))
+    analytics.weekly_completion_day_per_day(habit_logs, week_start, week_start + timedelta(6))
+    analytics.category_completion_rate(habit_logs, [week_start, week_start + timedelta(6)])
+
+
+def _time(label, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:>8.3f}s")
+    return elapsed
+
+
+def main(number_of_weeks = 520):
+    habit_logs = seed_logs(number_of_weeks)
+    print(f"{len(habit_logs)} logs, {len({log['date'] for log in habit_logs})} distinct dates")
+    with mock.patch.object(analytics, "parse_date", _strptime_date), mock.patch.object(analytics, "date_label", lambda value: _strptime_date(value).strftime("%A - %d-%m")):
+        legacy = _time("strptime on every row", lambda: run(habit_logs))
+    analytics.parse_date.cache_clear()
+    analytics.date_label.cache_clear()
+    cold = _time("parse_date, cold cache", lambda: run(habit_logs))
+    warm = _time("parse_date, warm cache", lambda: run(habit_logs))
+    print(f"speedup {legacy / cold:.1f}x cold, {legacy / warm:.1f}x warm")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,74 @@
+"""
+bench_habit_streaks.py - Cost of analytics.longuest_habit_streak.
+
+Compares the grouped single-pass streaks with the previous per-habit loop
+(one filter of the whole log list and one strptime per row for every
+habit) on 200 habits over 5 years of daily logs, and times the
+schedule-aware streaks on random weekday masks.
+
+Usage:
+    python benchmarks/bench_habit_streaks.py [number_of_habits] [number_of_days]
+"""
+
+import os
+import sys
+import random
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics
+from analytics_frame import AnalyticsFrame
+
+
+def _legacy_longuest_habit_streak(habit_logs):
+    """Per-habit streaks as they were implemented before the grouped version."""
+    done_logs = list(filter(lambda log: log["done"] == 1, habit_logs))
+    habits_names = list(set(map(lambda log: log["habit_name"], done_logs)))
+    def streak_for_habit(name):
+        dates = sorted(set(map(lambda log : datetime.strptime(log["date"], "%Y-%m-%d").date(), filter(lambda log : log["habit_name"] == name, done_logs))))
+        if not dates:
+            return 0
+        max_streak = 1
+        current_streak = 1
+        for i in range(1,len(dates)):
+            if dates[i] ==dates[i-1] + timedelta(1):
+                current_streak +=1
+                max_streak = max(max_streak, current_streak)
+            else:
+                current_streak = 1
+        return max_streak
+    return dict(map(lambda name: (name, streak_for_habit(name)), habits_names))
+
+
+def generate_logs(number_of_habits, number_of_days):
+    random.seed(0)
+    start = date.today() - timedelta(days= number_of_days)
+    days = [(start + timedelta(days= offset)).isoformat() for offset in range(number_of_days)]
+    return [{"habit_name": f"Habit {i}", "category_name": "Health", "complete_at": None, "done": int(random.random() < 0.8), "date": day}
+            for i in range(number_of_habits) for day in days]
+
+
+def _time(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<40} {time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def main(number_of_habits = 200, number_of_days = 5 * 365):
+    logs = generate_logs(number_of_habits, number_of_days)
+    print(f"{number_of_habits} habits, {number_of_days} days, {len(logs)} logs")
+    legacy = _time("legacy per-habit loop", lambda: _legacy_longuest_habit_streak(logs))
+    grouped = _time("analytics.longuest_habit_streak", lambda: analytics.longuest_habit_streak(logs))
+    frame = AnalyticsFrame.from_logs(logs)
+    _time("AnalyticsFrame.habit_streaks", lambda: frame.habit_streaks(date.today()))
+    masks = {f"Habit {i}": random.randint(1, analytics.EVERY_DAY_MASK) for i in range(number_of_habits)}
+    _time("analytics.schedule_streaks", lambda: analytics.schedule_streaks(logs, masks, date.today()))
+    _time("AnalyticsFrame.schedule_streaks", lambda: frame.schedule_streaks(masks, date.today()))
+    assert legacy == grouped
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,98 @@
+"""
+bench_streak_queries.py - Streaks in SQL window functions against Python.
+
+For growing histories (habits x days), computes the per-habit current and
+longest streaks and the "any habit done" streaks three ways: pulling every
+log into Python for analytics.habit_streaks / current_daystreak /
+longuest_daystreak, the same analytics on logs already in memory (what the
+app does with the list it holds anyway), and the gaps-and-islands queries
+of StatDAO.get_habit_streaks / get_daystreaks, which return one row per
+habit. The maintained StreakRun table (StatDAO.get_longest_habit_streaks)
+is timed as the floor. Prints the speedups per size to locate the
+crossover.
+
+Usage:
+    python benchmarks/bench_streak_queries.py [number_of_habits] [number_of_days]
+"""
+
+import os
+import sys
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics
+from crud import HabitLogDAO, StatDAO
+from database.database import migrate
+
+
+def build_database(number_of_habits, number_of_days):
+    random.seed(0)
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    conn.execute("INSERT INTO Category (id, name) VALUES (1, 'Health')")
+    conn.executemany("INSERT INTO Habit (id, name, category_id) VALUES (?, ?, 1)", [(i, f"Habit {i}") for i in range(1, number_of_habits + 1)])
+    start = date.today() - timedelta(days= number_of_days - 1)
+    days = [(start + timedelta(days= offset)).isoformat() for offset in range(number_of_days)]
+    conn.executemany("INSERT INTO HabitLog (habit_id, done, date) VALUES (?, ?, ?)",
+                     ((habit_id, int(random.random() < 0.8), day) for day in days for habit_id in range(1, number_of_habits + 1)))
+    conn.commit()
+    HabitLogDAO(conn).rebuild_streak_runs()
+    return conn
+
+
+def in_python(conn, today):
+    return in_memory(HabitLogDAO(conn).fetch_all_habits_logs() or [], today)
+
+
+def in_memory(habit_logs, today):
+    done_logs = [log for log in habit_logs if log["done"]]
+    return analytics.habit_streaks(habit_logs, today), analytics.current_daystreak(done_logs, today), analytics.longuest_daystreak(done_logs)
+
+
+def in_sql(conn, today):
+    stat_dao = StatDAO(conn)
+    return stat_dao.get_habit_streaks(today), stat_dao.get_daystreaks(today)
+
+
+def from_streak_runs(conn, today):
+    stat_dao = StatDAO(conn)
+    return stat_dao.get_longest_habit_streaks(), stat_dao.get_current_streak(today), stat_dao.get_longest_streak()
+
+
+def _time(function, repeat = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(number_of_habits = None, number_of_days = None):
+    sizes = [(1, 7), (5, 30), (5, 365), (20, 365), (50, 730), (100, 1825), (200, 1825)]
+    if number_of_habits:
+        sizes = [(number_of_habits, number_of_days or 365)]
+    today = date.today()
+    print(f"{'habits':>7} {'days':>6} {'logs':>8}  {'python (s)':>10}  {'in memory (s)':>13}  {'sql (s)':>9}  {'StreakRun (s)':>13}"
+          f"  {'sql vs python':>13}  {'sql vs in memory':>16}")
+    for habits, days in sizes:
+        conn = build_database(habits, days)
+        python_time, (streaks, current, longest) = _time(lambda: in_python(conn, today))
+        habit_logs = HabitLogDAO(conn).fetch_all_habits_logs() or []
+        memory_time, _ = _time(lambda: in_memory(habit_logs, today))
+        sql_time, (rows, daystreaks) = _time(lambda: in_sql(conn, today))
+        runs_time, _ = _time(lambda: from_streak_runs(conn, today))
+        assert [tuple(row.values()) for row in rows] == list(streaks.itertuples(index= False, name= None))
+        assert daystreaks == (current, longest)
+        print(f"{habits:>7} {days:>6} {habits * days:>8}  {python_time:>10.4f}  {memory_time:>13.4f}  {sql_time:>9.4f}  {runs_time:>13.5f}"
+              f"  {python_time / sql_time:>12.1f}x  {memory_time / sql_time:>15.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,80 @@
+"""
+bench_sync_missing_logs.py - Backfill cost of HabitLogDAO.sync_missing_logs.
+
+Compares the set-based backfill with the previous day-by-day loop (one
+SELECT per day and one committed INSERT per habit per day) on a file
+database, for 1, 30, 365 and 1000 missing days.
+
+Usage:
+    python benchmarks/bench_sync_missing_logs.py [number_of_habits]
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from crud import HabitLogDAO
+from database.database import migrate
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+GAPS = [1, 30, 365, 1000]
+
+
+def _legacy_sync(conn):
+    """Day-by-day backfill as it was implemented before the set-based version."""
+    last_date_str = conn.execute("SELECT MAX(date) FROM HabitLog").fetchone()[0]
+    current = datetime.strptime(last_date_str, "%Y-%m-%d").date() + timedelta(1)
+    while current <= date.today():
+        habits = conn.execute("""SELECT h.id FROM Habit h JOIN HabitSchedule d ON h.id = d.habit_id
+                                 WHERE d.day_of_the_week = ?""", (current.strftime("%A"),)).fetchall()
+        for habit in habits:
+            conn.execute("INSERT OR IGNORE INTO HabitLog (habit_id, done, date) VALUES (?,?,?)", (habit[0], 0, current.isoformat()))
+            conn.commit()
+        current += timedelta(1)
+
+
+def _prepare(path, number_of_habits, gap):
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    conn.execute("INSERT INTO Category (name, description) VALUES ('Bench', 'benchmark')")
+    for i in range(number_of_habits):
+        habit_id = conn.execute("INSERT INTO Habit (name, category_id) VALUES (?, 1)", (f"Habit {i}",)).lastrowid
+        conn.executemany("INSERT INTO HabitSchedule (habit_id, day_of_the_week) VALUES (?, ?)",
+                         [(habit_id, day) for day in DAYS[: 1 + i % 7]])
+    last_date = date.today() - timedelta(days= gap)
+    conn.execute("INSERT INTO HabitLog (habit_id, done, date) VALUES (1, 0, ?)", (last_date.isoformat(),))
+    conn.commit()
+    return conn
+
+
+def _time(function, conn):
+    start = time.perf_counter()
+    function(conn)
+    elapsed = time.perf_counter() - start
+    rows = conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0]
+    conn.close()
+    return elapsed, rows
+
+
+def main(number_of_habits = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"{number_of_habits} habits")
+        print(f"{'missing days':>12} {'rows':>8} {'day by day (s)':>15} {'set-based (s)':>14} {'speedup':>8}")
+        for gap in GAPS:
+            legacy, rows = _time(_legacy_sync, _prepare(path, number_of_habits, gap))
+            set_based, set_rows = _time(lambda conn: HabitLogDAO(conn).sync_missing_logs(), _prepare(path, number_of_habits, gap))
+            assert rows == set_rows
+            print(f"{gap:>12} {rows:>8} {legacy:>15.4f} {set_based:>14.4f} {legacy / set_based:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -1,14 +1,136 @@
 #Habit tracker with hbait class,
 #importing library that I need
 import sqlite3
+from contextlib import contextmanager
+from itertools import islice
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
 from datetime import timedelta
+from datetime import date
 from exception import DatabaseError
 import numpy as np
 from database.database import db_conn
 
+def to_day_number(day):
+    """Converts a datetime.date to the integer day number stored in HabitLog.day_num."""
+    return (day - EPOCH_DATE).days
+
+def from_day_number(day_num):
+    """Converts a HabitLog.day_num back to a datetime.date."""
+    return EPOCH_DATE + timedelta(days= int(day_num))
+
+#Depth of the open transaction() blocks per connection, shared by every DAO using it.
+#Keyed by the connection itself (sqlite3.Connection takes neither weak references nor
+#attributes) and only while a block is open on it, so an entry never outlives its connection
+_transaction_depth = {}
+#Bound parameters allowed in one statement by SQLite builds older than 3.32
+SQLITE_MAX_VARIABLES = 999
+#StreakRun rows with this habit_id hold the runs of days where at least one habit was done
+ANY_HABIT_STREAK_ID = 0
+#Recomputes the "any habit done" runs, only counting the logs of existing habits since
+#HabitLog rows outlive a deleted habit
+INSERT_ANY_HABIT_STREAK_RUNS = f"""INSERT INTO StreakRun (habit_id, start_date, end_date, length)
+       SELECT {ANY_HABIT_STREAK_ID}, MIN(date), MAX(date), COUNT(*) FROM (
+           SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS island
+           FROM (SELECT DISTINCT date FROM HabitLog WHERE done = 1 AND habit_id IN (SELECT id FROM Habit)))
+       GROUP BY island"""
+#Recomputes StreakRun from HabitLog with gaps-and-islands, used after bulk writes
+REBUILD_STREAK_RUNS = [
+    "DELETE FROM StreakRun",
+    """INSERT INTO StreakRun (habit_id, start_date, end_date, length)
+       SELECT habit_id, MIN(date), MAX(date), COUNT(*) FROM (
+           SELECT habit_id, date, julianday(date) - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY date) AS island
+           FROM HabitLog WHERE done = 1 AND habit_id IN (SELECT id FROM Habit))
+       GROUP BY habit_id, island""",
+    INSERT_ANY_HABIT_STREAK_RUNS,
+]
+#Current and longest streak per key of the (key, day_num) rows of {days}, with gaps-and-islands:
+#a day minus its ROW_NUMBER() is constant along a run of consecutive days, and only the latest
+#run of a key can be current. Bound to today's day number (NULL for no current streak)
+STREAK_ISLANDS_QUERY = """WITH runs AS (
+                              SELECT key, MAX(day_num) AS last_day, COUNT(*) AS length,
+                                     MAX(MAX(day_num)) OVER (PARTITION BY key) AS latest_day
+                              FROM (SELECT key, day_num, day_num - ROW_NUMBER() OVER (PARTITION BY key ORDER BY day_num) AS island
+                                    FROM ({days}))
+                              GROUP BY key, island)
+                          SELECT key, SUM(CASE WHEN last_day = latest_day AND ? - last_day <= 1 THEN length ELSE 0 END) AS current_streak,
+                                 MAX(length) AS longest_streak
+                          FROM runs GROUP BY key"""
+#Completed days of each habit, read in order from the partial index idx_habitlog_done_habit_day
+HABIT_DONE_DAYS = "SELECT habit_id AS key, day_num FROM HabitLog WHERE done = 1"
+#Days at least one existing habit was completed
+ANY_HABIT_DONE_DAYS = f"SELECT DISTINCT {ANY_HABIT_STREAK_ID} AS key, day_num FROM HabitLog WHERE done = 1 AND habit_id IN (SELECT id FROM Habit)"
+#HabitLog.day_num counts the days since this date, the epoch of NumPy's datetime64[D]
+EPOCH_DATE = date(1970, 1, 1)
+#NULL stand-in for integer columns read into datetime64 arrays, this value is NaT
+NAT_INTEGER = np.iinfo(np.int64).min
+#Bit of each weekday in Habit.schedule_mask, bit 0 = Monday like analytics.schedule_mask
+WEEKDAY_BITS = {day: 1 << bit for bit, day in enumerate(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])}
+#schedule_mask bit of the weekday of an ISO date column, strftime('%w') counts from Sunday
+WEEKDAY_BIT_SQL = "(1 << ((strftime('%w', {day}) + 6) % 7))"
+#Days DateDim is filled past the last day asked for, so it only grows about once a year
+DATE_DIM_MARGIN_DAYS = 366
+#Fills DateDim between two ISO dates. The ISO week and year are those of the Thursday of
+#the week, which SQLite builds older than 3.46 cannot format directly
+DATE_DIM_FILL = """WITH RECURSIVE calendar(day) AS (
+                        SELECT date(?)
+                        UNION ALL
+                        SELECT date(day, '+1 day') FROM calendar WHERE day < ?),
+                    named AS (
+                        SELECT day, (strftime('%w', day) + 6) % 7 AS weekday, CASE strftime('%w', day)
+                                WHEN '0' THEN 'Sunday' WHEN '1' THEN 'Monday' WHEN '2' THEN 'Tuesday'
+                                WHEN '3' THEN 'Wednesday' WHEN '4' THEN 'Thursday' WHEN '5' THEN 'Friday'
+                                ELSE 'Saturday' END AS weekday_name
+                        FROM calendar)
+                    INSERT OR IGNORE INTO DateDim (day, date, iso_year, iso_week, weekday, weekday_name, month, label)
+                    SELECT CAST(julianday(day) - 2440587.5 AS INTEGER), day,
+                           CAST(strftime('%Y', day, (3 - weekday) || ' days') AS INTEGER),
+                           (CAST(strftime('%j', day, (3 - weekday) || ' days') AS INTEGER) - 1) / 7 + 1,
+                           weekday, weekday_name, CAST(strftime('%m', day) AS INTEGER),
+                           weekday_name || strftime(' - %d-%m', day)
+                    FROM named"""
+#Settings key of the HabitLog storage mode: 'dense' keeps a done=0 row for every scheduled day,
+#'sparse' only stores completions and derives the misses from HabitSchedule
+LOG_STORAGE_KEY = "log_storage"
+DENSE_LOG_STORAGE = "dense"
+SPARSE_LOG_STORAGE = "sparse"
+#The done=0 rows the dense mode would hold between two ISO dates: every day a habit is scheduled
+#since its creation date that has no HabitLog row. Bound to (start, end, end), a NULL start
+#begins the calendar at the first creation date
+MISSED_LOGS_QUERY = """WITH RECURSIVE calendar(day) AS (
+                            SELECT IFNULL(?, (SELECT MIN(date(create_at)) FROM Habit))
+                            UNION ALL
+                            SELECT date(day, '+1 day') FROM calendar WHERE day < ?)
+                        SELECT h.id AS habit_id, 0 AS done, NULL AS complete_at, cal.day AS date,
+                               CAST(julianday(cal.day) - 2440587.5 AS INTEGER) AS day_num, NULL AS complete_ts
+                        FROM calendar cal
+                        JOIN Habit h ON h.schedule_mask & """ + WEEKDAY_BIT_SQL.format(day= "cal.day") + """ AND date(h.create_at) <= cal.day
+                        WHERE cal.day <= ?
+                        AND NOT EXISTS (SELECT 1 FROM HabitLog hl WHERE hl.habit_id = h.id AND hl.date = cal.day)"""
+#HabitLog as the dense mode would store it, read in place of the table in sparse mode
+SCHEDULED_LOGS_QUERY = MISSED_LOGS_QUERY + """
+                        UNION ALL
+                        SELECT habit_id, done, complete_at, date, day_num, complete_ts FROM HabitLog"""
+#Columns HabitLogDAO.aggregate_logs can group by, the dd ones come from the DateDim calendar
+LOG_GROUP_COLUMNS = {
+    "date": "hl.date",
+    "habit_id": "hl.habit_id",
+    "habit_name": "h.name",
+    "category_id": "h.category_id",
+    "category_name": "c.name",
+    "date_label": "dd.label",
+    "weekday": "dd.weekday",
+    "weekday_name": "dd.weekday_name",
+    "iso_year": "dd.iso_year",
+    "iso_week": "dd.iso_week",
+    "month": "dd.month",
+}
+#Every habit log joined with its habit and category names, {logs} is the SQL of BaseDAO.habit_logs_source()
+ALL_HABITS_LOGS_QUERY = """SELECT h.name AS habit_name, c.name AS category_name, done, complete_at,date FROM {logs} hl
+                                JOIN Habit h ON h.id = hl.habit_id
+                                JOIN Category c ON c.id = h.category_id"""
+
 class BaseDAO:
     """
     Base Data Access Object providing a centralized query execution method.
@@ -26,12 +148,16 @@ class BaseDAO:
     """
     def __init__(self,conn) -> None:
         self.conn = conn
+    def in_transaction(self):
+        return _transaction_depth.get(self.conn, 0) > 0
     def execute(self, query, params = None, fetch = None, commit = False):
         try:
             cursor = self.conn.cursor()
             cursor.execute(query, params or ())
             if commit:
-                self.conn.commit()
+                #inside a transaction() block the commit is done once, when the block ends
+                if not self.in_transaction():
+                    self.conn.commit()
                 return cursor.lastrowid
             if fetch == "one":
                 return cursor.fetchone()
@@ -40,6 +166,294 @@ class BaseDAO:
         except sqlite3.Error as e:
             print(f"[DB ERROR]: {e}")
             raise DatabaseError(f"Database error :{e}")
+    def log_storage(self):
+        """Returns the HabitLog storage mode saved in Settings, 'dense' by default."""
+        row = self.execute("SELECT value FROM Settings WHERE key = ? ORDER BY rowid DESC LIMIT 1", (LOG_STORAGE_KEY,), fetch= "one")
+        return row["value"] if row else DENSE_LOG_STORAGE
+    def log_version(self):
+        """Returns the LogVersion counter, bumped by every write to the logs, the habits, category names or Settings."""
+        row = self.execute("SELECT version FROM LogVersion WHERE id = 1", fetch= "one")
+        return row["version"] if row else 0
+    def habit_logs_source(self, start_date = None, end_date = None):
+        """
+        Returns what HabitLog reads should select FROM in the current storage mode.
+
+        In dense mode this is the HabitLog table itself. In sparse mode it is
+        a subquery adding the missed scheduled days, up to today, to the
+        stored completions, so both modes read the same rows. The dates only
+        bound the derived calendar, callers still filter the rows themselves.
+
+        Args:
+            start_date (datetime.date, optional): First day read, the first
+                habit creation date if None.
+            end_date (datetime.date, optional): Last day read, at most today.
+
+        Returns:
+            tuple: The SQL, a table name or a parenthesised subquery with the
+                HabitLog columns habit_id, done, complete_at, date, day_num and
+                complete_ts, and the parameters it binds, to put before those
+                of the clauses that follow it.
+
+        Example:
+            >>> source, params = dao.habit_logs_source()
+            >>> dao.execute(f"SELECT COUNT(*) FROM {source} hl WHERE hl.done = ?", (*params, 0), fetch="one")
+        """
+        if self.log_storage() != SPARSE_LOG_STORAGE:
+            return "HabitLog", ()
+        today_date = datetime.today().date()
+        end = (min(end_date, today_date) if end_date else today_date).isoformat()
+        return f"({SCHEDULED_LOGS_QUERY})", (start_date.isoformat() if start_date else None, end, end)
+    def date_dim_range(self, start_date = None, end_date = None):
+        """
+        DateDim.day numbers of a date range, read only.
+
+        Missing bounds default to the first day with a log or a habit and to
+        today (or the last log if later).
+
+        Args:
+            start_date (datetime.date, optional): First day of the range.
+            end_date (datetime.date, optional): Last day of the range.
+
+        Returns:
+            tuple: The (start, end) day numbers.
+        """
+        if start_date is None or end_date is None:
+            today_date = datetime.today().date()
+            row = self.execute("""SELECT MIN(first) AS first, MAX(last) AS last FROM (
+                                    SELECT MIN(date) AS first, MAX(date) AS last FROM HabitLog
+                                    UNION ALL
+                                    SELECT MIN(date(create_at)), NULL FROM Habit)""", fetch= "one")
+            if start_date is None:
+                start_date = date.fromisoformat(row["first"]) if row["first"] else today_date
+            if end_date is None:
+                end_date = max(today_date, date.fromisoformat(row["last"])) if row["last"] else today_date
+        return to_day_number(start_date), to_day_number(end_date)
+    def ensure_date_dim(self, start_date = None, end_date = None):
+        """
+        Makes sure DateDim holds every day between two dates.
+
+        Bounds default like date_dim_range. The table is only written when
+        the range is not covered yet, and then extended DATE_DIM_MARGIN_DAYS
+        past the end so it stays contiguous and rarely grows. The writes that
+        add days (sync_missing_logs, add_habit_logs, the seed) call it, the
+        reads only join DateDim.
+
+        Args:
+            start_date (datetime.date, optional): First day needed.
+            end_date (datetime.date, optional): Last day needed.
+
+        Returns:
+            tuple: The (start, end) DateDim.day numbers of the range.
+
+        Example:
+            >>> start, end = dao.ensure_date_dim(date(2026, 3, 9), date(2026, 3, 15))
+        """
+        start, end = self.date_dim_range(start_date, end_date)
+        covered = self.execute("SELECT MIN(day) AS first, MAX(day) AS last FROM DateDim", fetch= "one")
+        if covered["first"] is None or start < covered["first"] or end > covered["last"]:
+            first = start if covered["first"] is None else min(start, covered["first"])
+            last = max(end + DATE_DIM_MARGIN_DAYS, covered["last"] or end)
+            self.execute(DATE_DIM_FILL, (from_day_number(first).isoformat(), from_day_number(last).isoformat()), commit= True)
+        return start, end
+    def execute_iter(self, query, params = None, chunk_size = 1000):
+        """
+        Lazily yields the result of a SELECT in chunks read with fetchmany.
+
+        Only one chunk of rows is held in memory at a time, whatever the
+        size of the result.
+
+        Args:
+            query (str): Parameterised SELECT statement.
+            params (tuple, optional): Query parameters.
+            chunk_size (int): Number of rows per fetchmany call.
+
+        Yields:
+            list[Row]: The next chunk of rows, never empty.
+
+        Example:
+            >>> for rows in dao.execute_iter("SELECT * FROM HabitLog", chunk_size=500):
+            ...     print(len(rows))
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        except sqlite3.Error as e:
+            print(f"[DB ERROR]: {e}")
+            raise DatabaseError(f"Database error :{e}")
+    def fetch_columns(self, query, params = None, dtypes = None, chunk_size = 10000):
+        """
+        Reads the result of a SELECT straight into one NumPy array per column.
+
+        Rows are fetched as plain tuples in chunks, transposed and converted
+        column by column, so no dict or Row object is built per row. Columns
+        listed in dtypes are converted to that NumPy dtype, e.g.
+        "datetime64[D]" for 'YYYY-MM-DD' text (NULL becomes NaT) or "uint8"
+        for flags; the others keep the type NumPy infers.
+
+        Args:
+            query (str): Parameterised SELECT statement.
+            params (tuple, optional): Query parameters.
+            dtypes (dict, optional): Column name to NumPy dtype.
+            chunk_size (int): Number of rows per fetchmany call.
+
+        Returns:
+            dict[str, np.ndarray]: One array per selected column, in select order.
+
+        Example:
+            >>> cols = dao.fetch_columns("SELECT done, date FROM HabitLog", dtypes={"done": "uint8", "date": "datetime64[D]"})
+            >>> cols["done"].sum()
+        """
+        dtypes = dtypes or {}
+        try:
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params or ())
+            names = [column[0] for column in cursor.description]
+            parts = {name: [] for name in names}
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for name, values in zip(names, zip(*rows)):
+                    parts[name].append(np.array(values, dtype= dtypes.get(name)))
+        except sqlite3.Error as e:
+            print(f"[DB ERROR]: {e}")
+            raise DatabaseError(f"Database error :{e}")
+        return {name: np.concatenate(chunks) if chunks else np.array([], dtype= dtypes.get(name, object))
+                for name, chunks in parts.items()}
+    def fetch_frame(self, query, params = None, dtypes = None):
+        """
+        Same as fetch_columns but returns a pandas DataFrame.
+
+        Returns:
+            pd.DataFrame: One column per selected column.
+        """
+        return pd.DataFrame(self.fetch_columns(query, params, dtypes))
+    def execute_many(self, query, params_seq, chunk_size = 500):
+        """
+        Executes one statement for every parameter tuple of params_seq.
+
+        Parameters are consumed lazily in chunks of chunk_size and handed to
+        cursor.executemany, all inside one transaction() so the whole batch
+        costs a single commit. params_seq can be a generator.
+
+        Args:
+            query (str): Parameterised SQL statement.
+            params_seq (iterable): Parameter tuples, one per execution.
+            chunk_size (int): Number of tuples sent per executemany call.
+
+        Returns:
+            int: Total number of rows modified.
+
+        Example:
+            >>> dao.execute_many("UPDATE HabitLog SET done = ? WHERE id = ?", [(1, 4), (0, 5)])
+            2
+        """
+        iterator = iter(params_seq)
+        total = 0
+        with self.transaction():
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                try:
+                    cursor = self.conn.executemany(query, chunk)
+                except sqlite3.Error as e:
+                    print(f"[DB ERROR]: {e}")
+                    raise DatabaseError(f"Database error :{e}")
+                total += cursor.rowcount
+        return total
+    def insert_many(self, table, columns, rows, on_conflict = None):
+        """
+        Bulk inserts rows with multi-row INSERT ... VALUES statements.
+
+        Each statement carries as many rows as fit under SQLITE_MAX_VARIABLES
+        bound parameters, and the whole insert runs in one transaction().
+
+        Args:
+            table (str): Target table name.
+            columns (list[str]): Column names, in the order of each row.
+            rows (iterable): Row tuples matching columns. Can be a generator.
+            on_conflict (str, optional): Conflict clause, e.g. "IGNORE" or "REPLACE".
+
+        Returns:
+            int: Number of rows inserted.
+
+        Example:
+            >>> dao.insert_many("HabitSchedule", ["habit_id", "day_of_the_week"], [(1, "Monday"), (1, "Friday")])
+            2
+        """
+        columns = list(columns)
+        rows_per_statement = max(1, SQLITE_MAX_VARIABLES // len(columns))
+        row_placeholder = f"({','.join('?' * len(columns))})"
+        verb = "INSERT" if on_conflict is None else f"INSERT OR {on_conflict}"
+        iterator = iter(rows)
+        total = 0
+        with self.transaction():
+            while True:
+                chunk = list(islice(iterator, rows_per_statement))
+                if not chunk:
+                    break
+                query = f"{verb} INTO {table} ({', '.join(columns)}) VALUES {','.join([row_placeholder] * len(chunk))}"
+                try:
+                    cursor = self.conn.execute(query, [value for row in chunk for value in row])
+                except sqlite3.Error as e:
+                    print(f"[DB ERROR]: {e}")
+                    raise DatabaseError(f"Database error :{e}")
+                total += cursor.rowcount
+        return total
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several statements into one atomic unit of work.
+
+        The outermost block commits once when it exits and rolls everything
+        back if an exception escapes. Nested blocks, from the same DAO or any
+        other DAO sharing the connection, become savepoints: an error inside
+        only undoes that block, so services can compose DAO operations.
+        execute(..., commit=True) does not commit while a block is open.
+
+        Yields:
+            BaseDAO: The DAO itself.
+
+        Raises:
+            DatabaseError: If the savepoint cannot be opened or released.
+
+        Example:
+            >>> with habit_dao.transaction():
+            ...     habit_dao.add_habit("Read", "30 minutes", 1, ["Monday"])
+            ...     habit_dao.update_done(1, 1)
+        """
+        key = self.conn
+        depth = _transaction_depth.get(key, 0)
+        savepoint = f"unit_of_work_{depth}"
+        self.execute(f"SAVEPOINT {savepoint}")
+        _transaction_depth[key] = depth + 1
+        try:
+            yield self
+        except BaseException:
+            try:
+                self.execute(f"ROLLBACK TO {savepoint}")
+                self.execute(f"RELEASE {savepoint}")
+            except DatabaseError:
+                #the error raised in the block is the one to report, not the cleanup's
+                if depth == 0 and self.conn.in_transaction:
+                    self.conn.rollback()
+            raise
+        else:
+            self.execute(f"RELEASE {savepoint}")
+        finally:
+            if depth == 0:
+                del _transaction_depth[key]
+            else:
+                _transaction_depth[key] = depth
+        if depth == 0:
+            self.conn.commit()
         
 #creating category class to output the predefined category, save new one, deleting category
 #The class category is used to have everythings with category action, like deleting, adding, choosing.
@@ -77,6 +491,14 @@ class CategoryDAO(BaseDAO) :
         
         result = self.execute("SELECT id AS category_id, name as category_name, description FROM Category", fetch= "all")
         return result
+    def fetch_category_frame(self):
+        """
+        Fetches all categories as a DataFrame, read column by column.
+
+        Returns:
+            pd.DataFrame: Columns category_id, category_name and description.
+        """
+        return self.fetch_frame("SELECT id AS category_id, name as category_name, description FROM Category", dtypes= {"category_id": "int64"})
         
     def add_category(self,category_name, category_desc):
         """
@@ -193,18 +615,17 @@ class HabitDAO(BaseDAO):
         >>> Habit.reset_done()
     """
     def add_daily_habit_log(self):
+        if self.log_storage() == SPARSE_LOG_STORAGE:
+            #sparse logs derive today's misses from HabitSchedule
+            return
         today = datetime.today().strftime('%A')
         today_date = datetime.today().date()
             #selecting the habit of where the Days is today.
         habits = self.execute("""SELECT h.name, h.id
             FROM Habit h
-            JOIN HabitSchedule d ON h.id = d.habit_id
-            WHERE d.day_of_the_week = ? """, (today,), fetch= "all")
+            WHERE h.schedule_mask & ? """, (WEEKDAY_BITS[today],), fetch= "all")
         if habits:
-            for habit in habits:
-                habit_id = habit["id"]
-                habit_name = habit["name"]
-                self.execute("INSERT OR IGNORE INTO HabitLog (habit_id,done, date) VALUES (?,?,?)", (habit_id,0,today_date,), commit= True)
+            self.insert_many("HabitLog", ["habit_id", "done", "date"], ((habit["id"], 0, today_date) for habit in habits), on_conflict= "IGNORE")
     
     def fetch_today_habit(self):
         """
@@ -223,14 +644,61 @@ class HabitDAO(BaseDAO):
         """
         today_date = datetime.today().date()
             #selecting the habit of where the Days is today.
-        result = self.execute("""SELECT h.id AS habit_id, h.name AS name, hl.done AS done
-            FROM HabitLog hl
+        source, params = self.habit_logs_source(today_date, today_date)
+        result = self.execute(f"""SELECT h.id AS habit_id, h.name AS name, hl.done AS done
+            FROM {source} hl
             JOIN Habit h ON h.id = hl.habit_id
-            WHERE hl.date = ? """, (today_date,), fetch= "all")
+            WHERE hl.date = ? """, (*params, today_date,), fetch= "all")
         if result is None:
             raise DatabaseError("Problem")
         return [dict(row) for row in result]
-    def fetch_habit_by_day(self):
+    def fetch_today_habit_frame(self):
+        """
+        Same as fetch_today_habit but returns a DataFrame read column by column.
+
+        Returns:
+            pd.DataFrame: Columns habit_id, name and done.
+        """
+        today_date = datetime.today().date()
+        source, params = self.habit_logs_source(today_date, today_date)
+        return self.fetch_frame(f"""SELECT h.id AS habit_id, h.name AS name, hl.done AS done
+            FROM {source} hl
+            JOIN Habit h ON h.id = hl.habit_id
+            WHERE hl.date = ? """, (*params, today_date.isoformat(),), dtypes= {"habit_id": "int64", "done": "uint8"})
+    def fetch_schedule_masks(self, habit_id = None):
+        """
+        Reads the schedule of every habit as a 7-bit mask (bit 0 = Monday).
+
+        Args:
+            habit_id (int, optional): Only read the mask of this habit.
+
+        Returns:
+            dict: Habit names mapped to their schedule mask, 0 for a habit
+                without any scheduled day. See analytics.schedule_streaks.
+        """
+        if habit_id is not None:
+            rows = self.execute("SELECT name AS habit_name, schedule_mask AS mask FROM Habit WHERE id = ?", (habit_id,), fetch= "all")
+        else:
+            rows = self.execute("SELECT name AS habit_name, schedule_mask AS mask FROM Habit", fetch= "all")
+        return {row["habit_name"]: row["mask"] for row in rows}
+    def fetch_habit_by_day(self, day = None):
+            """
+            Fetches habits with their category, for one weekday or for every day.
+
+            Args:
+                day (str, optional): Day name, e.g. "Monday". The habits are
+                    picked with a bitwise test on Habit.schedule_mask.
+
+            Returns:
+                list[Row]: name, description and category_name of the habits
+                    scheduled on day, or one row per habit and scheduled day
+                    with an extra day column when no day is given.
+            """
+            if day is not None:
+                return self.execute("""SELECT h.name AS name, h.description, c.name as category_name
+                           FROM Habit h
+                           JOIN Category c ON h.category_id = c.id
+                           WHERE h.schedule_mask & ?""", (WEEKDAY_BITS[day],), fetch= "all")
             result = self.execute("""SELECT h.name AS name, h.description, c.name as category_name, hs.day_of_the_week as day
                            FROM Habit h
                            JOIN Category c ON h.category_id = c.id 
@@ -280,18 +748,18 @@ class HabitDAO(BaseDAO):
             #Inserting user input habit_name and category-id in the database, the other CreateAt and the HabitID is automated in the sql table
         today_date = datetime.today().date()
         today_weekday= today_date.strftime("%A")
-        habit_id = self.execute("INSERT INTO Habit (name, description, category_id) VALUES (?, ?, ?)", (habit_name, habit_desc, category_id), commit= True)
-        habit_create_at = self.execute("SELECT create_at FROM Habit WHERE id = (?)", (habit_id,),fetch = "one")
-        if habit_create_at:
-            result = self.execute("INSERT INTO HabitHistory (habit_id, name, description, category_id, create_at) VALUES (?, ?, ?,?,?)", (habit_id, habit_name, habit_desc, category_id, habit_create_at[0],), commit= True)
-            #inserting the habitID with the days choice by the user in the HabitSchedule table one day by one
-            for day in days:
-                result = self.execute("INSERT INTO HabitSchedule (habit_id, day_of_the_week) VALUES (?, ?)", (habit_id, day), commit= True)
-            if today_weekday in days:
-                self.execute("INSERT OR IGNORE INTO HabitLog (habit_id,done, date) VALUES (?,?,?)", (habit_id,0,today_date,), commit= True)
-            if result is None:
-                return {"error" : "Database error : Impossible to add a habit righ now, please try later."}
-            return result 
+        with self.transaction():
+            habit_id = self.execute("INSERT INTO Habit (name, description, category_id) VALUES (?, ?, ?)", (habit_name, habit_desc, category_id), commit= True)
+            habit_create_at = self.execute("SELECT create_at FROM Habit WHERE id = (?)", (habit_id,),fetch = "one")
+            if habit_create_at:
+                result = self.execute("INSERT INTO HabitHistory (habit_id, name, description, category_id, create_at) VALUES (?, ?, ?,?,?)", (habit_id, habit_name, habit_desc, category_id, habit_create_at[0],), commit= True)
+                #inserting the habitID with the days choice by the user in the HabitSchedule table in one statement
+                self.insert_many("HabitSchedule", ["habit_id", "day_of_the_week"], ((habit_id, day) for day in days))
+                if today_weekday in days and self.log_storage() == DENSE_LOG_STORAGE:
+                    self.execute("INSERT OR IGNORE INTO HabitLog (habit_id,done, date) VALUES (?,?,?)", (habit_id,0,today_date,), commit= True)
+                if result is None:
+                    return {"error" : "Database error : Impossible to add a habit righ now, please try later."}
+                return result 
 
 
     def delete_habit(self, habit_id):
@@ -299,7 +767,8 @@ class HabitDAO(BaseDAO):
         Deletes a habit from the database and stores it in history.
 
         Before deletion, the habit's name and creation date are saved into
-        'HabitHistory' for tracking purposes.
+        'HabitHistory' for tracking purposes. The streak runs of the habit
+        are dropped and the "any habit done" runs recomputed without its logs.
 
         Args:
             habit_id (int): The ID of the habit to delete.
@@ -311,7 +780,10 @@ class HabitDAO(BaseDAO):
             >>> delete_habit(5)
         """
             #selecting the habit who's gonna be deleted
-        result = self.execute("DELETE FROM Habit WHERE id = ?", (habit_id,), commit= True)
+        with self.transaction():
+            result = self.execute("DELETE FROM Habit WHERE id = ?", (habit_id,), commit= True)
+            self.execute("DELETE FROM StreakRun WHERE habit_id IN (?, ?)", (habit_id, ANY_HABIT_STREAK_ID), commit= True)
+            self.execute(INSERT_ANY_HABIT_STREAK_RUNS, commit= True)
         return result
 
     def update_habit(self, habit_new_name, new_description, category_id, habit_id, days):
@@ -334,17 +806,17 @@ class HabitDAO(BaseDAO):
             >>> update_habit("Workout", 2, 1, ["Tuesday", "Thursday"])
         """
         habit_new_name = habit_new_name.strip()
-        if len(habit_new_name) >= 1 :
-            result = self.execute("UPDATE Habit SET Name = ? WHERE id = ?", (habit_new_name, habit_id,),commit= True )
-        if len(new_description.strip()) >=1:
-            result = self.execute("UPDATE Habit SET Description = ? WHERE id = ?", (new_description, habit_id,),commit= True )
-        if category_id is not None:
-            result = self.execute("UPDATE Habit SET category_id = ? WHERE id = ?", (category_id, habit_id,), commit= True)
-        if len(days) >= 1:
-            result = self.execute("DELETE FROM HabitSchedule WHERE habit_id = ?", (habit_id,), commit= True)
-            for day in days:
-                result = self.execute("INSERT INTO HabitSchedule (habit_id, day_of_the_week) VALUES(?,?)", ( habit_id, day,), commit = True)
-            return result
+        with self.transaction():
+            if len(habit_new_name) >= 1 :
+                result = self.execute("UPDATE Habit SET Name = ? WHERE id = ?", (habit_new_name, habit_id,),commit= True )
+            if len(new_description.strip()) >=1:
+                result = self.execute("UPDATE Habit SET Description = ? WHERE id = ?", (new_description, habit_id,),commit= True )
+            if category_id is not None:
+                result = self.execute("UPDATE Habit SET category_id = ? WHERE id = ?", (category_id, habit_id,), commit= True)
+            if len(days) >= 1:
+                result = self.execute("DELETE FROM HabitSchedule WHERE habit_id = ?", (habit_id,), commit= True)
+                result = self.insert_many("HabitSchedule", ["habit_id", "day_of_the_week"], ((habit_id, day) for day in days))
+                return result
 
     def update_done(self,habit_id, done = None):
         """
@@ -363,14 +835,91 @@ class HabitDAO(BaseDAO):
         today_date = datetime.today().date()
         if done == 0 :
             today = None
+        sparse = self.log_storage() == SPARSE_LOG_STORAGE
+        with self.transaction():
             #update the status done in the table Habit
-        result = self.execute(
-                "UPDATE Habitlog SET done = ? ,complete_at = ? WHERE habit_id = ? AND date = ?",
-                (done, today,habit_id, today_date,), commit= True)
+            if not sparse:
+                result = self.execute(
+                        "UPDATE Habitlog SET done = ? ,complete_at = ? WHERE habit_id = ? AND date = ?",
+                        (done, today,habit_id, today_date,), commit= True)
+            elif done:
+                #sparse logs only store completions, the row is created when the habit is done...
+                result = self.execute("""INSERT INTO HabitLog (habit_id, done, complete_at, date) VALUES (?, ?, ?, ?)
+                                         ON CONFLICT(habit_id, date) DO UPDATE SET done = excluded.done, complete_at = excluded.complete_at""",
+                                      (habit_id, done, today, today_date.isoformat()), commit= True)
+            else:
+                #...and removed when it is undone
+                result = self.execute("DELETE FROM HabitLog WHERE habit_id = ? AND date = ?", (habit_id, today_date.isoformat()), commit= True)
+            #keep the streak runs of the habit and of the "any habit done" days in sync with the new status
+            log = self.execute("SELECT done FROM HabitLog WHERE habit_id = ? AND date = ?", (habit_id, today_date.isoformat()), fetch= "one")
+            if log is not None or sparse:
+                if log is not None and log["done"]:
+                    self._add_streak_day(habit_id, today_date)
+                else:
+                    self._remove_streak_day(habit_id, today_date)
+                any_done = self.execute("SELECT 1 FROM HabitLog WHERE date = ? AND done = 1 AND habit_id IN (SELECT id FROM Habit) LIMIT 1", (today_date.isoformat(),), fetch= "one")
+                if any_done:
+                    self._add_streak_day(ANY_HABIT_STREAK_ID, today_date)
+                else:
+                    self._remove_streak_day(ANY_HABIT_STREAK_ID, today_date)
         if result is None:
             return {"error" : "Database error : Impossible to update done of the habit righ now, please try later."}
         return result
 
+    def _find_streak_run(self, habit_id, day):
+        run = self.execute("""SELECT start_date, end_date, length FROM StreakRun
+                              WHERE habit_id = ? AND start_date <= ? ORDER BY start_date DESC LIMIT 1""",
+                           (habit_id, day.isoformat()), fetch= "one")
+        if run and run["end_date"] >= day.isoformat():
+            return run
+        return None
+
+    def _add_streak_day(self, habit_id, day):
+        """
+        Adds a completed day to the StreakRun runs of habit_id.
+
+        The day extends the run ending the day before and/or the run starting
+        the day after, merging them when both exist, so at most two rows change.
+        """
+        if self._find_streak_run(habit_id, day):
+            return
+        before = self.execute("SELECT start_date, length FROM StreakRun WHERE habit_id = ? AND end_date = ?",
+                              (habit_id, (day - timedelta(1)).isoformat()), fetch= "one")
+        after = self.execute("SELECT start_date, end_date, length FROM StreakRun WHERE habit_id = ? AND start_date = ?",
+                             (habit_id, (day + timedelta(1)).isoformat()), fetch= "one")
+        start_date = before["start_date"] if before else day.isoformat()
+        end_date = after["end_date"] if after else day.isoformat()
+        length = 1 + (before["length"] if before else 0) + (after["length"] if after else 0)
+        if after:
+            self.execute("DELETE FROM StreakRun WHERE habit_id = ? AND start_date = ?", (habit_id, after["start_date"]), commit= True)
+        if before:
+            self.execute("UPDATE StreakRun SET end_date = ?, length = ? WHERE habit_id = ? AND start_date = ?",
+                         (end_date, length, habit_id, start_date), commit= True)
+        else:
+            self.execute("INSERT INTO StreakRun (habit_id, start_date, end_date, length) VALUES (?, ?, ?, ?)",
+                         (habit_id, start_date, end_date, length), commit= True)
+
+    def _remove_streak_day(self, habit_id, day):
+        """
+        Removes a day from the StreakRun runs of habit_id.
+
+        The run containing the day is shortened, or split in two around it,
+        so at most two rows change.
+        """
+        run = self._find_streak_run(habit_id, day)
+        if run is None:
+            return
+        start_date = datetime.strptime(run["start_date"], "%Y-%m-%d").date()
+        end_date = datetime.strptime(run["end_date"], "%Y-%m-%d").date()
+        if start_date < day:
+            self.execute("UPDATE StreakRun SET end_date = ?, length = ? WHERE habit_id = ? AND start_date = ?",
+                         ((day - timedelta(1)).isoformat(), (day - start_date).days, habit_id, run["start_date"]), commit= True)
+        else:
+            self.execute("DELETE FROM StreakRun WHERE habit_id = ? AND start_date = ?", (habit_id, run["start_date"]), commit= True)
+        if end_date > day:
+            self.execute("INSERT INTO StreakRun (habit_id, start_date, end_date, length) VALUES (?, ?, ?, ?)",
+                         (habit_id, (day + timedelta(1)).isoformat(), run["end_date"], (end_date - day).days), commit= True)
+
 class HabitLogDAO(BaseDAO):
     """
     Manages habit log entries stored in the HabitLog table.
@@ -397,40 +946,171 @@ class HabitLogDAO(BaseDAO):
 
         Checks the last log date and inserts entries for each day between
         then and today, for all habits scheduled on those days.
+
+        The whole backfill is a single INSERT ... SELECT over a recursive
+        calendar of the missing days joined to HabitSchedule, so it costs one
+        statement and one commit however long the app was closed.
+
+        Does nothing in sparse storage mode, where the missed days are
+        derived when the logs are read. In both modes DateDim is extended to
+        cover today.
         """
+        self.ensure_date_dim()
+        if self.log_storage() == SPARSE_LOG_STORAGE:
+            return
         last_date_str = self.get_last_log_date()
         today_date = datetime.today().date()
         if not last_date_str:
             return
         last_date = datetime.strptime(last_date_str, "%Y-%m-%d").date()
-        current = last_date + timedelta(1)
+        if last_date >= today_date:
+            return
 
-        while current <= today_date:
-            day = current.strftime("%A")
-            habits = self.execute("""SELECT h.name, h.id
-            FROM Habit h
-            JOIN HabitSchedule d ON h.id = d.habit_id
-            WHERE d.day_of_the_week = ? """, (day,), fetch= "all")
-            if habits:
-                for habit in habits:
-                    habit_id = habit["id"]
-                    habit_name = habit["name"]
-                    self.execute("INSERT OR IGNORE INTO HabitLog (habit_id,done, date) VALUES (?,?,?)", (habit_id,0,current,), commit= True)
-            current += timedelta(1)
+        self.execute("""WITH RECURSIVE missing_day(day) AS (
+                            SELECT date(?, '+1 day')
+                            UNION ALL
+                            SELECT date(day, '+1 day') FROM missing_day WHERE day < ?)
+                        INSERT OR IGNORE INTO HabitLog (habit_id, done, date)
+                        SELECT h.id, 0, md.day
+                        FROM missing_day md
+                        JOIN Habit h ON h.schedule_mask & """ + WEEKDAY_BIT_SQL.format(day= "md.day"), (last_date.isoformat(), today_date.isoformat()), commit= True)
 
     def add_daily_habit_log(self):
+        if self.log_storage() == SPARSE_LOG_STORAGE:
+            #sparse logs derive today's misses from HabitSchedule
+            return
         today = datetime.today().strftime('%A')
         today_date = datetime.today().date()
             #selecting the habit of where the Days is today.
         habits = self.execute("""SELECT h.name, h.id
             FROM Habit h
-            JOIN HabitSchedule d ON h.id = d.habit_id
-            WHERE d.day_of_the_week = ? """, (today,), fetch= "all")
+            WHERE h.schedule_mask & ? """, (WEEKDAY_BITS[today],), fetch= "all")
         if habits:
-            for habit in habits:
-                habit_id = habit["id"]
-                habit_name = habit["name"]
-                self.execute("INSERT OR IGNORE INTO HabitLog (habit_id,done, date) VALUES (?,?,?)", (habit_id,0,today_date,), commit= True)
+            self.insert_many("HabitLog", ["habit_id", "done", "date"], ((habit["id"], 0, today_date) for habit in habits), on_conflict= "IGNORE")
+    def add_habit_logs(self, logs):
+        """
+        Bulk inserts habit logs, e.g. history imported from another tracker.
+
+        Existing logs for the same habit and date are replaced.
+
+        Args:
+            logs (iterable): (habit_id, done, complete_at, date) tuples, with
+                dates in 'YYYY-MM-DD' format. Can be a generator.
+
+        Returns:
+            int: Number of logs written.
+
+        Example:
+            >>> dao.add_habit_logs([(1, 1, "2026-03-13 08:10:00", "2026-03-13")])
+            1
+        """
+        with self.transaction():
+            #upsert rather than INSERT OR REPLACE so the DailyStats triggers see an UPDATE, not a silent delete
+            result = self.execute_many("""INSERT INTO HabitLog (habit_id, done, complete_at, date) VALUES (?, ?, ?, ?)
+                                        ON CONFLICT(habit_id, date) DO UPDATE SET done = excluded.done, complete_at = excluded.complete_at""", logs)
+            self.rebuild_streak_runs()
+            self.ensure_date_dim()
+        return result
+    def rebuild_streak_runs(self):
+        """
+        Recomputes the StreakRun table from HabitLog.
+
+        HabitDAO.update_done maintains the runs incrementally; this is for
+        bulk writes (imports, seed data) that bypass it.
+        """
+        with self.transaction():
+            for statement in REBUILD_STREAK_RUNS:
+                self.execute(statement, commit= True)
+    def set_log_storage(self, mode):
+        """
+        Switches the HabitLog storage mode and converts the stored logs.
+
+        Going sparse deletes the done=0 rows the reads derive again: days
+        the habit is scheduled on, from its creation date up to today. Other
+        misses (before the creation date, on a day the habit is no longer
+        scheduled) are kept as stored rows, so both modes read the same logs.
+        Going dense writes the derived rows back, up to today.
+
+        Args:
+            mode (str): 'dense' or 'sparse'.
+
+        Raises:
+            ValueError: If mode is not a known storage mode.
+
+        Example:
+            >>> dao.set_log_storage("sparse")
+        """
+        if mode not in (DENSE_LOG_STORAGE, SPARSE_LOG_STORAGE):
+            raise ValueError(f"Unknown log storage mode: {mode}")
+        if mode == self.log_storage():
+            return
+        with self.transaction():
+            if mode == SPARSE_LOG_STORAGE:
+                self.execute("""DELETE FROM HabitLog WHERE done = 0 AND date <= ?
+                                AND EXISTS (SELECT 1 FROM Habit h WHERE h.id = HabitLog.habit_id
+                                            AND h.schedule_mask & """ + WEEKDAY_BIT_SQL.format(day= "HabitLog.date") + """
+                                            AND date(h.create_at) <= HabitLog.date)""",
+                             (datetime.today().date().isoformat(),), commit= True)
+            else:
+                today = datetime.today().date().isoformat()
+                self.execute(f"INSERT OR IGNORE INTO HabitLog (habit_id, done, date) SELECT habit_id, done, date FROM ({MISSED_LOGS_QUERY})",
+                             (None, today, today), commit= True)
+            self.execute("DELETE FROM Settings WHERE key = ?", (LOG_STORAGE_KEY,), commit= True)
+            self.execute("INSERT INTO Settings (key, value) VALUES (?, ?)", (LOG_STORAGE_KEY, mode), commit= True)
+    def aggregate_logs(self, group_by = (), start_date = None, end_date = None, habit_ids = None, category_ids = None,
+                       habit_names = None, category_names = None):
+        """
+        Counts completed and total logs in SQL, filtered and grouped.
+
+        Builds one parameterised SELECT ... SUM(done), COUNT(*) ... GROUP BY
+        over the logs, so only the aggregated rows reach Python. This is the
+        SQL execution mode of the analytics.py rate functions.
+
+        Args:
+            group_by (iterable): Keys of LOG_GROUP_COLUMNS, e.g. ["category_name"]
+                or ["iso_year", "iso_week"]. Empty for one overall row.
+            start_date (datetime.date, optional): First day included.
+            end_date (datetime.date, optional): Last day included.
+            habit_ids (iterable, optional): Only count these habits.
+            category_ids (iterable, optional): Only count these categories.
+            habit_names (iterable, optional): Only count habits with these names.
+            category_names (iterable, optional): Only count categories with these names.
+
+        Returns:
+            list[Row]: One row per group, ordered by the group columns, with
+                the group_by keys, completed and total.
+
+        Raises:
+            ValueError: If a group_by key is not in LOG_GROUP_COLUMNS.
+
+        Example:
+            >>> dao.aggregate_logs(["category_name"], start_date= date(2026, 3, 9), habit_ids= [1, 2])
+        """
+        group_by = list(group_by)
+        unknown = [key for key in group_by if key not in LOG_GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown group_by column: {', '.join(unknown)}")
+        columns = [LOG_GROUP_COLUMNS[key] for key in group_by]
+        joins = ""
+        conditions = []
+        params = []
+        if any(column.startswith("dd.") for column in columns):
+            joins = "\n                                JOIN DateDim dd ON dd.day = hl.day_num"
+        if start_date is not None or end_date is not None:
+            conditions.append("hl.day_num BETWEEN ? AND ?")
+            params += [to_day_number(start_date) if start_date else NAT_INTEGER, to_day_number(end_date) if end_date else -NAT_INTEGER - 1]
+        for column, values in (("hl.habit_id", habit_ids), ("h.category_id", category_ids), ("h.name", habit_names), ("c.name", category_names)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+                params += values
+        select = "".join(f"{column} AS {key}, " for key, column in zip(group_by, columns))
+        where = f"\n                                WHERE {' AND '.join(conditions)}" if conditions else ""
+        grouping = f"\n                                GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}" if columns else ""
+        source, source_params = self.habit_logs_source(start_date, end_date)
+        return self.execute(f"""SELECT {select}COALESCE(SUM(hl.done), 0) AS completed, COUNT(*) AS total FROM {source} hl
+                                JOIN Habit h ON h.id = hl.habit_id
+                                JOIN Category c ON c.id = h.category_id{joins}{where}{grouping}""", (*source_params, *params), fetch= "all")
     def fetch_all_habits_logs(self):
         """
         Fetches all habit logs with habit and category details.
@@ -439,11 +1119,112 @@ class HabitLogDAO(BaseDAO):
             list[dict]: Each dict contains habit_name, category_name,
                 done, complete_at, and date.
         """
-        result = self.execute("""SELECT h.name AS habit_name, c.name AS category_name, done, complete_at,date FROM HabitLog hl
-                                JOIN Habit h ON h.id = hl.habit_id
-                                JOIN Category c ON c.id = h.category_id""", fetch= "all")
+        source, params = self.habit_logs_source()
+        result = self.execute(ALL_HABITS_LOGS_QUERY.format(logs= source), params, fetch= "all")
         if result:
             return [dict(row) for row in result]
+    def iter_all_habits_logs(self, chunk_size = 1000, batches = False, start_date = None, end_date = None, ordered = False):
+        """
+        Streams all habit logs with habit and category details.
+
+        Same rows as fetch_all_habits_logs, but read from the cursor
+        chunk_size rows at a time so memory stays bounded regardless of the
+        history length.
+
+        Args:
+            chunk_size (int): Number of rows fetched per round trip.
+            batches (bool): Yield one list per chunk instead of one dict per log.
+            start_date (datetime.date, optional): First day included.
+            end_date (datetime.date, optional): Last day included.
+            ordered (bool): Yield the logs by date, as the streak aggregates
+                of aggregates.py need.
+
+        Yields:
+            dict | list[dict]: A log with habit_name, category_name, done,
+                complete_at and date, or a list of them when batches is True.
+
+        Example:
+            >>> done = sum(log["done"] for log in dao.iter_all_habits_logs())
+        """
+        source, params = self.habit_logs_source(start_date, end_date)
+        query = ALL_HABITS_LOGS_QUERY.format(logs= source)
+        if start_date is not None or end_date is not None:
+            query += " WHERE hl.day_num BETWEEN ? AND ?"
+            params += (to_day_number(start_date) if start_date else NAT_INTEGER, to_day_number(end_date) if end_date else -NAT_INTEGER - 1)
+        if ordered:
+            query += " ORDER BY hl.day_num"
+        for rows in self.execute_iter(query, params, chunk_size= chunk_size):
+            if batches:
+                yield [dict(row) for row in rows]
+            else:
+                yield from map(dict, rows)
+    def fetch_logs_columns(self, as_frame = True, start_date = None, end_date = None):
+        """
+        Fetches habit logs as typed columns instead of per-row dicts.
+
+        Dates are read as datetime64[D], completion times as datetime64[s]
+        (NaT when not completed), done as uint8, and habit and category names
+        as pandas categoricals backed by small integer codes, so a log costs
+        a few bytes per column instead of a dict. Dates come from the integer
+        day_num and complete_ts columns, so no date string is parsed.
+
+        Args:
+            as_frame (bool): Return a DataFrame instead of a dict of arrays.
+            start_date (datetime.date, optional): First day included.
+            end_date (datetime.date, optional): Last day included.
+
+        Returns:
+            pd.DataFrame | dict: Columns habit_id, category_id, habit_name,
+                category_name, done, complete_at and date.
+
+        Example:
+            >>> df = dao.fetch_logs_columns()
+            >>> df.groupby("category_name", observed=True)["done"].mean()
+        """
+        habits = self.fetch_columns("SELECT id, name FROM Habit ORDER BY id", dtypes= {"id": "int64"})
+        categories = self.fetch_columns("SELECT id, name FROM Category ORDER BY id", dtypes= {"id": "int64"})
+        start = to_day_number(start_date) if start_date else NAT_INTEGER
+        end = to_day_number(end_date) if end_date else -NAT_INTEGER - 1
+        source, params = self.habit_logs_source(start_date, end_date)
+        logs = self.fetch_columns(f"""SELECT hl.habit_id, h.category_id, hl.done, IFNULL(hl.complete_ts, ?) AS complete_ts, hl.day_num FROM {source} hl
+                                JOIN Habit h ON h.id = hl.habit_id
+                                JOIN Category c ON c.id = h.category_id
+                                WHERE hl.day_num BETWEEN ? AND ?""", (NAT_INTEGER, *params, start, end),
+                                dtypes= {"habit_id": "int32", "category_id": "int32", "done": "uint8",
+                                         "complete_ts": "int64", "day_num": "int64"})
+
+        #habits or categories sharing a name share a category code, like the dict rows grouped by name
+        habit_names, habit_codes = np.unique(habits["name"].astype(str), return_inverse= True)
+        category_names, category_codes = np.unique(categories["name"].astype(str), return_inverse= True)
+        columns = {
+            "habit_id": logs["habit_id"],
+            "category_id": logs["category_id"],
+            "habit_name": pd.Categorical.from_codes(habit_codes[np.searchsorted(habits["id"], logs["habit_id"])], habit_names),
+            "category_name": pd.Categorical.from_codes(category_codes[np.searchsorted(categories["id"], logs["category_id"])], category_names),
+            "done": logs["done"],
+            "complete_at": logs["complete_ts"].view("datetime64[s]"),
+            "date": logs["day_num"].view("datetime64[D]"),
+        }
+        if as_frame:
+            return pd.DataFrame(columns)
+        return columns
+    def fetch_habit_logs_between(self, start_date, end_date):
+        """
+        Fetches habit logs between two dates (inclusive).
+
+        The range is an integer comparison on the indexed day_num column.
+
+        Args:
+            start_date (datetime.date): First day included.
+            end_date (datetime.date): Last day included.
+
+        Returns:
+            list[dict]: Same keys as fetch_all_habits_logs, empty if no logs.
+        """
+        source, params = self.habit_logs_source(start_date, end_date)
+        result = self.execute(f"""{ALL_HABITS_LOGS_QUERY.format(logs= source)}
+                                WHERE hl.day_num BETWEEN ? AND ?""", (*params, to_day_number(start_date), to_day_number(end_date)), fetch= "all")
+        return [dict(row) for row in result]
     def fetch_all_habits_logs_per_date(self,date):
         """
         Fetches habit logs filtered by one or more dates.
@@ -458,10 +1239,11 @@ class HabitLogDAO(BaseDAO):
             placeholder = ",".join("?"*len(date))
         else:
             placeholder = date
-        result = self.execute(f"""SELECT h.name AS habit_name, c.name AS category_name, done, complete_at,date FROM HabitLog hl
+        source, params = self.habit_logs_source()
+        result = self.execute(f"""SELECT h.name AS habit_name, c.name AS category_name, done, complete_at,date FROM {source} hl
                                 JOIN Habit h ON h.id = hl.habit_id
                                 JOIN Category c ON c.id = h.category_id
-                              WHERE hl.date IN ({placeholder})""",tuple(date), fetch= "all")
+                              WHERE hl.date IN ({placeholder})""",(*params, *date), fetch= "all")
         if result:
             return [dict(row) for row in result]
         else:
@@ -476,19 +1258,31 @@ class HabitLogDAO(BaseDAO):
             None if no logs found.
         """
         today_date = datetime.today().date()
-        result = self.execute("""SELECT h.id as habit_id,h.name AS habit_name, c.name AS category_name, hl.done, hl.complete_at,hl.date FROM HabitLog hl
+        source, params = self.habit_logs_source(today_date, today_date)
+        result = self.execute(f"""SELECT h.id as habit_id,h.name AS habit_name, c.name AS category_name, hl.done, hl.complete_at,hl.date FROM {source} hl
                                 JOIN Habit h ON h.id = hl.habit_id
                                 JOIN Category c ON c.id = h.category_id
-                                WHERE hl.date = ?""", (today_date,), fetch= "all")
+                                WHERE hl.date = ?""", (*params, today_date,), fetch= "all")
         if result:
             return [dict(row) for row in result]
         else:
             return None
     def fetch_habit_logs_per_habit(self, habit_id):
-        result= self.execute("""SELECT h.name AS habit_name, c.name AS category_name, hl.done, hl.complete_at,hl.date FROM HabitLog hl
+        """
+        Fetches the logs of one habit.
+
+        Args:
+            habit_id (int): The ID of the habit.
+
+        Returns:
+            list[dict]: Same keys as fetch_all_habits_logs, empty if no logs.
+        """
+        source, params = self.habit_logs_source()
+        result= self.execute(f"""SELECT h.name AS habit_name, c.name AS category_name, hl.done, hl.complete_at,hl.date FROM {source} hl
                                 JOIN Habit h ON h.id = hl.habit_id
                                 JOIN Category c ON c.id = h.category_id
-                                WHERE hl.habit_id = ?""", (habit_id,), fetch= "all")
+                                WHERE hl.habit_id = ?""", (*params, habit_id,), fetch= "all")
+        return [dict(row) for row in result]
 class StatDAO(BaseDAO):
     """
     Statistics class for analyzing habits data stored in an SQLite database.
@@ -550,6 +1344,50 @@ class StatDAO(BaseDAO):
             return []
         
         return rows
+    def get_habit_streaks(self, today_date = None):
+        """
+        Computes the current and longest streak of every habit in SQL.
+
+        Gaps-and-islands over the completed days with ROW_NUMBER(), straight
+        from HabitLog (see STREAK_ISLANDS_QUERY), so only one row per habit
+        reaches Python. Same result as analytics.habit_streaks on the logs,
+        except that habits sharing a name are reported separately;
+        get_longest_habit_streaks reads the maintained StreakRun table instead.
+
+        Args:
+            today_date (datetime.date, optional): Today's date, a run ending
+                today or yesterday is the current streak. No current streak if None.
+
+        Returns:
+            list[dict]: habit_name, current_streak and longest_streak, ordered
+                by habit name. Habits never done are left out.
+        """
+        today = to_day_number(today_date) if today_date else None
+        rows = self.execute(f"""SELECT h.name AS habit_name, s.current_streak, s.longest_streak
+                                FROM ({STREAK_ISLANDS_QUERY.format(days= HABIT_DONE_DAYS)}) s
+                                JOIN Habit h ON h.id = s.key
+                                JOIN Category c ON c.id = h.category_id
+                                ORDER BY h.name, h.id""", (today,), fetch= "all")
+        return [dict(row) for row in rows]
+    def get_daystreaks(self, today_date = None):
+        """
+        Computes the current and longest "any habit done" streak in SQL.
+
+        Same gaps-and-islands query as get_habit_streaks over the days with
+        at least one completion. Matches analytics.current_daystreak and
+        analytics.longuest_daystreak on the completed logs.
+
+        Args:
+            today_date (datetime.date, optional): Today's date, no current streak if None.
+
+        Returns:
+            tuple: current (int) and longest (int) streak in days.
+        """
+        today = to_day_number(today_date) if today_date else None
+        row = self.execute(STREAK_ISLANDS_QUERY.format(days= ANY_HABIT_DONE_DAYS), (today,), fetch= "one")
+        if row is None:
+            return 0, 0
+        return row["current_streak"], row["longest_streak"]
     def get_today_completed_habit(self):
         """
         Calculates the number of habit done today and return the result.
@@ -573,4 +1411,120 @@ class StatDAO(BaseDAO):
         return result[0] if result else 0
     
     def get_today_number_of_habit(self):
-        result = self.execute("SELECT date, COUNT(*) as total_scheduled, SUM(Done) as total_done", fetch = "one")
\ No newline at end of file
+        result = self.execute("SELECT date, COUNT(*) as total_scheduled, SUM(Done) as total_done", fetch = "one")
+    def get_current_streak(self, today_date, habit_id = ANY_HABIT_STREAK_ID):
+        """
+        Reads the current streak from the StreakRun table.
+
+        Same rule as analytics.current_daystreak: the latest run counts if it
+        ends today or yesterday, otherwise the streak is 0.
+
+        Args:
+            today_date (datetime.date): Today's date.
+            habit_id (int): Habit to read, by default the "any habit done" days.
+
+        Returns:
+            int: Current streak in days.
+        """
+        run = self.execute("SELECT end_date, length FROM StreakRun WHERE habit_id = ? ORDER BY end_date DESC LIMIT 1", (habit_id,), fetch= "one")
+        if run is None:
+            return 0
+        if (today_date - datetime.strptime(run["end_date"], "%Y-%m-%d").date()).days > 1:
+            return 0
+        return run["length"]
+    def get_longest_streak(self, habit_id = ANY_HABIT_STREAK_ID):
+        """
+        Reads the longest streak from the StreakRun table.
+
+        Args:
+            habit_id (int): Habit to read, by default the "any habit done" days.
+
+        Returns:
+            int: Longest streak in days, 0 without any completion.
+        """
+        row = self.execute("SELECT MAX(length) FROM StreakRun WHERE habit_id = ?", (habit_id,), fetch= "one")
+        return row[0] or 0
+    def get_longest_habit_streaks(self):
+        """
+        Reads the longest streak of every habit from the StreakRun table.
+
+        Returns:
+            dict: Habit names mapped to their longest streak, like
+                analytics.longuest_habit_streak. Habits never done are left out.
+        """
+        rows = self.execute("""SELECT h.name AS habit_name, MAX(sr.length) AS longest FROM StreakRun sr
+                               JOIN Habit h ON h.id = sr.habit_id
+                               JOIN Category c ON c.id = h.category_id
+                               GROUP BY h.name""", fetch= "all")
+        return {row["habit_name"]: row["longest"] for row in rows}
+    def _calendar_stats(self, columns, group_by, start_date = None, end_date = None):
+        """
+        Completed and scheduled totals grouped on DateDim columns.
+
+        Reads DailyStats, or the logs in sparse storage mode (the DailyStats
+        triggers only see stored rows), joined to DateDim so the grouping is
+        a GROUP BY on its integer columns.
+        """
+        start, end = self.date_dim_range(start_date, end_date)
+        params = ()
+        if self.log_storage() == DENSE_LOG_STORAGE:
+            source = """DailyStats ds
+                                JOIN Category c ON c.id = ds.category_id
+                                JOIN DateDim dd ON dd.date = ds.date"""
+            done, total = "ds.done", "ds.scheduled"
+        else:
+            logs, params = self.habit_logs_source(from_day_number(start), from_day_number(end))
+            source = f"""{logs} hl
+                                JOIN Habit h ON h.id = hl.habit_id
+                                JOIN Category c ON c.id = h.category_id
+                                JOIN DateDim dd ON dd.day = hl.day_num"""
+            done, total = "hl.done", "1"
+        params += (start, end)
+        return self.execute(f"""SELECT {columns}, SUM({done}) AS completed, SUM({total}) AS total FROM {source}
+                                WHERE dd.day BETWEEN ? AND ?
+                                GROUP BY {group_by} HAVING SUM({total}) > 0
+                                ORDER BY {group_by}""", params, fetch= "all")
+    def get_daily_stats(self, start_date = None, end_date = None):
+        """
+        Reads per-day totals from the DailyStats aggregate table.
+
+        DailyStats is kept exact by triggers on HabitLog and Habit, so this
+        reads one row per day and category instead of every HabitLog row.
+        The triggers only see stored rows, so in sparse storage mode the
+        totals are counted from the logs of the range instead.
+
+        Args:
+            start_date (datetime.date, optional): First day included.
+            end_date (datetime.date, optional): Last day included.
+
+        Returns:
+            list[Row]: Rows with date, date_label ('Monday - 09-03', from
+                DateDim), completed and total, ordered by date.
+        """
+        return self._calendar_stats("dd.date, dd.label AS date_label", "dd.day", start_date, end_date)
+    def get_category_stats(self, start_date = None, end_date = None):
+        """
+        Reads per-category totals from the DailyStats aggregate table.
+
+        Args:
+            start_date (datetime.date, optional): First day included.
+            end_date (datetime.date, optional): Last day included.
+
+        Returns:
+            list[Row]: Rows with category_name, completed and total, ordered by category name.
+        """
+        start = start_date.isoformat() if start_date else "0000-01-01"
+        end = end_date.isoformat() if end_date else "9999-12-31"
+        if self.log_storage() == SPARSE_LOG_STORAGE:
+            source, params = self.habit_logs_source(start_date, end_date)
+            return self.execute(f"""SELECT c.name AS category_name, SUM(hl.done) AS completed, COUNT(*) AS total FROM {source} hl
+                                JOIN Habit h ON h.id = hl.habit_id
+                                JOIN Category c ON c.id = h.category_id
+                                WHERE hl.date BETWEEN ? AND ?
+                                GROUP BY c.name
+                                ORDER BY c.name""", (*params, start, end), fetch= "all")
+        return self.execute("""SELECT c.name AS category_name, SUM(ds.done) AS completed, SUM(ds.scheduled) AS total FROM DailyStats ds
+                                JOIN Category c ON c.id = ds.category_id
+                                WHERE ds.date BETWEEN ? AND ?
+                                GROUP BY c.name HAVING SUM(ds.scheduled) > 0
+                                ORDER BY c.name""", (start, end), fetch= "all")
\ No newline at end of file
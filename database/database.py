@@ -1,22 +1,212 @@
+import os
 import sqlite3
+import queue
+import threading
 from contextlib import contextmanager
+from exception import DatabaseError
 
 DB_PATH = r".\database\habit_tracker.db"
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema.sql")
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+#Applied once on every new connection, the pool keeps them warm between reruns
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections reused across Streamlit reruns.
+
+    Connections are opened lazily, configured once with the PRAGMAS above
+    (WAL journal, NORMAL sync, page cache, mmap, in-memory temp store) and
+    handed back to the pool instead of being closed. Idle connections are
+    reused last-in first-out so the warmest page cache is served first, and
+    each one is health-checked before being handed out.
+
+    Args:
+        db_path (str): Path of the SQLite database file.
+        max_size (int): Maximum number of open connections.
+        timeout (float): Seconds to wait for a free connection (also used as
+            the SQLite busy timeout).
+        pragmas (dict, optional): PRAGMA name/value pairs, defaults to PRAGMAS.
+
+    Example:
+        >>> pool = ConnectionPool("habit_tracker.db", max_size=4)
+        >>> conn = pool.acquire()
+        >>> pool.release(conn)
+    """
+    def __init__(self, db_path, max_size = 8, timeout = 5.0, pragmas = None) -> None:
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = PRAGMAS if pragmas is None else pragmas
+        self._idle = queue.LifoQueue()
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout= self.timeout, check_same_thread= False)
+        conn.row_factory = sqlite3.Row
+        for key, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {key} = {value}")
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._open -= 1
+
+    def acquire(self):
+        """
+        Returns a healthy connection, opening a new one while under max_size.
+
+        Raises:
+            DatabaseError: If no connection frees up before the timeout.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._open < self.max_size
+                    if can_open:
+                        self._open += 1
+                if can_open:
+                    try:
+                        return self._connect()
+                    except sqlite3.Error as e:
+                        with self._lock:
+                            self._open -= 1
+                        raise DatabaseError(f"Database error :{e}")
+                try:
+                    conn = self._idle.get(timeout= self.timeout)
+                except queue.Empty:
+                    raise DatabaseError("Database error : no connection available, please try later.")
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        """Gives a connection back to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def close_all(self):
+        """Closes every idle connection, used on shutdown and in tests."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(DB_PATH)
+    return _pool
+
 @contextmanager
 def db_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
-    finally:
         conn.commit()
-        conn.close()
+    finally:
+        #a body or a commit that raised leaves its transaction open, release rolls it back
+        pool.release(conn)
+
+def _run_versioned_script(conn, script, version):
+    try:
+        conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.rollback()
+        raise DatabaseError(f"Database error : migration to version {version} failed :{e}")
+
+def get_migrations():
+    """
+    Lists the migration scripts of database/migrations, oldest first.
+
+    Each script is named "<version>_<name>.sql" and brings the schema from
+    version - 1 to version, the version being stored in PRAGMA user_version.
+
+    Returns:
+        list[tuple]: (version, path) pairs sorted by version.
+    """
+    migrations = []
+    for file_name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if file_name.endswith(".sql"):
+            migrations.append((int(file_name.split("_")[0]), os.path.join(MIGRATIONS_DIR, file_name)))
+    return migrations
+
+def migrate(conn):
+    """
+    Brings the database schema up to the latest version.
+
+    A database already at the latest PRAGMA user_version is left untouched,
+    so calling this on every start only costs one PRAGMA read. A brand-new
+    database gets schema.sql, which always describes the latest layout, and a
+    database created before the migrations existed (version 0 with tables)
+    replays every migration. Each migration runs in its own transaction
+    together with its user_version bump.
+
+    Args:
+        conn: An active SQLite connection object.
+
+    Returns:
+        int: The schema version after migration.
+
+    Example:
+        >>> with db_conn() as conn:
+        ...     migrate(conn)
+    """
+    migrations = get_migrations()
+    latest = migrations[-1][0] if migrations else 0
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= latest:
+        return version
+
+    has_tables = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Habit'").fetchone()
+    if version == 0 and not has_tables:
+        with open(SCHEMA_PATH, "r") as f:
+            schema = f.read()
+        _run_versioned_script(conn, schema, latest)
+        return latest
+
+    for number, path in migrations:
+        if number <= version:
+            continue
+        with open(path, "r") as f:
+            script = f.read()
+        _run_versioned_script(conn, script, number)
+    return latest
 
 def init_database():
     with db_conn() as conn:
-        cursor = conn.cursor()
-        with open("schema.sql", "r") as f:
-            schema = f.read()
-    
-        cursor.executescript(schema)
-    
\ No newline at end of file
+        migrate(conn)
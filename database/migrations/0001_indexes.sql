@@ -0,0 +1,7 @@
+-- Secondary indexes for the daily log, streak and schedule lookups.
+-- HabitLog(date, done) also serves plain date lookups through its prefix.
+CREATE INDEX IF NOT EXISTS idx_habitlog_date_done ON HabitLog(date, done);
+CREATE INDEX IF NOT EXISTS idx_habitlog_completed ON HabitLog(date) WHERE complete_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_habitschedule_day_habit ON HabitSchedule(day_of_the_week, habit_id);
+CREATE INDEX IF NOT EXISTS idx_habitschedule_habit ON HabitSchedule(habit_id);
+CREATE INDEX IF NOT EXISTS idx_habit_category ON Habit(category_id);
@@ -0,0 +1,52 @@
+-- Per day and per category totals of HabitLog, kept exact by triggers.
+CREATE TABLE IF NOT EXISTS DailyStats (date TEXT NOT NULL,
+                    category_id INTEGER NOT NULL,
+                    scheduled INTEGER NOT NULL DEFAULT 0,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (date, category_id)
+                    ) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_log_insert AFTER INSERT ON HabitLog
+BEGIN
+    INSERT INTO DailyStats (date, category_id, scheduled, done)
+    SELECT NEW.date, h.category_id, 1, NEW.done FROM Habit h WHERE h.id = NEW.habit_id
+    ON CONFLICT(date, category_id) DO UPDATE SET scheduled = scheduled + 1, done = done + excluded.done;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_log_update AFTER UPDATE OF habit_id, done, date ON HabitLog
+BEGIN
+    UPDATE DailyStats SET scheduled = scheduled - 1, done = done - OLD.done
+    WHERE date = OLD.date AND category_id = (SELECT category_id FROM Habit WHERE id = OLD.habit_id);
+    INSERT INTO DailyStats (date, category_id, scheduled, done)
+    SELECT NEW.date, h.category_id, 1, NEW.done FROM Habit h WHERE h.id = NEW.habit_id
+    ON CONFLICT(date, category_id) DO UPDATE SET scheduled = scheduled + 1, done = done + excluded.done;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_log_delete AFTER DELETE ON HabitLog
+BEGIN
+    UPDATE DailyStats SET scheduled = scheduled - 1, done = done - OLD.done
+    WHERE date = OLD.date AND category_id = (SELECT category_id FROM Habit WHERE id = OLD.habit_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_habit_category AFTER UPDATE OF category_id ON Habit
+WHEN OLD.category_id IS NOT NEW.category_id
+BEGIN
+    UPDATE DailyStats SET scheduled = DailyStats.scheduled - moved.scheduled, done = DailyStats.done - moved.done
+    FROM (SELECT date, COUNT(*) AS scheduled, SUM(done) AS done FROM HabitLog WHERE habit_id = NEW.id GROUP BY date) AS moved
+    WHERE DailyStats.date = moved.date AND DailyStats.category_id = OLD.category_id;
+    INSERT INTO DailyStats (date, category_id, scheduled, done)
+    SELECT date, NEW.category_id, COUNT(*), SUM(done) FROM HabitLog WHERE habit_id = NEW.id GROUP BY date
+    ON CONFLICT(date, category_id) DO UPDATE SET scheduled = scheduled + excluded.scheduled, done = done + excluded.done;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_habit_delete AFTER DELETE ON Habit
+BEGIN
+    UPDATE DailyStats SET scheduled = DailyStats.scheduled - removed.scheduled, done = DailyStats.done - removed.done
+    FROM (SELECT date, COUNT(*) AS scheduled, SUM(done) AS done FROM HabitLog WHERE habit_id = OLD.id GROUP BY date) AS removed
+    WHERE DailyStats.date = removed.date AND DailyStats.category_id = OLD.category_id;
+END;
+
+INSERT INTO DailyStats (date, category_id, scheduled, done)
+SELECT hl.date, h.category_id, COUNT(*), SUM(hl.done) FROM HabitLog hl
+JOIN Habit h ON h.id = hl.habit_id
+GROUP BY hl.date, h.category_id;
@@ -0,0 +1,23 @@
+-- Run-length table of consecutive completed days per habit.
+-- habit_id 0 holds the runs of days where at least one habit was done.
+CREATE TABLE IF NOT EXISTS StreakRun (habit_id INTEGER NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (habit_id, start_date)
+                    ) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_streakrun_end ON StreakRun(habit_id, end_date);
+CREATE INDEX IF NOT EXISTS idx_streakrun_length ON StreakRun(habit_id, length);
+
+INSERT INTO StreakRun (habit_id, start_date, end_date, length)
+SELECT habit_id, MIN(date), MAX(date), COUNT(*) FROM (
+    SELECT habit_id, date, julianday(date) - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY date) AS island
+    FROM HabitLog WHERE done = 1)
+GROUP BY habit_id, island;
+
+INSERT INTO StreakRun (habit_id, start_date, end_date, length)
+SELECT 0, MIN(date), MAX(date), COUNT(*) FROM (
+    SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS island
+    FROM (SELECT DISTINCT date FROM HabitLog WHERE done = 1))
+GROUP BY island;
@@ -0,0 +1,8 @@
+-- Integer views of the HabitLog TEXT dates: day_num counts days since
+-- 1970-01-01 and complete_ts is the completion time in epoch seconds.
+-- Virtual columns cost no row storage; the indexes store the integers.
+ALTER TABLE HabitLog ADD COLUMN day_num INTEGER GENERATED ALWAYS AS (CAST(julianday(date) - 2440587.5 AS INTEGER)) VIRTUAL;
+ALTER TABLE HabitLog ADD COLUMN complete_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', complete_at) AS INTEGER)) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_habitlog_day_done ON HabitLog(day_num, done);
+CREATE INDEX IF NOT EXISTS idx_habitlog_habit_day ON HabitLog(habit_id, day_num);
@@ -0,0 +1,39 @@
+-- 7-bit copy of HabitSchedule on Habit (bit 0 = Monday ... bit 6 = Sunday)
+-- so "habits scheduled on a weekday" is a bitwise test on Habit, without
+-- joining HabitSchedule or comparing day names. Triggers keep it in sync.
+ALTER TABLE Habit ADD COLUMN schedule_mask INTEGER NOT NULL DEFAULT 0;
+
+UPDATE Habit SET schedule_mask = (SELECT COALESCE(SUM(DISTINCT CASE d.day_of_the_week
+                                        WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+                                        WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+                                        WHEN 'Sunday' THEN 64 END), 0)
+                                  FROM HabitSchedule d WHERE d.habit_id = Habit.id);
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_mask_insert AFTER INSERT ON HabitSchedule
+BEGIN
+    UPDATE Habit SET schedule_mask = schedule_mask | CASE NEW.day_of_the_week
+            WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+            WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+            WHEN 'Sunday' THEN 64 ELSE 0 END
+    WHERE id = NEW.habit_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_mask_delete AFTER DELETE ON HabitSchedule
+BEGIN
+    UPDATE Habit SET schedule_mask = (SELECT COALESCE(SUM(DISTINCT CASE d.day_of_the_week
+                                            WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+                                            WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+                                            WHEN 'Sunday' THEN 64 END), 0)
+                                      FROM HabitSchedule d WHERE d.habit_id = OLD.habit_id)
+    WHERE id = OLD.habit_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_mask_update AFTER UPDATE OF habit_id, day_of_the_week ON HabitSchedule
+BEGIN
+    UPDATE Habit SET schedule_mask = (SELECT COALESCE(SUM(DISTINCT CASE d.day_of_the_week
+                                            WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+                                            WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+                                            WHEN 'Sunday' THEN 64 END), 0)
+                                      FROM HabitSchedule d WHERE d.habit_id = Habit.id)
+    WHERE id IN (OLD.habit_id, NEW.habit_id);
+END;
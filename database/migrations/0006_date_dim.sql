@@ -0,0 +1,16 @@
+-- Calendar attributes of each day, keyed on the same day number as
+-- HabitLog.day_num, so weekday and ISO week grouping is a join and an
+-- integer GROUP BY instead of formatting dates row by row. The writes that
+-- add days fill and extend it (BaseDAO.ensure_date_dim), the reads only join it.
+CREATE TABLE IF NOT EXISTS DateDim (day INTEGER PRIMARY KEY,
+                    date TEXT NOT NULL UNIQUE,
+                    iso_year INTEGER NOT NULL,
+                    iso_week INTEGER NOT NULL,
+                    weekday INTEGER NOT NULL,
+                    weekday_name TEXT NOT NULL,
+                    month INTEGER NOT NULL,
+                    label TEXT NOT NULL
+                    );
+
+CREATE INDEX IF NOT EXISTS idx_datedim_iso_week ON DateDim(iso_year, iso_week);
+CREATE INDEX IF NOT EXISTS idx_datedim_weekday ON DateDim(weekday);
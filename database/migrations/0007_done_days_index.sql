@@ -0,0 +1,4 @@
+-- Completed days of each habit in (habit_id, day_num) order, so the
+-- ROW_NUMBER() gaps-and-islands streak queries of StatDAO read them
+-- without sorting and without visiting the done = 0 rows.
+CREATE INDEX IF NOT EXISTS idx_habitlog_done_habit_day ON HabitLog(habit_id, day_num) WHERE done = 1;
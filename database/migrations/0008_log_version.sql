@@ -0,0 +1,53 @@
+-- Counter bumped by every write that changes what the logs read as, so a
+-- cache of them (the Streamlit app's CompletionIndex and ActivityCube) can
+-- tell it is stale with one row read, whichever connection wrote.
+CREATE TABLE IF NOT EXISTS LogVersion (id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL DEFAULT 0
+                    );
+
+INSERT OR IGNORE INTO LogVersion (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_log_insert AFTER INSERT ON HabitLog
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_log_update AFTER UPDATE ON HabitLog
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_log_delete AFTER DELETE ON HabitLog
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_habit_insert AFTER INSERT ON Habit
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_habit_update AFTER UPDATE ON Habit
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_habit_delete AFTER DELETE ON Habit
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_category_update AFTER UPDATE OF name ON Category
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_settings_insert AFTER INSERT ON Settings
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_settings_delete AFTER DELETE ON Settings
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
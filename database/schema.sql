@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS Habit (id INTEGER PRIMARY KEY,
                     category_id INTEGER NOT NULL,
                     is_seed INTEGER DEFAULT 0,
                     create_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    schedule_mask INTEGER NOT NULL DEFAULT 0,
                     FOREIGN KEY (category_id) REFERENCES Category(id)
                     );
 
@@ -21,6 +22,8 @@ CREATE TABLE IF NOT EXISTS HabitLog( id INTEGER PRIMARY KEY,
                         done INTEGER NOT NULL DEFAULT 0,
                         complete_at TEXT,
                         date TEXT NOT NULL DEFAULT CURRENT_DATE,
+                        day_num INTEGER GENERATED ALWAYS AS (CAST(julianday(date) - 2440587.5 AS INTEGER)) VIRTUAL,
+                        complete_ts INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', complete_at) AS INTEGER)) VIRTUAL,
                         UNIQUE(habit_id, date),
                         FOREIGN KEY (habit_id) REFERENCES Habit(id)
                         );
@@ -45,3 +48,170 @@ CREATE TABLE IF NOT EXISTS Settings ( key TEXT NOT NULL ,
                         value TEXT , 
                         create_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
                         );
+
+
+CREATE INDEX IF NOT EXISTS idx_habitlog_date_done ON HabitLog(date, done);
+CREATE INDEX IF NOT EXISTS idx_habitlog_completed ON HabitLog(date) WHERE complete_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_habitschedule_day_habit ON HabitSchedule(day_of_the_week, habit_id);
+CREATE INDEX IF NOT EXISTS idx_habitschedule_habit ON HabitSchedule(habit_id);
+CREATE INDEX IF NOT EXISTS idx_habit_category ON Habit(category_id);
+CREATE INDEX IF NOT EXISTS idx_habitlog_day_done ON HabitLog(day_num, done);
+CREATE INDEX IF NOT EXISTS idx_habitlog_habit_day ON HabitLog(habit_id, day_num);
+CREATE INDEX IF NOT EXISTS idx_habitlog_done_habit_day ON HabitLog(habit_id, day_num) WHERE done = 1;
+
+
+CREATE TABLE IF NOT EXISTS DailyStats (date TEXT NOT NULL,
+                    category_id INTEGER NOT NULL,
+                    scheduled INTEGER NOT NULL DEFAULT 0,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (date, category_id)
+                    ) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_log_insert AFTER INSERT ON HabitLog
+BEGIN
+    INSERT INTO DailyStats (date, category_id, scheduled, done)
+    SELECT NEW.date, h.category_id, 1, NEW.done FROM Habit h WHERE h.id = NEW.habit_id
+    ON CONFLICT(date, category_id) DO UPDATE SET scheduled = scheduled + 1, done = done + excluded.done;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_log_update AFTER UPDATE OF habit_id, done, date ON HabitLog
+BEGIN
+    UPDATE DailyStats SET scheduled = scheduled - 1, done = done - OLD.done
+    WHERE date = OLD.date AND category_id = (SELECT category_id FROM Habit WHERE id = OLD.habit_id);
+    INSERT INTO DailyStats (date, category_id, scheduled, done)
+    SELECT NEW.date, h.category_id, 1, NEW.done FROM Habit h WHERE h.id = NEW.habit_id
+    ON CONFLICT(date, category_id) DO UPDATE SET scheduled = scheduled + 1, done = done + excluded.done;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_log_delete AFTER DELETE ON HabitLog
+BEGIN
+    UPDATE DailyStats SET scheduled = scheduled - 1, done = done - OLD.done
+    WHERE date = OLD.date AND category_id = (SELECT category_id FROM Habit WHERE id = OLD.habit_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_habit_category AFTER UPDATE OF category_id ON Habit
+WHEN OLD.category_id IS NOT NEW.category_id
+BEGIN
+    UPDATE DailyStats SET scheduled = DailyStats.scheduled - moved.scheduled, done = DailyStats.done - moved.done
+    FROM (SELECT date, COUNT(*) AS scheduled, SUM(done) AS done FROM HabitLog WHERE habit_id = NEW.id GROUP BY date) AS moved
+    WHERE DailyStats.date = moved.date AND DailyStats.category_id = OLD.category_id;
+    INSERT INTO DailyStats (date, category_id, scheduled, done)
+    SELECT date, NEW.category_id, COUNT(*), SUM(done) FROM HabitLog WHERE habit_id = NEW.id GROUP BY date
+    ON CONFLICT(date, category_id) DO UPDATE SET scheduled = scheduled + excluded.scheduled, done = done + excluded.done;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dailystats_habit_delete AFTER DELETE ON Habit
+BEGIN
+    UPDATE DailyStats SET scheduled = DailyStats.scheduled - removed.scheduled, done = DailyStats.done - removed.done
+    FROM (SELECT date, COUNT(*) AS scheduled, SUM(done) AS done FROM HabitLog WHERE habit_id = OLD.id GROUP BY date) AS removed
+    WHERE DailyStats.date = removed.date AND DailyStats.category_id = OLD.category_id;
+END;
+
+
+CREATE TABLE IF NOT EXISTS StreakRun (habit_id INTEGER NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (habit_id, start_date)
+                    ) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_streakrun_end ON StreakRun(habit_id, end_date);
+CREATE INDEX IF NOT EXISTS idx_streakrun_length ON StreakRun(habit_id, length);
+
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_mask_insert AFTER INSERT ON HabitSchedule
+BEGIN
+    UPDATE Habit SET schedule_mask = schedule_mask | CASE NEW.day_of_the_week
+            WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+            WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+            WHEN 'Sunday' THEN 64 ELSE 0 END
+    WHERE id = NEW.habit_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_mask_delete AFTER DELETE ON HabitSchedule
+BEGIN
+    UPDATE Habit SET schedule_mask = (SELECT COALESCE(SUM(DISTINCT CASE d.day_of_the_week
+                                            WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+                                            WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+                                            WHEN 'Sunday' THEN 64 END), 0)
+                                      FROM HabitSchedule d WHERE d.habit_id = OLD.habit_id)
+    WHERE id = OLD.habit_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_schedule_mask_update AFTER UPDATE OF habit_id, day_of_the_week ON HabitSchedule
+BEGIN
+    UPDATE Habit SET schedule_mask = (SELECT COALESCE(SUM(DISTINCT CASE d.day_of_the_week
+                                            WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 4
+                                            WHEN 'Thursday' THEN 8 WHEN 'Friday' THEN 16 WHEN 'Saturday' THEN 32
+                                            WHEN 'Sunday' THEN 64 END), 0)
+                                      FROM HabitSchedule d WHERE d.habit_id = Habit.id)
+    WHERE id IN (OLD.habit_id, NEW.habit_id);
+END;
+
+
+CREATE TABLE IF NOT EXISTS DateDim (day INTEGER PRIMARY KEY,
+                    date TEXT NOT NULL UNIQUE,
+                    iso_year INTEGER NOT NULL,
+                    iso_week INTEGER NOT NULL,
+                    weekday INTEGER NOT NULL,
+                    weekday_name TEXT NOT NULL,
+                    month INTEGER NOT NULL,
+                    label TEXT NOT NULL
+                    );
+
+CREATE INDEX IF NOT EXISTS idx_datedim_iso_week ON DateDim(iso_year, iso_week);
+CREATE INDEX IF NOT EXISTS idx_datedim_weekday ON DateDim(weekday);
+
+-- Counter bumped by every write that changes what the logs read as, so a
+-- cache of them (the Streamlit app's CompletionIndex and ActivityCube) can
+-- tell it is stale with one row read, whichever connection wrote.
+CREATE TABLE IF NOT EXISTS LogVersion (id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL DEFAULT 0
+                    );
+
+INSERT OR IGNORE INTO LogVersion (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_log_insert AFTER INSERT ON HabitLog
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_log_update AFTER UPDATE ON HabitLog
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_log_delete AFTER DELETE ON HabitLog
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_habit_insert AFTER INSERT ON Habit
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_habit_update AFTER UPDATE ON Habit
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_habit_delete AFTER DELETE ON Habit
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_category_update AFTER UPDATE OF name ON Category
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_settings_insert AFTER INSERT ON Settings
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_logversion_settings_delete AFTER DELETE ON Settings
+BEGIN
+    UPDATE LogVersion SET version = version + 1 WHERE id = 1;
+END;
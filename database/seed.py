@@ -19,6 +19,7 @@ Usage:
 from datetime import date, timedelta, datetime
 import random
 import sqlite3
+from crud import HabitLogDAO
 
 
 # ---------------------------------------------------------------------------
@@ -96,6 +97,36 @@ def _random_hour():
     return f"{hour:02d}:{minute:02d}:{second:02d}"
 
 
+def _generate_logs(habit_ids, week_starts, end_date):
+    """Yield (habit_id, done, complete_at, date) rows for every scheduled seed day."""
+    for habit in HABITS:
+        habit_id = habit_ids[habit["name"]]
+        scheduled_days = habit["days"]
+
+        for week_index, week_start in enumerate(week_starts):
+            rate = habit["rates"][week_index]
+
+            for day_offset in range(7):
+                current_date = week_start + timedelta(days=day_offset)
+
+                # Don't seed future dates
+                if current_date > end_date:
+                    break
+
+                day_name = current_date.strftime("%A")
+                if day_name not in scheduled_days:
+                    continue
+
+                # Decide done or not
+                done = 1 if random.random() < rate else 0
+                complete_at = None
+                if done:
+                    time_str = _random_hour()
+                    complete_at = f"{current_date.isoformat()} {time_str}"
+
+                yield habit_id, done, complete_at, current_date.isoformat()
+
+
 # ---------------------------------------------------------------------------
 # Core functions
 # ---------------------------------------------------------------------------
@@ -152,11 +183,10 @@ def seed_database(conn, end_date: date = None):
         )
 
         # Schedule
-        for day in habit["days"]:
-            cursor.execute(
-                "INSERT OR IGNORE INTO HabitSchedule (habit_id, day_of_the_week) VALUES (?, ?)",
-                (habit_id, day)
-            )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO HabitSchedule (habit_id, day_of_the_week) VALUES (?, ?)",
+            [(habit_id, day) for day in habit["days"]]
+        )
 
         # HabitHistory
         cursor.execute(
@@ -167,37 +197,15 @@ def seed_database(conn, end_date: date = None):
     conn.commit()
 
     # ---- HabitLogs ----
-    for habit in HABITS:
-        habit_id = habit_ids[habit["name"]]
-        scheduled_days = habit["days"]
-
-        for week_index, week_start in enumerate(week_starts):
-            rate = habit["rates"][week_index]
-
-            for day_offset in range(7):
-                current_date = week_start + timedelta(days=day_offset)
-
-                # Don't seed future dates
-                if current_date > end_date:
-                    break
-
-                day_name = current_date.strftime("%A")
-                if day_name not in scheduled_days:
-                    continue
-
-                # Decide done or not
-                done = 1 if random.random() < rate else 0
-                complete_at = None
-                if done:
-                    time_str = _random_hour()
-                    complete_at = f"{current_date.isoformat()} {time_str}"
-
-                cursor.execute(
-                    "INSERT OR IGNORE INTO HabitLog (habit_id, done, complete_at, date) VALUES (?, ?, ?, ?)",
-                    (habit_id, done, complete_at, current_date.isoformat())
-                )
-
-    conn.commit()
+    habit_log_dao = HabitLogDAO(conn)
+    habit_log_dao.insert_many(
+        "HabitLog",
+        ["habit_id", "done", "complete_at", "date"],
+        _generate_logs(habit_ids, week_starts, end_date),
+        on_conflict="IGNORE"
+    )
+    habit_log_dao.rebuild_streak_runs()
+    habit_log_dao.ensure_date_dim()
     print(f"✅ Seed data inserted — {len(HABITS)} habits, 4 weeks up to {end_date}")
 
 
@@ -233,6 +241,7 @@ def reset_seed_data(conn):
     cursor.execute(f"DELETE FROM Habit         WHERE id        IN ({placeholders})", seed_ids)
 
     conn.commit()
+    HabitLogDAO(conn).rebuild_streak_runs()
     print(f"🗑️  Seed data removed — {len(seed_ids)} habits deleted")
 
 
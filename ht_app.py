@@ -1,10 +1,11 @@
 import streamlit as st
 import streamlit_calendar as st_c
 from crud import HabitDAO,CategoryDAO,HabitLogDAO, StatDAO
-from logic import HabitService,HabitLogService, CategoryService, Utils, HabitNotFound
+from logic import HabitService,HabitLogService, CategoryService, AnalyticsService, Utils, HabitNotFound
 from exception import HabitNotFound,CategoryNotFound, DatabaseError
 import analytics
-from database.database import db_conn
+from analytics_frame import AnalyticsFrame, CompletionIndex, ActivityCube
+from database.database import db_conn, init_database
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
@@ -15,6 +16,7 @@ import numpy as np
 #Setting the base of the app
 st.set_page_config(page_title= "Habit Tracker", page_icon= "🌱", layout= "centered",)
 st.markdown(f"<h1 style='text-align:center;'>Habit Tracker</h1>", unsafe_allow_html=True)
+init_database()
 with db_conn() as conn:
     #DAO
     habit_dao = HabitDAO(conn)
@@ -25,23 +27,11 @@ with db_conn() as conn:
     habit_service = HabitService(habit_dao)
     habit_log_service = HabitLogService(habit_log_dao)
     category_service = CategoryService(category_dao)
+    analytics_service = AnalyticsService(habit_dao, category_dao, analytics_dao, habit_log_dao)
 
     #APP INIT
     habit_log_service.sync_habit_log()
 
-    #DATA
-    habit_list = habit_service.get_today_habit()
-    habit_list_all = habit_service.get_habit()
-    today_logs=habit_log_dao.fetch_today_habit_logs()
-    habit_logs = habit_log_dao.fetch_all_habits_logs()
-    habit_name_list = [habit["name"] for habit in habit_list]
-    #habit_description_list = [habit["description"] for habit in habit_list]
-    habit_name_all_list = [habit["name"] for habit in habit_list_all]
-    category_df = category_service.get_category_df()
-    error = None
-
-    
-    
     #DATE
     today_date_string = datetime.today().strftime('%d/%m/%Y')
     today_datetime_date = datetime.today().date()
@@ -55,16 +45,43 @@ with db_conn() as conn:
         for key in list(st.session_state.keys()):
             if isinstance(key,str) and key.startswith("habit_"):
                 del st.session_state[key]
+        #the new day has new logs, the cached views are rebuilt below
+        st.session_state.pop("log_views", None)
         st.session_state.last_date = today_datetime_date
-    
+
+    #DATA
+    habit_list = habit_service.get_today_habit()
+    habit_list_all = habit_service.get_habit()
+    today_logs=habit_log_dao.fetch_today_habit_logs()
+    #views over every log kept across reruns: built once and updated by the checkboxes.
+    #Any other write (another session, a storage mode switch, the seed...) bumps the
+    #LogVersion counter, and the views are rebuilt when it no longer matches theirs.
+    #The reports read them or aggregate in SQL, the logs are only loaded to build them
+    log_version = habit_log_dao.log_version()
+    if st.session_state.get("log_views", {}).get("version") != log_version:
+        habit_logs_frame = AnalyticsFrame.from_dao(habit_log_dao)
+        st.session_state.log_views = {
+            "version": log_version,
+            #every week and category range of the reports is two lookups in it
+            "completion_index": CompletionIndex.from_frame(habit_logs_frame),
+            #weekday and hour reports are slices of it
+            "activity_cube": ActivityCube.from_frame(habit_logs_frame),
+        }
+    completion_index = st.session_state.log_views["completion_index"]
+    activity_cube = st.session_state.log_views["activity_cube"]
+    habit_name_list = [habit["name"] for habit in habit_list]
+    #habit_description_list = [habit["description"] for habit in habit_list]
+    habit_name_all_list = [habit["name"] for habit in habit_list_all]
+    category_df = category_service.get_category_df()
+    error = None
+
     
     tab1, tab2, tab3, tab4,tab5= st.tabs(["Home", "Habits", "Category", "Analyse Habit", "Reward"])
 
     with tab1:
 
-        rows = analytics_dao.get_habit_streak()
-        daystreak = analytics.current_daystreak(rows,today_datetime_date)
-        longuest_streak = analytics.longuest_daystreak(rows)
+        daystreak = analytics_dao.get_current_streak(today_datetime_date)
+        longuest_streak = analytics_dao.get_longest_streak()
         random_number = np.random.randint(0,1000)
         st.markdown(f"<h5 style='font-size:18px; text-align:center;'>Today : {today_date_string}.</h5>", unsafe_allow_html=True)
         
@@ -80,7 +97,17 @@ with db_conn() as conn:
 
                 new_done = st.checkbox(name,key= key)
                 if new_done != done:
+                    #views still matching the database before this write can follow it
+                    views_current = habit_log_dao.log_version() == st.session_state.log_views["version"]
                     habit_service.update_done(habit_id, done = int(new_done))
+                    #apply the updated log of today to the cached views, it already counts in the totals
+                    log = next(filter(lambda log: log["habit_id"] == habit_id, habit_log_dao.fetch_today_habit_logs() or []), None)
+                    if log is None or not views_current:
+                        st.session_state.pop("log_views", None)
+                    else:
+                        completion_index.record(today_datetime_date, habit_id, name, log["category_name"], done= log["done"] - int(done))
+                        activity_cube.record(today_datetime_date, habit_id, name, log["category_name"], log["done"], log["complete_at"])
+                        st.session_state.log_views["version"] = habit_log_dao.log_version()
                     if new_done == True:
                         st.success("Done")
                     else:
@@ -92,7 +119,7 @@ with db_conn() as conn:
             st.warning(f"{e}")
 
 
-        done, total, rate = analytics.daily_completion_rate(habit_logs, today_datetime_date)
+        done, total, rate = analytics_service.daily_completion_rate(today_datetime_date)
         st.divider()
         col1, col2, col3 = st.columns(3)
         col1.metric("Habits", len(habit_list))
@@ -341,7 +368,7 @@ with db_conn() as conn:
             report_slider = st.pills("Report",options=["Daily","Weekly","Habit", "Category",],label_visibility= "collapsed", default= "Daily")
             if report_slider == "Daily":
                 col1,col2 = st.columns([0.4,0.6], border =True, gap = None)
-                done, not_done, rate = analytics.daily_completion_rate(habit_logs, today_datetime_date)
+                done, not_done, rate = analytics_service.daily_completion_rate(today_datetime_date)
                 with col1:
                     st.subheader("Daily Completion Rate")
                     fig = px.pie(names= ["Completed", "Not completed"],values = (done, not_done), hole = 0.7 )
@@ -401,7 +428,7 @@ with db_conn() as conn:
                 week_start = (datetime.today() - timedelta(days = datetime.today().weekday()) + timedelta(weeks= st.session_state.week_offset)).date()
                 week_end = week_start + timedelta(6)
                 col1,col2 = st.columns([0.4,0.6], border =True, gap = None)
-                done, not_done, rate = analytics.weekly_completion_rate(habit_logs, week_start, week_end)
+                done, not_done, rate = completion_index.completion_rate(week_start, week_end)
                 with col1:
                     st.subheader("Weekly Completion Rate")
                     fig = px.pie(names= ["Completed", "Not completed"],values = (done, not_done), hole = 0.7 )
@@ -431,18 +458,30 @@ with db_conn() as conn:
                                 st.session_state.week_offset += 1
                                 st.rerun()
 
-                        df = analytics.weekly_completion_day_per_day(habit_logs, week_start, week_end)
+                        df = completion_index.weekly_completion_day_per_day(week_start, week_end)
                         fig = px.bar(df,x= "date_label", y = "completion_rate", labels={"date_label": "Day", "completion_rate": "Completion Rate"})
                         fig.update_xaxes(range = [0,None])
                         fig.update_yaxes(range = [0,1])
                         st.plotly_chart(fig)
+                #completions per hour over the week
+                histogram = analytics.hour_counts_frame(activity_cube.hour_heatmap(week_start, week_end).sum(axis= 0))
+                best_period = analytics.best_period(histogram)
+                if best_period:
+                    fig = px.bar(histogram, x= "hour_range", y= "completions", title= "Best Productivity Period",
+                                 labels= {"hour_range": "Hour of the Day", "completions": "Number of Completed Habits"})
+                    fig.update_xaxes(type= "category")
+                    st.plotly_chart(fig)
+                    st.text(f"This week you were most productive between {best_period}h.")
+                best_day = activity_cube.weekly_best_productivity_day(week_start)
+                if best_day:
+                    st.text(f"Your best day this week : {best_day}")
 
             if report_slider == "Habit":
                 st.subheader("Habits reports.", text_alignment= "center")
                 col1,col2 = st.columns(2,gap = None , border= True)
                 with col1:
         
-                    done, not_done, rate = analytics.completion_rate(habit_logs)
+                    done, not_done, rate = completion_index.completion_rate()
                     st.subheader("Global Completion Rate")
                     fig = px.pie(names= ["Completed", "Not completed"],values = (done, not_done), hole = 0.7 )
                     fig.update_layout(annotations=[dict(
@@ -456,14 +495,14 @@ with db_conn() as conn:
                     st.divider()
                     #max streak by habits
                     st.subheader("Habits Streaks:")
-                    habit_streaks_list = analytics.longuest_habit_streak(habit_logs)
+                    habit_streaks_list = analytics_dao.get_longest_habit_streaks()
                     fig = px.bar(x = list(habit_streaks_list.keys()), y = list(habit_streaks_list.values()), labels= {"x": "Habits", "y": "Longest streak"})
                     st.plotly_chart(fig)
                     best_habit = max(habit_streaks_list, key= lambda k:habit_streaks_list[k])
                     st.text(f"The habit with the longuest streak is :\n {best_habit}")
                 with col2:
                     st.subheader("Completed Habits", text_alignment= "center")
-                    done_by_habits = analytics.group_habit_for_plot(habit_logs)
+                    done_by_habits = analytics.group_habit_for_plot(habit_log_dao)
                     fig = px.bar( x = done_by_habits["habit_name"], y = done_by_habits["done"], labels={"x": "Habits", "y": "Times completed"})
                     st.plotly_chart(fig)
                     with st.container(border = True, height= 350 ):
@@ -481,7 +520,7 @@ with db_conn() as conn:
                     st.subheader(f"Habit report: {habit_name}", text_alignment="center")
                     col1,col2 = st.columns(2)
                     with col1:
-                        done, not_done, rate = analytics.habit_completion_rate(habit_logs, habit_name)
+                        done, not_done, rate = completion_index.completion_rate(habit_name= habit_name)
                         st.subheader("Completion Rate")
                         fig = px.pie(names= ["Completed", "Not completed"],values = (done, not_done), hole = 0.7 )
                         fig.update_layout(annotations=[dict(
@@ -492,12 +531,37 @@ with db_conn() as conn:
                                                             showarrow=False)],
                                             showlegend=False)
                         st.plotly_chart(fig)
-                        df = analytics.habit_most_productive_day(habit_logs, habit_name)
+                        df = activity_cube.habit_most_productive_day(habit_name)
                         st.text(f"The most productive days for this habit is : {df}")
+                        period = analytics.best_period(analytics.hour_counts_frame(activity_cube.hour_heatmap(habit_name= habit_name).sum(axis= 0)))
+                        if period:
+                            st.text(f"The most productive period for this habit is : {period}h")
                     with col2:
                         with st.container(border= True):
-                            habit_streak_by_habit = analytics.longuest_habit_streak_by_habit(habit_logs, habit_name)
-                            st.text(f"Best streak : {habit_streak_by_habit}")
+                            habit_row = next(filter(lambda h: h["name"] == habit_name, habit_list_all), None)
+                            habit_streaks = analytics.schedule_streaks(habit_log_dao.fetch_habit_logs_per_habit(habit_row["habit_id"]) if habit_row else [],
+                                                                       habit_dao.fetch_schedule_masks(habit_row["habit_id"]) if habit_row else {},
+                                                                       today_datetime_date)
+                            habit_streak = habit_streaks[habit_streaks["habit_name"] == habit_name]
+                            current_streak = int(habit_streak["current_streak"].iloc[0]) if len(habit_streak) else 0
+                            longest_streak = int(habit_streak["longest_streak"].iloc[0]) if len(habit_streak) else 0
+                            st.text(f"Current streak : {current_streak}")
+                            st.text(f"Best streak : {longest_streak}")
+                    #completions per weekday and hour of the habit
+                    heatmap = activity_cube.hour_heatmap(habit_name= habit_name)
+                    fig = px.imshow(heatmap, labels= {"x": "Hour of the Day", "y": "Day", "color": "Completions"}, aspect= "auto")
+                    st.plotly_chart(fig)
+                    #rolling completion rates of the habit
+                    st.subheader("Trend")
+                    trend = completion_index.rolling_completion_rates(by= "habit", name= habit_name)
+                    fig = px.line(trend, x= "date", y= "completion_rate", color= "window",
+                                  labels= {"date": "Day", "completion_rate": "Completion rate", "window": "Days"})
+                    fig.update_yaxes(tickformat= ".0%", range= [0,1])
+                    st.plotly_chart(fig)
+                    week_over_week = completion_index.week_over_week(today_datetime_date)
+                    delta = week_over_week[week_over_week["name"] == habit_name]["delta"]
+                    if len(delta) and not np.isnan(delta.iloc[0]):
+                        st.text(f"You've done this habit {abs(delta.iloc[0])*100:.0f}% {'more' if delta.iloc[0] >= 0 else 'less'} this week than last week.")
 
             if report_slider == "Category":
                 
@@ -517,7 +581,7 @@ with db_conn() as conn:
                 if selected_pills == options_filtering[2]:
                     date = None
 
-                df = analytics.category_completion_rate(habit_logs,date)
+                df = completion_index.category_completion_rate(date)
                 fig = px.bar(df.sort_values("completion_rate").rename(columns= {"category_name": "Category", "completion_rate": "Completion rate"}),
                             x="Category",
                             y="Completion rate",
@@ -541,8 +605,8 @@ with db_conn() as conn:
                     st.subheader(f"Category Analytics: {category_name}", text_alignment="center")
                     col1,col2 = st.columns(2)
                     with col1:
-                        category_rate = analytics.category_completion_rate_per_category(habit_logs, category_name)
-                        rate = category_rate["completion_rate"].iloc[0]
+                        done, not_done, rate = completion_index.completion_rate(category_name= category_name)
+                        rate = rate/100
                         st.subheader("Completion Rate")
                         fig = px.pie(names= ["Completed", "Not Completed"], values = [rate, 1-rate], hole = 0.7 )
                         fig.update_layout(annotations=[dict(
@@ -40,8 +40,7 @@ class HabitService:
     def init_app(self):
         self.habit_dao.add_daily_habit_log()
     def get_today_habit_df(self):
-        rows = self.habit_dao.fetch_today_habit()
-        df = pd.DataFrame(rows)
+        df = self.habit_dao.fetch_today_habit_frame()
         if df.empty:
             raise HabitNotFound("No habit for today.")
         return df
@@ -52,14 +51,10 @@ class HabitService:
 
         return rows
     def get_habit_by_day_df(self, selected_day) -> pd.DataFrame:
-        rows = self.habit_dao.fetch_habit_by_day()
-        df = pd.DataFrame([dict(row) for row in rows])
-        df_filtre = df[df["day"] == selected_day]
-        if len(df_filtre) == 0:
+        rows = self.habit_dao.fetch_habit_by_day(selected_day)
+        if not rows:
             raise HabitNotFound("No habit for today.")
-        else:
-            df_filtre = df_filtre.drop(columns= ["day"])
-            return df_filtre
+        return pd.DataFrame([dict(row) for row in rows])
     def get_habit(self):
         rows = self.habit_dao.fetch_habit()
         if not rows:
@@ -96,8 +91,7 @@ class CategoryService:
             raise CategoryNotFound("No category found")
         return result
     def get_category_df(self) -> pd.DataFrame:
-        rows = self.category_dao.fetch_category()
-        df = pd.DataFrame([dict(row) for row in rows])
+        df = self.category_dao.fetch_category_frame()
         if df.empty:
             raise CategoryNotFound("No category found")
         
@@ -118,29 +112,74 @@ class AnalyticsService:
         
     #into the stat tabs the user will have access to smart statistical plot, the goal is to give overall information with text that could help to improve productivity
     def get_habit_streak(self):
-        rows = self.habit_log_dao.get_habit_streak()
-        today =datetime.today().date()
-        last_completed = datetime.strptime(rows[0][0], "%Y-%m-%d").date()
-        if not rows:
-            return 0
-        if (today - last_completed).days > 1:
-            return 0
-        else:
-            streak = 0
-            expected_date = last_completed
-
-            for row in rows:
-                row_date = datetime.strptime(row[0], "%Y-%m-%d").date()
-
-                if row_date == expected_date:
-                    streak +=1
-                    expected_date -= timedelta(days=1)
-                else:
-                    break
-        return streak
+        """
+        Current "any habit done" streak, computed in SQL by StatDAO.get_daystreaks.
+
+        Returns:
+            int: Consecutive days up to today or yesterday with a completed habit.
+        """
+        current, _ = self.stat_dao.get_daystreaks(datetime.today().date())
+        return current
     def get_today_number_of_habit(self):
         result = self.stat_dao.get_today_number_of_habit()
         return result
+    def daily_completion_rate(self, day):
+        """
+        Completion rate of one day, served from DailyStats.
+
+        Same result as analytics.daily_completion_rate on the full logs.
+
+        Returns:
+            tuple: done (int), not_done (int), rate (float).
+        """
+        return self.weekly_completion_rate(day, day)
+    def weekly_completion_rate(self, week_start, week_end):
+        """
+        Completion rate between two dates (inclusive), served from DailyStats.
+
+        Same result as analytics.weekly_completion_rate on the full logs.
+
+        Returns:
+            tuple: done (int), not_done (int), rate (float).
+        """
+        rows = self.stat_dao.get_daily_stats(week_start, week_end)
+        done = sum(row["completed"] for row in rows)
+        total = sum(row["total"] for row in rows)
+        if total == 0:
+            return 0,0,0
+        return done, total - done, (done/total)*100
+    def weekly_completion_day_per_day(self, week_start, week_end):
+        """
+        Completion rate of each day of a week, served from DailyStats.
+
+        Returns:
+            pd.DataFrame: Same columns as analytics.weekly_completion_day_per_day,
+                'date', 'date_label', 'completed', 'total' and 'completion_rate'.
+        """
+        rows = self.stat_dao.get_daily_stats(week_start, week_end)
+        df = pd.DataFrame([dict(row) for row in rows], columns= ["date", "date_label", "completed", "total"])
+        df["completion_rate"] = df["completed"]/df["total"]
+        return df
+    def category_completion_rate(self, date):
+        """
+        Completion rate per category, served from DailyStats.
+
+        Args:
+            date: Same filtering option as analytics.category_completion_rate,
+                a datetime.date, a [start, end] list or None for all days.
+
+        Returns:
+            pd.DataFrame: Columns 'category_name', 'completed', 'total' and 'completion_rate'.
+        """
+        if isinstance(date, list):
+            rows = self.stat_dao.get_category_stats(date[0], date[1])
+        elif date:
+            rows = self.stat_dao.get_category_stats(date, date)
+        else:
+            rows = self.stat_dao.get_category_stats()
+        df = pd.DataFrame([dict(row) for row in rows], columns= ["category_name", "completed", "total"])
+        df["completion_rate"] = df["completed"]/df["total"]
+        return df
     def progress_bar(self):
         streak = self.get_habit_streak()
         number_of_habit = self.get_today_number_of_habit()
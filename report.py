@@ -0,0 +1,167 @@
+"""
+report.py - Batch report over a directory of habit databases.
+
+Summarises every habit database found under a directory (one per team
+member) in a pool of worker processes: completion rates, the current week,
+streaks, per-category rates and the most productive hour. Databases are
+opened read-only, so old schema versions are reported as they are.
+
+Usage:
+    python report.py DIRECTORY [--workers N] [--pattern GLOB] [--output report.json|report.csv]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import analytics
+from analytics_frame import AnalyticsFrame
+from crud import HabitLogDAO
+
+
+def summarise_database(path, today_date = None):
+    """
+    Computes the report metrics of one habit database.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        today_date (datetime.date, optional): Reference day, today by default.
+
+    Returns:
+        dict: The metrics of the database with its path and the seconds it
+            took, or the path, an 'error' message and the seconds if the
+            database could not be read.
+
+    Example:
+        >>> summarise_database("team/alice/habit_tracker.db")["completion_rate"]
+        74.28571428571429
+    """
+    today_date = today_date or date.today()
+    start = time.perf_counter()
+    try:
+        conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri= True)
+        conn.row_factory = sqlite3.Row
+        try:
+            habit_logs = HabitLogDAO(conn).fetch_all_habits_logs() or []
+        finally:
+            conn.close()
+        return _summarise_logs(path, habit_logs, today_date, start)
+    except Exception as e:
+        #one bad file must not abort the report of every other database
+        return {"database": str(path), "error": f"{type(e).__name__}: {e}", "seconds": time.perf_counter() - start}
+
+
+def _summarise_logs(path, habit_logs, today_date, start):
+    #metrics of summarise_database over the fetched logs
+    frame = AnalyticsFrame.from_logs(habit_logs)
+    week_start = today_date - timedelta(days= today_date.weekday())
+    done, not_done, rate = frame.completion_rate()
+    week_done, week_not_done, week_rate = frame.weekly_completion_rate(week_start, week_start + timedelta(6))
+    done_logs = list(filter(lambda log: log["done"] == 1, habit_logs))
+    habit_streaks = frame.habit_streaks(today_date)
+    categories = frame.category_completion_rate(None)
+    return {
+        "database": str(path),
+        "habits": len(frame.habit_names),
+        "logs": len(frame),
+        "done": done,
+        "not_done": not_done,
+        "completion_rate": rate,
+        "week_completion_rate": week_rate,
+        "current_streak": analytics.current_daystreak(done_logs, today_date),
+        "longest_streak": analytics.longuest_daystreak(done_logs),
+        "best_habit": habit_streaks.sort_values("longest_streak", ascending= False, kind= "stable")["habit_name"].iloc[0] if len(habit_streaks) else None,
+        "best_period": analytics.best_period(frame.productivity_histogram()),
+        "categories": {} if categories.empty else dict(zip(categories["category_name"], categories["completion_rate"])),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def find_databases(directory, pattern = "**/*.db"):
+    """Sorted paths of the database files under directory matching the glob pattern."""
+    return sorted(str(path) for path in Path(directory).glob(pattern) if path.is_file())
+
+
+def generate_report(paths, workers = None, today_date = None, progress = None):
+    """
+    Summarises many databases in a process pool.
+
+    Databases are handed to the workers in batches so that thousands of
+    small files do not cost one round trip each.
+
+    Args:
+        paths (list[str]): Database files to summarise.
+        workers (int, optional): Number of processes, os.cpu_count() by
+            default; 1 runs everything in this process.
+        today_date (datetime.date, optional): Reference day of every summary.
+        progress (callable, optional): Called with each summary as it arrives.
+
+    Returns:
+        list[dict]: One summarise_database result per path, in order.
+    """
+    workers = workers or os.cpu_count() or 1
+    today_date = today_date or date.today()
+    summaries = []
+    if workers == 1:
+        results = map(summarise_database, paths, [today_date] * len(paths))
+        for summary in results:
+            summaries.append(summary)
+            if progress:
+                progress(summary)
+        return summaries
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers= workers) as executor:
+        for summary in executor.map(summarise_database, paths, [today_date] * len(paths), chunksize= chunksize):
+            summaries.append(summary)
+            if progress:
+                progress(summary)
+    return summaries
+
+
+def write_report(summaries, output):
+    """
+    Writes the consolidated report, JSON or CSV depending on the extension.
+
+    In CSV the category rates become one 'category:<name>' column each.
+    """
+    if output.endswith(".csv"):
+        rows = [{**{key: value for key, value in summary.items() if key != "categories"},
+                 **{f"category:{name}": rate for name, rate in summary.get("categories", {}).items()}} for summary in summaries]
+        pd.DataFrame(rows).to_csv(output, index= False)
+    else:
+        with open(output, "w") as f:
+            json.dump(summaries, f, indent= 2, default= float)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description= "Nightly report over a directory of habit databases.")
+    parser.add_argument("directory", help= "Directory searched for database files.")
+    parser.add_argument("--workers", type= int, default= None, help= "Worker processes, the number of CPUs by default.")
+    parser.add_argument("--pattern", default= "**/*.db", help= "Glob of the database files under the directory.")
+    parser.add_argument("--output", default= "habit_report.json", help= "Report file, .json or .csv.")
+    args = parser.parse_args(argv)
+
+    paths = find_databases(args.directory, args.pattern)
+    if not paths:
+        print(f"No database found in {args.directory}", file= sys.stderr)
+        return 1
+    start = time.perf_counter()
+    def progress(summary):
+        status = summary.get("error") or f"{summary['logs']} logs"
+        print(f"{summary['seconds']:>8.3f}s  {summary['database']}  ({status})")
+    summaries = generate_report(paths, args.workers, progress= progress)
+    write_report(summaries, args.output)
+    errors = sum(1 for summary in summaries if "error" in summary)
+    print(f"{len(summaries)} databases in {time.perf_counter() - start:.2f}s, {errors} error(s), report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import pytest
+import sqlite3
+from datetime import date, timedelta
+import pandas as pd
+import analytics
+from aggregates import CompletionTotals, HourHistogram, StreakSummary, LogAggregates
+from database.database import migrate
+from database.seed import seed_database
+from crud import HabitLogDAO
+
+today_date = date.today()
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, today_date)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def habit_logs(conn):
+    return HabitLogDAO(conn).fetch_all_habits_logs()
+
+
+def _check(aggregates, habit_logs):
+    assert aggregates.totals.completion_rate() == analytics.completion_rate(habit_logs)
+    pd.testing.assert_frame_equal(aggregates.totals.category_completion_rate(), analytics.category_completion_rate(habit_logs, None))
+    pd.testing.assert_frame_equal(aggregates.hours.result(), analytics.productivity_histogram(habit_logs))
+    pd.testing.assert_frame_equal(aggregates.streaks.habit_streaks(today_date), analytics.habit_streaks(habit_logs, today_date))
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_streamed_aggregates(conn, habit_logs, chunk_size):
+    chunks = HabitLogDAO(conn).iter_all_habits_logs(chunk_size= chunk_size, batches= True, ordered= True)
+    _check(LogAggregates.from_chunks(chunks), habit_logs)
+
+def test_merged_date_ranges(conn, habit_logs):
+    dao = HabitLogDAO(conn)
+    middle = today_date - timedelta(days= 10)
+    recent = LogAggregates.from_chunks(dao.iter_all_habits_logs(batches= True, start_date= middle + timedelta(1)))
+    older = LogAggregates.from_chunks(dao.iter_all_habits_logs(batches= True, end_date= middle))
+    #merge order does not matter for disjoint ranges
+    _check(recent.merge(older), habit_logs)
+
+def test_completion_totals_per_habit(habit_logs):
+    totals = CompletionTotals().update(habit_logs[::2]).merge(CompletionTotals().update(habit_logs[1::2]))
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        assert totals.completion_rate(habit_name= habit_name) == analytics.habit_completion_rate(habit_logs, habit_name)
+    assert CompletionTotals().completion_rate() == (0,0,0)
+    assert CompletionTotals().category_completion_rate().empty
+
+def test_hour_histogram_filters(habit_logs):
+    hours = HourHistogram(category_name= "Health").update(habit_logs)
+    pd.testing.assert_frame_equal(hours.result(), analytics.productivity_histogram(habit_logs, category_name= "Health"))
+    with pytest.raises(ValueError):
+        hours.merge(HourHistogram())
+
+def test_streak_summary_rejects_interleaved_chunks():
+    logs = [{"habit_name": "Meditation", "category_name": "Health", "done": 1, "complete_at": None, "date": f"2026-03-{day:02d}"} for day in range(1, 8)]
+    summary = StreakSummary().update(logs[::2])
+    with pytest.raises(ValueError):
+        summary.update(logs[1::2])
+
+def test_streak_summary_chunk_order():
+    logs = [{"habit_name": "Meditation", "category_name": "Health", "done": int(day != 4), "complete_at": None, "date": f"2026-03-{day:02d}"} for day in range(1, 11)]
+    chunks = [logs[start:start + 2] for start in range(0, 10, 2)]
+    expected = [{"habit_name": "Meditation", "current_streak": 6, "longest_streak": 6}]
+    #each chunk extends the consumed days at one end
+    summary = StreakSummary()
+    for chunk in reversed(chunks):
+        summary.update(chunk)
+    assert summary.habit_streaks(date(2026, 3, 10)).to_dict("records") == expected
+    summary = StreakSummary().update(chunks[2]).update(chunks[1]).update(chunks[3]).update(chunks[0]).update(chunks[4])
+    assert summary.habit_streaks(date(2026, 3, 10)).to_dict("records") == expected
+    #a chunk between two consumed ones
+    summary = StreakSummary().update(chunks[0]).update(chunks[4])
+    with pytest.raises(ValueError):
+        summary.update(chunks[2])
+
+def test_streak_summary_joins_runs():
+    logs = [{"habit_name": "Meditation", "category_name": "Health", "done": int(day != 4), "complete_at": None, "date": f"2026-03-{day:02d}"} for day in range(1, 11)]
+    summary = StreakSummary()
+    for start in range(0, 10, 2):
+        summary.update(logs[start:start + 2])
+    assert summary.habit_streaks(date(2026, 3, 10)).to_dict("records") == [{"habit_name": "Meditation", "current_streak": 6, "longest_streak": 6}]
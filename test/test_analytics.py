@@ -1,6 +1,7 @@
 import pytest
 import sqlite3
 from datetime import date, timedelta
+import numpy as np
 import analytics
 from database.seed import seed_database, reset_seed_data
 today_date = date.today()
@@ -35,6 +36,12 @@ def habit_logs_per_date(conn, date):
 
 #test of analytics.py
 
+def test_parse_date_is_interned():
+    assert analytics.parse_date("2026-03-13") == date(2026, 3, 13)
+    assert analytics.parse_date("2026-03-13") is analytics.parse_date("2026-03-13")
+    assert analytics.date_label("2026-03-13") == "Friday - 13-03"
+    assert analytics.parse_date.cache_info().maxsize == analytics.DATE_CACHE_SIZE
+
 def test_current_daystreak(habit_logs):
     streak = analytics.current_daystreak(habit_logs, today_date)
     assert isinstance(streak, int)
@@ -91,6 +98,33 @@ def test_best_productivity_period(today_logs):
         assert 'hour_range' in df.columns
         assert 'hour' in df.columns
 
+def test_weekly_best_productivity_day(habit_logs):
+    week_start = today_date - timedelta(days= today_date.weekday())
+    assert analytics.weekly_best_productivity_day(habit_logs, week_start, week_start + timedelta(6)) in analytics.WEEKDAYS
+    assert analytics.weekly_best_productivity_day([], week_start, week_start + timedelta(6)) is None
+
+def test_best_weekday():
+    assert analytics.best_weekday({"Monday": 3, "Friday": 3, "Sunday": 1}) == "Friday"
+    assert analytics.best_weekday({"Sunday": 0}) == "Sunday"
+    assert analytics.best_weekday({}) is None
+
+def test_productivity_histogram():
+    logs = [
+        {"habit_name": "Morning Run", "category_name": "Health", "date": "2026-03-09", "complete_at": "2026-03-09 07:15:00"},
+        {"habit_name": "Morning Run", "category_name": "Health", "date": "2026-03-10", "complete_at": "2026-03-10 07:45:00"},
+        {"habit_name": "Meditation", "category_name": "Health", "date": "2026-03-10", "complete_at": "2026-03-10 21:00:00"},
+        {"habit_name": "Reading", "category_name": "Learning", "date": "2026-03-16", "complete_at": "2026-03-16 21:30:00"},
+        {"habit_name": "Reading", "category_name": "Learning", "date": "2026-03-17", "complete_at": None},
+    ]
+    histogram = analytics.productivity_histogram(logs)
+    assert len(histogram) == 24
+    assert histogram["completions"].iloc[7] == 2
+    assert histogram["share"].sum() == pytest.approx(1)
+    assert analytics.best_period(analytics.productivity_histogram(logs, category_name= "Learning")) == "21-22"
+    assert analytics.weekly_best_productivity_period(logs, date(2026, 3, 9), date(2026, 3, 15)) == "7-8"
+    assert analytics.weekly_best_productivity_period(logs, date(2026, 3, 23), date(2026, 3, 29)) is None
+    assert analytics.habit_most_productive_period(logs, "Meditation") == "21-22"
+
 def test_weekly_completion_rate(habit_logs):
     week_start = today_date - timedelta(days= today_date.weekday())
     week_end = week_start - timedelta(weeks= 1)
@@ -126,6 +160,68 @@ def test_longuest_habit_streak_by_habit_empty_name(habit_logs):
 
     assert result == 0
 
+def test_habit_streaks():
+    logs = [
+        {"habit_name": "Morning Run", "done": 1, "date": "2026-03-10"},
+        {"habit_name": "Morning Run", "done": 1, "date": "2026-03-11"},
+        {"habit_name": "Morning Run", "done": 1, "date": "2026-03-11"},
+        {"habit_name": "Morning Run", "done": 1, "date": "2026-03-12"},
+        {"habit_name": "Morning Run", "done": 0, "date": "2026-03-13"},
+        {"habit_name": "Morning Run", "done": 1, "date": "2026-03-14"},
+        {"habit_name": "Meditation", "done": 1, "date": "2026-03-14"},
+        {"habit_name": "Meditation", "done": 1, "date": "2026-03-15"},
+        {"habit_name": "Reading", "done": 0, "date": "2026-03-15"},
+    ]
+    result = analytics.habit_streaks(logs, date(2026, 3, 15))
+    assert result.to_dict("records") == [
+        {"habit_name": "Meditation", "current_streak": 2, "longest_streak": 2},
+        {"habit_name": "Morning Run", "current_streak": 1, "longest_streak": 3},
+    ]
+    assert analytics.habit_streaks(logs)["current_streak"].sum() == 0
+
+def test_habit_streaks_match_longuest_habit_streak(habit_logs):
+    result = analytics.habit_streaks(habit_logs, today_date)
+    assert dict(zip(result["habit_name"], result["longest_streak"])) == analytics.longuest_habit_streak(habit_logs)
+
+def test_scheduled_day_index_is_consecutive():
+    weekdays = analytics.schedule_mask(analytics.WEEKDAYS[:5])
+    days = np.arange(20500, 20600)
+    scheduled = analytics.is_scheduled_day(days, np.full(len(days), weekdays))
+    ordinals = analytics.scheduled_day_index(days[scheduled], np.full(scheduled.sum(), weekdays))
+    assert (np.diff(ordinals) == 1).all()
+    assert (np.diff(analytics.scheduled_day_index(days, np.zeros(len(days), dtype= int))) == 1).all()
+
+def test_schedule_streaks():
+    monday = date(2026, 3, 2)
+    logs = [{"habit_name": "Morning Run", "done": 1, "date": (monday + timedelta(i)).isoformat()} for i in range(14) if i % 7 < 5]
+    logs += [{"habit_name": "Weekly Review", "done": 1, "date": (monday + timedelta(weeks= i, days= 6)).isoformat()} for i in range(2)]
+    #done on an unscheduled day, ignored
+    logs += [{"habit_name": "Weekly Review", "done": 1, "date": "2026-03-11"}]
+    masks = {"Morning Run": analytics.schedule_mask(analytics.WEEKDAYS[:5]), "Weekly Review": analytics.schedule_mask(["Sunday"])}
+
+    result = analytics.schedule_streaks(logs, masks, date(2026, 3, 21))
+    assert result.to_dict("records") == [
+        {"habit_name": "Morning Run", "current_streak": 0, "longest_streak": 10},
+        {"habit_name": "Weekly Review", "current_streak": 2, "longest_streak": 2},
+    ]
+    #the weekend does not break the weekdays streak
+    assert analytics.schedule_streaks(logs, masks, date(2026, 3, 16))["current_streak"].tolist() == [10, 2]
+
+def test_habit_productivity_plot():
+    start = date(2026, 3, 1)
+    #done the first week, missed the second one
+    logs = [{"habit_name": "Meditation", "done": int(i < 7), "date": (start + timedelta(i)).isoformat()} for i in range(14)]
+    result = analytics.habit_productivity_plot(logs, "Meditation", windows= (7,))
+    assert list(result.columns) == ["date", "name", "window", "completed", "total", "completion_rate", "week_over_week"]
+    assert len(result) == 14
+    assert result["completion_rate"].iloc[6] == 1
+    assert result["completion_rate"].iloc[13] == 0
+    assert result["week_over_week"].iloc[13] == -1
+    assert result["week_over_week"].iloc[:7].isna().all()
+
+def test_habit_productivity_plot_empty(habit_logs):
+    assert analytics.habit_productivity_plot(habit_logs, "").empty
+
 def test_habit_completion_rate(habit_logs):
     habit_name = "Morning Run"
     done, not_done, rate = analytics.habit_completion_rate(habit_logs,habit_name)
@@ -175,4 +271,30 @@ def test_category_completion_rate_empty():
 
     import pandas as pd
     assert isinstance(result, pd.DataFrame)
-    assert len(result) == 0 
\ No newline at end of file
+    assert len(result) == 0 
+@pytest.mark.parametrize("storage", ["dense", "sparse"])
+def test_sql_execution_mode(conn, habit_logs, storage):
+    import pandas as pd
+    from crud import HabitLogDAO
+    dao = HabitLogDAO(conn)
+    dao.set_log_storage(storage)
+    week_start = today_date - timedelta(days= today_date.weekday())
+    assert analytics.completion_rate(dao) == analytics.completion_rate(habit_logs)
+    assert analytics.daily_completion_rate(dao, today_date) == analytics.daily_completion_rate(habit_logs, today_date)
+    for weeks in range(-3, 1):
+        start = week_start + timedelta(weeks= weeks)
+        end = start + timedelta(6)
+        assert analytics.weekly_completion_rate(dao, start, end) == analytics.weekly_completion_rate(habit_logs, start, end)
+        assert analytics.weekly_best_productivity_day(dao, start, end) == analytics.weekly_best_productivity_day(habit_logs, start, end)
+        pd.testing.assert_frame_equal(analytics.weekly_completion_day_per_day(dao, start, end),
+                                      analytics.weekly_completion_day_per_day(habit_logs, start, end))
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        assert analytics.habit_completion_rate(dao, habit_name) == analytics.habit_completion_rate(habit_logs, habit_name)
+        assert analytics.habit_most_productive_day(dao, habit_name) == analytics.habit_most_productive_day(habit_logs, habit_name)
+    for category_name in {log["category_name"] for log in habit_logs}:
+        pd.testing.assert_frame_equal(analytics.category_completion_rate_per_category(dao, category_name),
+                                      analytics.category_completion_rate_per_category(habit_logs, category_name))
+    for period in (today_date, [today_date - timedelta(weeks= 1), today_date], None):
+        pd.testing.assert_frame_equal(analytics.category_completion_rate(dao, period), analytics.category_completion_rate(habit_logs, period))
+    assert analytics.habit_completion_rate(dao, "Unknown") == (0,0,0)
+    pd.testing.assert_frame_equal(analytics.group_habit_for_plot(dao), analytics.group_habit_for_plot(habit_logs))
@@ -0,0 +1,234 @@
+import pytest
+import sqlite3
+from datetime import date, timedelta
+import pandas as pd
+import analytics
+from analytics_frame import AnalyticsFrame, CompletionIndex, ActivityCube
+from database.database import migrate
+from database.seed import seed_database
+from crud import HabitDAO, HabitLogDAO
+
+today_date = date.today()
+week_start = today_date - timedelta(days= today_date.weekday())
+week_end = week_start + timedelta(6)
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, today_date)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def habit_logs(conn):
+    return HabitLogDAO(conn).fetch_all_habits_logs()
+
+@pytest.fixture(params= ["logs", "columns"])
+def frame(request, conn, habit_logs):
+    if request.param == "logs":
+        return AnalyticsFrame.from_logs(habit_logs)
+    return AnalyticsFrame.from_dao(HabitLogDAO(conn))
+
+
+def test_completion_rates(frame, habit_logs):
+    assert frame.completion_rate() == analytics.completion_rate(habit_logs)
+    assert frame.daily_completion_rate(today_date) == analytics.daily_completion_rate(habit_logs, today_date)
+    assert frame.weekly_completion_rate(week_start, week_end) == analytics.weekly_completion_rate(habit_logs, week_start, week_end)
+    for habit_name in ["Morning Run", "Weekly Review", ""]:
+        assert frame.habit_completion_rate(habit_name) == analytics.habit_completion_rate(habit_logs, habit_name)
+
+def test_weekly_completion_day_per_day(frame, habit_logs):
+    for offset in range(4):
+        start = week_start - timedelta(weeks= offset)
+        expected = analytics.weekly_completion_day_per_day(habit_logs, start, start + timedelta(6))
+        result = frame.weekly_completion_day_per_day(start, start + timedelta(6))
+        pd.testing.assert_frame_equal(result, expected, check_dtype= False)
+
+@pytest.mark.parametrize("period", ["daily", "weekly", "global"])
+def test_category_completion_rate(frame, habit_logs, period):
+    date = {"daily": today_date, "weekly": [today_date - timedelta(weeks= 1), today_date], "global": None}[period]
+    expected = analytics.category_completion_rate(habit_logs, date)
+    result = frame.category_completion_rate(date)
+    pd.testing.assert_frame_equal(result, expected, check_dtype= False)
+
+def test_habit_most_productive_day(frame, habit_logs):
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        assert frame.habit_most_productive_day(habit_name) == analytics.habit_most_productive_day(habit_logs, habit_name)
+    assert frame.habit_most_productive_day("Unknown") is None
+
+def test_habit_streaks(frame, habit_logs):
+    today = date.today()
+    pd.testing.assert_frame_equal(frame.habit_streaks(today), analytics.habit_streaks(habit_logs, today))
+
+def test_schedule_streaks(conn, frame, habit_logs):
+    from crud import HabitDAO
+    masks = HabitDAO(conn).fetch_schedule_masks()
+    today = date.today()
+    pd.testing.assert_frame_equal(frame.schedule_streaks(masks, today), analytics.schedule_streaks(habit_logs, masks, today))
+
+@pytest.mark.parametrize("filters", [{}, {"start": week_start, "end": week_end}, {"habit_name": "Meditation"},
+                                     {"category_name": "Health", "start": week_start - timedelta(weeks= 1)}])
+def test_productivity_histogram(frame, habit_logs, filters):
+    pd.testing.assert_frame_equal(frame.productivity_histogram(**filters), analytics.productivity_histogram(habit_logs, **filters))
+
+def test_best_productivity_periods(frame, habit_logs):
+    assert frame.weekly_best_productivity_period(week_start, week_end) == analytics.weekly_best_productivity_period(habit_logs, week_start, week_end)
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        assert frame.habit_most_productive_period(habit_name) == analytics.habit_most_productive_period(habit_logs, habit_name)
+
+def test_empty_frame():
+    frame = AnalyticsFrame.from_logs(None)
+    assert frame.completion_rate() == (0,0,0)
+    assert frame.category_completion_rate(None).empty
+    assert frame.habit_streaks(date.today()).empty
+
+@pytest.mark.parametrize("weeks", range(-5, 2))
+def test_completion_index_ranges(frame, habit_logs, weeks):
+    index = CompletionIndex.from_frame(frame)
+    start = week_start + timedelta(weeks= weeks)
+    end = start + timedelta(6)
+    assert index.completion_rate(start, end) == analytics.weekly_completion_rate(habit_logs, start, end)
+    pd.testing.assert_frame_equal(index.weekly_completion_day_per_day(start, end), frame.weekly_completion_day_per_day(start, end))
+    for period in ([start, end], start, None):
+        expected = frame.category_completion_rate(period)
+        result = index.category_completion_rate(period)
+        if expected.empty:
+            assert result.empty
+        else:
+            pd.testing.assert_frame_equal(result, expected)
+
+def test_completion_index_habit_and_category(frame, habit_logs):
+    index = CompletionIndex.from_frame(frame)
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        assert index.completion_rate(habit_name= habit_name) == analytics.habit_completion_rate(habit_logs, habit_name)
+    for category_name in {log["category_name"] for log in habit_logs}:
+        expected = analytics.category_completion_rate_per_category(habit_logs, category_name)
+        assert index.totals(category_name= category_name) == (expected["completed"].iloc[0], expected["total"].iloc[0])
+    assert index.completion_rate(habit_name= "Unknown") == (0,0,0)
+
+def test_completion_index_record(conn, habit_logs):
+    index = CompletionIndex.from_frame(AnalyticsFrame.from_logs([]))
+    for log in reversed(HabitLogDAO(conn).fetch_logs_columns().to_dict("records")):
+        index.record(log["date"].date(), log["habit_id"], log["habit_name"], log["category_name"], done= log["done"], total= 1)
+    assert index.completion_rate() == analytics.completion_rate(habit_logs)
+    assert index.completion_rate(week_start, week_end) == analytics.weekly_completion_rate(habit_logs, week_start, week_end)
+
+    done, total = index.totals(today_date, today_date)
+    index.record(today_date, 99, "New habit", "New category", done= 1, total= 1)
+    assert index.totals(today_date, today_date) == (done + 1, total + 1)
+    assert index.totals(category_name= "New category") == (1, 1)
+
+@pytest.mark.parametrize("log_storage", ["dense", "sparse"])
+def test_completion_index_record_update_done(conn, log_storage):
+    log_dao = HabitLogDAO(conn)
+    log_dao.set_log_storage(log_storage)
+    index = CompletionIndex.from_dao(log_dao)
+    today_logs = log_dao.fetch_today_habit_logs()
+    assert today_logs
+    #what the checkboxes of the app do: the logs of today only change their completions
+    for log in today_logs:
+        done = 1 - log["done"]
+        HabitDAO(conn).update_done(log["habit_id"], done)
+        index.record(today_date, log["habit_id"], log["habit_name"], log["category_name"], done= done - log["done"])
+    expected = CompletionIndex.from_dao(log_dao)
+    assert index.totals() == expected.totals()
+    assert index.totals(today_date, today_date) == expected.totals(today_date, today_date)
+    for habit_id in expected.habit_ids:
+        assert index.totals(habit_id= habit_id) == expected.totals(habit_id= habit_id)
+
+def test_completion_index_habits_sharing_a_name(conn):
+    conn.execute("UPDATE Habit SET name = 'Meditation' WHERE name = 'Morning Run'")
+    log_dao = HabitLogDAO(conn)
+    index = CompletionIndex.from_dao(log_dao)
+    ids = [row[0] for row in conn.execute("SELECT id FROM Habit WHERE name = 'Meditation' ORDER BY id")]
+    assert len(ids) == 2 and index.habit_names.count("Meditation") == 2
+    done, total = map(sum, zip(*(index.totals(habit_id= habit_id) for habit_id in ids)))
+    assert index.totals(habit_name= "Meditation") == (done, total)
+    for habit_id in ids:
+        logs = [row for row in conn.execute("SELECT done FROM HabitLog WHERE habit_id = ?", (habit_id,))]
+        assert index.totals(habit_id= habit_id) == (sum(row[0] for row in logs), len(logs))
+    rolling = index.rolling_completion_rates(windows= (7,), name= "Meditation")
+    assert not rolling["date"].duplicated().any()
+    done, total = index.totals(today_date, today_date, habit_id= ids[0])
+    index.record(today_date, ids[0], "Meditation", "Health", done= 1)
+    assert index.totals(today_date, today_date, habit_id= ids[0]) == (done + 1, total)
+
+def test_completion_index_rolling_rates(frame, habit_logs):
+    index = CompletionIndex.from_frame(frame)
+    rolling = index.rolling_completion_rates()
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        expected = analytics.habit_productivity_plot(habit_logs, habit_name)
+        result = index.rolling_completion_rates(name= habit_name)
+        pd.testing.assert_frame_equal(result, rolling[rolling["name"] == habit_name].reset_index(drop= True))
+        pd.testing.assert_frame_equal(result, expected, check_dtype= False)
+
+def test_completion_index_week_over_week(frame, habit_logs):
+    index = CompletionIndex.from_frame(frame)
+    result = index.week_over_week(today_date, by= None)
+    this_week = analytics.weekly_completion_rate(habit_logs, today_date - timedelta(6), today_date)
+    last_week = analytics.weekly_completion_rate(habit_logs, today_date - timedelta(13), today_date - timedelta(7))
+    assert result["this_week"].iloc[0] == pytest.approx(this_week[2]/100)
+    assert result["delta"].iloc[0] == pytest.approx((this_week[2] - last_week[2])/100)
+
+@pytest.mark.parametrize("weeks", range(-5, 2))
+def test_activity_cube_weekly_best_productivity_day(frame, habit_logs, weeks):
+    cube = ActivityCube.from_frame(frame)
+    start = week_start + timedelta(weeks= weeks)
+    assert cube.weekly_best_productivity_day(start) == analytics.weekly_best_productivity_day(habit_logs, start, start + timedelta(6))
+
+def test_activity_cube_slices(frame, habit_logs):
+    cube = ActivityCube.from_frame(frame)
+    for habit_name in {log["habit_name"] for log in habit_logs}:
+        assert cube.habit_most_productive_day(habit_name) == analytics.habit_most_productive_day(habit_logs, habit_name)
+    heatmap = cube.hour_heatmap(category_name= "Health")
+    assert heatmap.shape == (7, 24)
+    assert heatmap.sum(axis= 0).tolist() == analytics.productivity_histogram(habit_logs, category_name= "Health")["completions"].tolist()
+    completed, total = cube.weekday_counts(week_start, week_end)
+    assert (completed.sum(), total.sum() - completed.sum()) == analytics.weekly_completion_rate(habit_logs, week_start, week_end)[:2]
+    assert cube.habit_most_productive_day("Unknown") is None
+
+def test_activity_cube_record(conn, frame):
+    cube = ActivityCube.from_frame(AnalyticsFrame.from_logs([]))
+    log_dao = HabitLogDAO(conn)
+    for log in log_dao.fetch_logs_columns().to_dict("records"):
+        cube.record(log["date"].date(), log["habit_id"], log["habit_name"], log["category_name"], log["done"],
+                    None if pd.isna(log["complete_at"]) else str(log["complete_at"]))
+    expected = ActivityCube.from_frame(frame)
+    pd.testing.assert_frame_equal(cube.hour_heatmap(), expected.hour_heatmap())
+
+    habit_id = conn.execute("SELECT id FROM Habit WHERE name = 'Meditation'").fetchone()[0]
+    cube.record(today_date, habit_id, "Meditation", "Health", 1, f"{today_date} 23:10:00")
+    assert cube.hour_heatmap(today_date, today_date, habit_name= "Meditation").loc[today_date.strftime("%A"), "23-24"] == 1
+    cube.record(today_date, habit_id, "Meditation", "Health", None)
+    assert cube.weekday_counts(today_date, today_date, habit_id= habit_id)[1][today_date.weekday()] == 0
+
+def test_activity_cube_habits_sharing_a_name(conn):
+    conn.execute("UPDATE Habit SET name = 'Meditation' WHERE name = 'Morning Run'")
+    cube = ActivityCube.from_dao(HabitLogDAO(conn))
+    ids = [row[0] for row in conn.execute("SELECT id FROM Habit WHERE name = 'Meditation' ORDER BY id")]
+    counts = [cube.weekday_counts(habit_id= habit_id) for habit_id in ids]
+    for habit_id, (completed, total) in zip(ids, counts):
+        assert total.sum() == conn.execute("SELECT COUNT(*) FROM HabitLog WHERE habit_id = ?", (habit_id,)).fetchone()[0]
+    completed, total = cube.weekday_counts(habit_name= "Meditation")
+    assert total.tolist() == (counts[0][1] + counts[1][1]).tolist()
+    #a write to one of them leaves the other's cell alone
+    other = cube.weekday_counts(today_date, today_date, habit_id= ids[1])[1].tolist()
+    cube.record(today_date, ids[0], "Meditation", "Health", None)
+    assert cube.weekday_counts(today_date, today_date, habit_id= ids[0])[1][today_date.weekday()] == 0
+    assert cube.weekday_counts(today_date, today_date, habit_id= ids[1])[1].tolist() == other
+
+@pytest.mark.parametrize("log_storage", ["dense", "sparse"])
+def test_activity_cube_record_update_done(conn, log_storage):
+    log_dao = HabitLogDAO(conn)
+    log_dao.set_log_storage(log_storage)
+    cube = ActivityCube.from_dao(log_dao)
+    for log in log_dao.fetch_today_habit_logs():
+        HabitDAO(conn).update_done(log["habit_id"], 1 - log["done"])
+    for log in log_dao.fetch_today_habit_logs():
+        cube.record(today_date, log["habit_id"], log["habit_name"], log["category_name"], log["done"], log["complete_at"])
+    expected = ActivityCube.from_dao(log_dao)
+    pd.testing.assert_frame_equal(cube.hour_heatmap(), expected.hour_heatmap())
+    for result, counts in zip(cube.weekday_counts(), expected.weekday_counts()):
+        assert result.tolist() == counts.tolist()
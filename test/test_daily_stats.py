@@ -0,0 +1,70 @@
+import os
+import pytest
+import sqlite3
+from datetime import date, timedelta
+import analytics
+from database.database import migrate, MIGRATIONS_DIR
+from database.seed import seed_database
+from crud import HabitDAO, HabitLogDAO, StatDAO, CategoryDAO
+from logic import AnalyticsService
+
+today_date = date.today()
+week_start = today_date - timedelta(days= today_date.weekday())
+week_end = week_start + timedelta(6)
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, today_date)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def service(conn):
+    return AnalyticsService(HabitDAO(conn), CategoryDAO(conn), StatDAO(conn), HabitLogDAO(conn))
+
+def _assert_matches_logs(conn, service):
+    habit_logs = HabitLogDAO(conn).fetch_all_habits_logs() or []
+    assert service.daily_completion_rate(today_date) == pytest.approx(analytics.daily_completion_rate(habit_logs, today_date))
+    assert service.weekly_completion_rate(week_start, week_end) == pytest.approx(analytics.weekly_completion_rate(habit_logs, week_start, week_end))
+
+    expected = analytics.category_completion_rate(habit_logs, None)
+    result = service.category_completion_rate(None)
+    assert list(result["category_name"]) == list(expected["category_name"])
+    assert list(result["completed"]) == list(expected["completed"])
+    assert list(result["total"]) == list(expected["total"])
+
+    expected = analytics.weekly_completion_day_per_day(habit_logs, week_start, week_end)
+    result = service.weekly_completion_day_per_day(week_start, week_end)
+    assert result[["date", "date_label", "completed", "total"]].values.tolist() == expected[["date", "date_label", "completed", "total"]].values.tolist()
+
+
+def test_daily_stats_after_seed(conn, service):
+    _assert_matches_logs(conn, service)
+
+def test_daily_stats_after_update_done(conn, service):
+    habit_dao = HabitDAO(conn)
+    HabitLogDAO(conn).add_habit_logs([(1, 0, None, today_date.isoformat())])
+    habit_dao.update_done(1, 1)
+    _assert_matches_logs(conn, service)
+    habit_dao.update_done(1, 0)
+    _assert_matches_logs(conn, service)
+
+def test_daily_stats_after_category_change(conn, service):
+    HabitDAO(conn).update_habit("", "", 3, 1, [])
+    _assert_matches_logs(conn, service)
+
+def test_daily_stats_after_delete(conn, service):
+    HabitDAO(conn).delete_habit(2)
+    conn.execute("DELETE FROM HabitLog WHERE habit_id = 3 AND date < ?", ((today_date - timedelta(days= 5)).isoformat(),))
+    _assert_matches_logs(conn, service)
+
+def test_daily_stats_migration_backfill(conn):
+    before = conn.execute("SELECT * FROM DailyStats ORDER BY date, category_id").fetchall()
+    conn.execute("DELETE FROM DailyStats")
+    with open(os.path.join(MIGRATIONS_DIR, "0002_daily_stats.sql")) as f:
+        conn.executescript(f.read())
+    after = conn.execute("SELECT * FROM DailyStats ORDER BY date, category_id").fetchall()
+    assert [tuple(row) for row in after] == [tuple(row) for row in before if row["scheduled"] > 0]
@@ -0,0 +1,118 @@
+import pytest
+import sqlite3
+import database.database as database
+from database.database import ConnectionPool, db_conn, migrate, get_migrations
+from exception import DatabaseError
+
+#Schema as it was before the migrations existed (user_version 0)
+LEGACY_SCHEMA = """
+CREATE TABLE Category (id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT, create_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE Habit (id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT, category_id INTEGER NOT NULL,
+                    is_seed INTEGER DEFAULT 0, create_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE HabitLog (id INTEGER PRIMARY KEY, habit_id INTEGER NOT NULL, done INTEGER NOT NULL DEFAULT 0,
+                       complete_at TEXT, date TEXT NOT NULL DEFAULT CURRENT_DATE, UNIQUE(habit_id, date));
+CREATE TABLE HabitSchedule (id INTEGER PRIMARY KEY, habit_id INTEGER NOT NULL, day_of_the_week TEXT);
+CREATE TABLE HabitHistory (id INTEGER PRIMARY KEY, habit_id INTEGER NOT NULL, name TEXT NOT NULL, description TEXT,
+                           category_id INTEGER NOT NULL, create_at TEXT DEFAULT CURRENT_TIMESTAMP, delete_date TEXT);
+CREATE TABLE Settings (key TEXT NOT NULL, value TEXT, create_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP);
+"""
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "habit_tracker.db"), max_size= 2, timeout= 0.1)
+    yield pool
+    pool.close_all()
+
+
+def test_pool_applies_pragmas(pool):
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+    pool.release(conn)
+
+def test_pool_reuses_connection(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+def test_pool_is_bounded(pool):
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(DatabaseError):
+        pool.acquire()
+
+def test_pool_replaces_broken_connection(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    new_conn = pool.acquire()
+    assert new_conn is not conn
+    assert new_conn.execute("SELECT 1").fetchone()[0] == 1
+
+def test_pool_rolls_back_on_release(pool):
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE T (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO T VALUES (1)")
+    pool.release(conn)
+    conn = pool.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM T").fetchone()[0] == 0
+
+def _index_names(conn):
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall()
+    return {row[0] for row in rows}
+
+def test_migrate_fresh_database():
+    conn = sqlite3.connect(":memory:")
+    version = migrate(conn)
+    assert version == get_migrations()[-1][0]
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == version
+    assert "idx_habitlog_date_done" in _index_names(conn)
+
+def test_migrate_legacy_database():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(LEGACY_SCHEMA)
+    migrate(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == get_migrations()[-1][0]
+    assert {"idx_habitlog_date_done", "idx_habitlog_completed", "idx_habit_category"} <= _index_names(conn)
+
+def test_migrate_skips_current_database():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    conn.execute("DROP INDEX idx_habit_category")
+    migrate(conn)
+    assert "idx_habit_category" not in _index_names(conn)
+
+def test_migrate_backfills_schedule_mask():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO Category (name) VALUES ('Health')")
+    conn.execute("INSERT INTO Habit (name, category_id) VALUES ('Run', 1)")
+    conn.executemany("INSERT INTO HabitSchedule (habit_id, day_of_the_week) VALUES (1, ?)", [("Monday",), ("Sunday",), ("Sunday",)])
+    migrate(conn)
+    assert conn.execute("SELECT schedule_mask FROM Habit").fetchone()[0] == 0b1000001
+
+def test_db_conn_rolls_back_on_error(pool, monkeypatch):
+    monkeypatch.setattr(database, "_pool", pool)
+    with db_conn() as conn:
+        conn.execute("CREATE TABLE T (x INTEGER)")
+    with pytest.raises(ValueError):
+        with db_conn() as conn:
+            conn.execute("INSERT INTO T VALUES (1)")
+            raise ValueError
+    with db_conn() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM T").fetchone()[0] == 0
+
+def test_db_conn_releases_on_failed_commit(pool, monkeypatch):
+    monkeypatch.setattr(database, "_pool", pool)
+    with pytest.raises(sqlite3.IntegrityError):
+        with db_conn() as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("CREATE TABLE P (id INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TABLE C (p_id INTEGER REFERENCES P(id) DEFERRABLE INITIALLY DEFERRED)")
+            conn.execute("INSERT INTO C VALUES (1)")
+    #both slots of the pool are free again
+    pool.acquire()
+    pool.acquire()
@@ -0,0 +1,68 @@
+import pytest
+import sqlite3
+from datetime import date, timedelta
+import analytics
+from database.database import migrate
+from database.seed import seed_database
+from crud import HabitDAO, HabitLogDAO, StatDAO, CategoryDAO, DATE_DIM_MARGIN_DAYS, to_day_number
+from logic import AnalyticsService
+
+today_date = date.today()
+week_start = today_date - timedelta(days= today_date.weekday())
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, today_date)
+    yield conn
+    conn.close()
+
+@pytest.fixture(params= ["dense", "sparse"])
+def service(request, conn):
+    HabitLogDAO(conn).set_log_storage(request.param)
+    return AnalyticsService(HabitDAO(conn), CategoryDAO(conn), StatDAO(conn), HabitLogDAO(conn))
+
+def test_date_dim_attributes():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    start, end = StatDAO(conn).ensure_date_dim(date(2019, 12, 25), date(2027, 1, 5))
+    assert (start, end) == (to_day_number(date(2019, 12, 25)), to_day_number(date(2027, 1, 5)))
+    rows = conn.execute("SELECT * FROM DateDim WHERE day BETWEEN ? AND ? ORDER BY day", (start, end)).fetchall()
+    assert len(rows) == end - start + 1
+    for row in rows:
+        day = date.fromisoformat(row["date"])
+        assert (row["iso_year"], row["iso_week"], row["weekday"] + 1) == tuple(day.isocalendar())
+        assert (row["weekday_name"], row["month"], row["label"]) == (day.strftime("%A"), day.month, analytics.date_label(row["date"]))
+
+def test_date_dim_extends(conn):
+    dao = StatDAO(conn)
+    first_start, first_end = dao.ensure_date_dim()
+    days = conn.execute("SELECT COUNT(*) FROM DateDim").fetchone()[0]
+    assert days == first_end + DATE_DIM_MARGIN_DAYS - first_start + 1
+    dao.ensure_date_dim(today_date, today_date + timedelta(30))
+    assert conn.execute("SELECT COUNT(*) FROM DateDim").fetchone()[0] == days
+    start, end = dao.ensure_date_dim(date(2001, 1, 1), today_date)
+    assert conn.execute("SELECT MIN(day), COUNT(*) FROM DateDim").fetchone()[:] == (start, days + first_start - start)
+
+def test_reads_do_not_write_date_dim(conn, service):
+    conn.execute("DELETE FROM DateDim WHERE day >= ?", (to_day_number(today_date),))
+    conn.commit()
+    days = conn.execute("SELECT COUNT(*) FROM DateDim").fetchone()[0]
+    service.weekly_completion_day_per_day(week_start, week_start + timedelta(6))
+    analytics.weekly_best_productivity_day(HabitLogDAO(conn), week_start, week_start + timedelta(6))
+    assert conn.execute("SELECT COUNT(*) FROM DateDim").fetchone()[0] == days
+    HabitLogDAO(conn).sync_missing_logs()
+    assert conn.execute("SELECT MAX(day) FROM DateDim").fetchone()[0] == to_day_number(today_date) + DATE_DIM_MARGIN_DAYS
+
+def test_seed_fills_date_dim(conn):
+    first_log = conn.execute("SELECT MIN(day_num) FROM HabitLog").fetchone()[0]
+    assert conn.execute("SELECT MIN(day), MAX(day) FROM DateDim").fetchone()[:] == (first_log, to_day_number(today_date) + DATE_DIM_MARGIN_DAYS)
+
+def test_daily_stats_labels(conn, service):
+    habit_logs = HabitLogDAO(conn).fetch_all_habits_logs()
+    result = service.weekly_completion_day_per_day(week_start, week_start + timedelta(6))
+    expected = analytics.weekly_completion_day_per_day(habit_logs, week_start, week_start + timedelta(6))
+    assert list(result["date_label"]) == list(expected["date_label"])
@@ -74,4 +74,90 @@ def test_delete_habit(conn):
     habit_service.delete_habit(1)
     result = habit_dao.fetch_habit()
 
-    assert result is None or result == [] or len(result) == 0
\ No newline at end of file
+    assert result is None or result == [] or len(result) == 0
+def test_transaction_rollback(conn):
+    from crud import CategoryDAO
+    category_dao = CategoryDAO(conn)
+
+    with pytest.raises(ValueError):
+        with category_dao.transaction():
+            category_dao.add_category("Test Cat", "Testing")
+            raise ValueError("abort")
+
+    assert category_dao.fetch_category() == []
+
+def test_transaction_commit_once(conn):
+    from crud import CategoryDAO
+    category_dao = CategoryDAO(conn)
+
+    with category_dao.transaction():
+        category_dao.add_category("Test Cat", "Testing")
+        assert conn.in_transaction
+    assert not conn.in_transaction
+    assert len(category_dao.fetch_category()) == 1
+
+def test_transaction_nested_savepoint(conn):
+    from crud import HabitDAO, CategoryDAO
+    habit_dao = HabitDAO(conn)
+    category_dao = CategoryDAO(conn)
+
+    with category_dao.transaction():
+        category_dao.add_category("Test Cat", "Testing")
+        try:
+            with habit_dao.transaction():
+                habit_dao.add_habit("Test habit", "test", 1, ['Monday'])
+                raise ValueError("abort")
+        except ValueError:
+            pass
+
+    assert len(category_dao.fetch_category()) == 1
+    assert habit_dao.fetch_habit() == []
+    assert conn.execute("SELECT COUNT(*) FROM HabitSchedule").fetchone()[0] == 0
+
+def test_fetch_schedule_masks(conn):
+    from crud import CategoryDAO
+    import analytics
+    habit_dao = HabitDAO(conn)
+    CategoryDAO(conn).add_category("Test Cat", "Testing")
+    habit_dao.add_habit("Weekdays", "test", 1, analytics.WEEKDAYS[:5])
+    habit_dao.add_habit("Sunday", "test", 1, ["Sunday"])
+    habit_dao.add_habit("Never", "test", 1, [])
+
+    assert habit_dao.fetch_schedule_masks() == {"Weekdays": 0b0011111, "Sunday": 0b1000000, "Never": 0}
+    assert habit_dao.fetch_schedule_masks(2) == {"Sunday": 0b1000000}
+    assert habit_dao.fetch_schedule_masks(99) == {}
+
+def test_schedule_mask_follows_schedule(conn):
+    from crud import CategoryDAO
+    from logic import HabitService
+    from exception import HabitNotFound
+    habit_dao = HabitDAO(conn)
+    habit_service = HabitService(habit_dao)
+    CategoryDAO(conn).add_category("Test Cat", "Testing")
+    habit_dao.add_habit("Run", "test", 1, ["Monday", "Friday"])
+    habit_dao.add_habit("Read", "test", 1, ["Friday"])
+    assert habit_dao.fetch_schedule_masks() == {"Run": 0b0010001, "Read": 0b0010000}
+    assert list(habit_service.get_habit_by_day_df("Friday")["name"]) == ["Run", "Read"]
+
+    habit_dao.update_habit("", "", None, 1, ["Tuesday"])
+    assert habit_dao.fetch_schedule_masks()["Run"] == 0b0000010
+    assert list(habit_service.get_habit_by_day_df("Tuesday").columns) == ["name", "description", "category_name"]
+    with pytest.raises(HabitNotFound):
+        habit_service.get_habit_by_day_df("Monday")
+    conn.execute("DELETE FROM HabitSchedule WHERE habit_id = 2")
+    assert habit_dao.fetch_schedule_masks()["Read"] == 0
+
+def test_transaction_keeps_block_error(conn):
+    from crud import CategoryDAO, _transaction_depth
+    category_dao = CategoryDAO(conn)
+
+    #the block ends the transaction itself, so ROLLBACK TO its savepoint fails
+    with pytest.raises(ValueError, match= "abort"):
+        with category_dao.transaction():
+            category_dao.add_category("Test Cat", "Testing")
+            conn.rollback()
+            raise ValueError("abort")
+
+    assert conn not in _transaction_depth
+    assert not category_dao.in_transaction()
+    assert category_dao.fetch_category() == []
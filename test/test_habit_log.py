@@ -0,0 +1,161 @@
+import pytest
+import sqlite3
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta, timezone
+from database.database import migrate
+from crud import HabitLogDAO, to_day_number, from_day_number
+from exception import DatabaseError
+
+today_date = date.today()
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    conn.execute("INSERT INTO Category (name, description) VALUES ('Health', 'test')")
+    conn.execute("INSERT INTO Habit (name, description, category_id) VALUES ('Run', 'test', 1)")
+    conn.execute("INSERT INTO Habit (name, description, category_id) VALUES ('Read', 'test', 1)")
+    conn.executemany("INSERT INTO HabitSchedule (habit_id, day_of_the_week) VALUES (?, ?)",
+                     [(1, "Monday"), (1, "Friday"), (2, "Sunday")])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def _expected_logs(start, end, schedule):
+    expected = set()
+    current = start
+    while current <= end:
+        for habit_id, days in schedule.items():
+            if current.strftime("%A") in days:
+                expected.add((habit_id, current.isoformat()))
+        current += timedelta(1)
+    return expected
+
+
+def test_sync_missing_logs(conn):
+    last_date = today_date - timedelta(days= 40)
+    conn.execute("INSERT INTO HabitLog (habit_id, done, date) VALUES (1, 1, ?)", (last_date.isoformat(),))
+    HabitLogDAO(conn).sync_missing_logs()
+
+    rows = conn.execute("SELECT habit_id, date, done FROM HabitLog WHERE date > ?", (last_date.isoformat(),)).fetchall()
+    expected = _expected_logs(last_date + timedelta(1), today_date, {1: ["Monday", "Friday"], 2: ["Sunday"]})
+    assert {(row["habit_id"], row["date"]) for row in rows} == expected
+    assert all(row["done"] == 0 for row in rows)
+
+def test_sync_missing_logs_up_to_date(conn):
+    conn.execute("INSERT INTO HabitLog (habit_id, done, date) VALUES (1, 0, ?)", (today_date.isoformat(),))
+    HabitLogDAO(conn).sync_missing_logs()
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0] == 1
+
+def test_sync_missing_logs_empty(conn):
+    HabitLogDAO(conn).sync_missing_logs()
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0] == 0
+
+def test_insert_many_chunks(conn):
+    dao = HabitLogDAO(conn)
+    start = today_date - timedelta(days= 1500)
+    logs = ((1, i % 2, None, (start + timedelta(days= i)).isoformat()) for i in range(1200))
+    assert dao.add_habit_logs(logs) == 1200
+    assert conn.execute("SELECT COUNT(*), SUM(done) FROM HabitLog").fetchone()[:] == (1200, 600)
+    assert not conn.in_transaction
+
+def test_insert_many_rollback(conn):
+    dao = HabitLogDAO(conn)
+    rows = [(1, 0, today_date.isoformat()), (None, 0, today_date.isoformat())]
+    with pytest.raises(DatabaseError):
+        dao.insert_many("HabitLog", ["habit_id", "done", "date"], rows)
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0] == 0
+
+def test_execute_many(conn):
+    dao = HabitLogDAO(conn)
+    dao.add_habit_logs([(1, 0, None, "2026-01-01"), (1, 0, None, "2026-01-02")])
+    updated = dao.execute_many("UPDATE HabitLog SET done = 1 WHERE date = ?", (( d,) for d in ["2026-01-01", "2026-01-02"]), chunk_size= 1)
+    assert updated == 2
+    assert conn.execute("SELECT SUM(done) FROM HabitLog").fetchone()[0] == 2
+
+def test_iter_all_habits_logs(conn):
+    dao = HabitLogDAO(conn)
+    start = today_date - timedelta(days= 100)
+    dao.add_habit_logs((1 + i % 2, i % 3 == 0, None, (start + timedelta(days= i)).isoformat()) for i in range(50))
+
+    streamed = list(dao.iter_all_habits_logs(chunk_size= 7))
+    assert streamed == dao.fetch_all_habits_logs()
+
+    batches = list(dao.iter_all_habits_logs(chunk_size= 7, batches= True))
+    assert [len(batch) for batch in batches] == [7] * 7 + [1]
+    assert [log for batch in batches for log in batch] == streamed
+
+def test_iter_all_habits_logs_empty(conn):
+    assert list(HabitLogDAO(conn).iter_all_habits_logs()) == []
+
+def test_fetch_logs_columns(conn):
+    dao = HabitLogDAO(conn)
+    dao.add_habit_logs([(1, 1, "2026-03-02 08:15:00", "2026-03-02"), (1, 0, None, "2026-03-06"), (2, 1, "2026-03-08 21:00:00", "2026-03-08")])
+
+    df = dao.fetch_logs_columns()
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert df["done"].dtype == "uint8"
+    assert isinstance(df["habit_name"].dtype, pd.CategoricalDtype)
+    assert df["complete_at"].isna().sum() == 1
+
+    rows = dao.fetch_all_habits_logs()
+    assert list(df["habit_name"].astype(str)) == [row["habit_name"] for row in rows]
+    assert list(df["category_name"].astype(str)) == [row["category_name"] for row in rows]
+    assert list(df["done"]) == [row["done"] for row in rows]
+    assert list(df["date"].dt.strftime("%Y-%m-%d")) == [row["date"] for row in rows]
+
+def test_fetch_logs_columns_arrays(conn):
+    columns = HabitLogDAO(conn).fetch_logs_columns(as_frame= False)
+    assert columns["date"].dtype == np.dtype("datetime64[D]")
+    assert len(columns["done"]) == 0
+
+def test_day_numbers(conn):
+    dao = HabitLogDAO(conn)
+    dao.add_habit_logs([(1, 1, "2026-03-02 08:15:00", "2026-03-02"), (1, 0, None, "2026-03-06")])
+    rows = conn.execute("SELECT date, day_num, complete_ts FROM HabitLog ORDER BY date").fetchall()
+    assert [from_day_number(row["day_num"]).isoformat() for row in rows] == ["2026-03-02", "2026-03-06"]
+    assert rows[0]["complete_ts"] == int(datetime(2026, 3, 2, 8, 15, tzinfo= timezone.utc).timestamp())
+    assert rows[1]["complete_ts"] is None
+    assert to_day_number(date(2026, 3, 2)) == rows[0]["day_num"]
+
+def test_fetch_habit_logs_between(conn):
+    dao = HabitLogDAO(conn)
+    dao.add_habit_logs([(1, 1, None, "2026-03-01"), (1, 0, None, "2026-03-05"), (2, 1, None, "2026-03-09")])
+    logs = dao.fetch_habit_logs_between(date(2026, 3, 2), date(2026, 3, 9))
+    assert [log["date"] for log in logs] == ["2026-03-05", "2026-03-09"]
+
+    df = dao.fetch_logs_columns(start_date= date(2026, 3, 2), end_date= date(2026, 3, 5))
+    assert list(df["date"].dt.strftime("%Y-%m-%d")) == ["2026-03-05"]
+
+def test_fetch_habit_logs_per_habit(conn):
+    dao = HabitLogDAO(conn)
+    dao.add_habit_logs([(1, 1, None, "2026-03-01"), (1, 0, None, "2026-03-05"), (2, 1, None, "2026-03-09")])
+    assert sorted((log["habit_name"], log["date"]) for log in dao.fetch_habit_logs_per_habit(1)) == [("Run", "2026-03-01"), ("Run", "2026-03-05")]
+    assert dao.fetch_habit_logs_per_habit(3) == []
+
+def test_iter_all_habits_logs_range_ordered(conn):
+    dao = HabitLogDAO(conn)
+    start = today_date - timedelta(days= 30)
+    #inserted newest first
+    dao.add_habit_logs((1, 1, None, (start + timedelta(days= i)).isoformat()) for i in reversed(range(20)))
+
+    streamed = [log["date"] for log in dao.iter_all_habits_logs(chunk_size= 3, ordered= True)]
+    assert streamed == sorted(streamed)
+    between = list(dao.iter_all_habits_logs(start_date= start + timedelta(5), end_date= start + timedelta(9)))
+    assert [log["date"] for log in between] == [log["date"] for log in dao.fetch_habit_logs_between(start + timedelta(5), start + timedelta(9))]
+    assert len(between) == 5
+
+def test_aggregate_logs(conn):
+    dao = HabitLogDAO(conn)
+    conn.execute("INSERT INTO Category (name, description) VALUES ('Work', 'test')")
+    conn.execute("UPDATE Habit SET category_id = 2 WHERE id = 2")
+    dao.add_habit_logs([(1, 1, None, "2026-03-02"), (1, 0, None, "2026-03-06"), (2, 1, None, "2026-03-08"), (2, 1, None, "2026-03-09")])
+    assert [tuple(row) for row in dao.aggregate_logs()] == [(3, 4)]
+    assert [tuple(row) for row in dao.aggregate_logs(["habit_id"], start_date= date(2026, 3, 3))] == [(1, 0, 1), (2, 2, 2)]
+    assert [tuple(row) for row in dao.aggregate_logs(["iso_week", "weekday_name"], category_ids= [2])] == [(10, "Sunday", 1, 1), (11, "Monday", 1, 1)]
+    assert [tuple(row) for row in dao.aggregate_logs(["category_name"], habit_ids= [1], end_date= date(2026, 3, 5))] == [("Health", 1, 1)]
+    assert [tuple(row) for row in dao.aggregate_logs(["date"], habit_ids= [])] == []
+    with pytest.raises(ValueError):
+        dao.aggregate_logs(["hl.done; DROP TABLE HabitLog"])
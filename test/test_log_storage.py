@@ -0,0 +1,124 @@
+import pytest
+import sqlite3
+from datetime import date, timedelta
+import pandas as pd
+import analytics
+from database.database import migrate
+from database.seed import seed_database
+from crud import HabitDAO, HabitLogDAO, StatDAO, CategoryDAO
+from logic import AnalyticsService
+
+today_date = date.today()
+week_start = today_date - timedelta(days= today_date.weekday())
+week_end = week_start + timedelta(6)
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, today_date)
+    yield conn
+    conn.close()
+
+def _sorted_logs(logs):
+    return sorted(logs or [], key= lambda log: (log["date"], log["habit_name"]))
+
+def _snapshot(conn):
+    log_dao = HabitLogDAO(conn)
+    stat_dao = StatDAO(conn)
+    service = AnalyticsService(HabitDAO(conn), CategoryDAO(conn), stat_dao, log_dao)
+    habit_logs = log_dao.fetch_all_habits_logs()
+    columns = log_dao.fetch_logs_columns().sort_values(["date", "habit_id"]).reset_index(drop= True)
+    return {
+        "logs": _sorted_logs(habit_logs),
+        "between": _sorted_logs(log_dao.fetch_habit_logs_between(week_start, week_end)),
+        "iter": _sorted_logs(log_dao.iter_all_habits_logs(start_date= week_start - timedelta(weeks= 1))),
+        "today": sorted(map(tuple, HabitDAO(conn).fetch_today_habit_frame().sort_values("habit_id").values.tolist())),
+        "columns": columns,
+        "daily_stats": [tuple(row) for row in stat_dao.get_daily_stats()],
+        "category_stats": [tuple(row) for row in stat_dao.get_category_stats(week_start, week_end)],
+        "weekly_rate": service.weekly_completion_rate(week_start, week_end),
+        "completion_rate": analytics.completion_rate(habit_logs),
+        "streaks": analytics.habit_streaks(habit_logs, today_date),
+    }
+
+def test_sparse_logs_match_dense(conn):
+    dense = _snapshot(conn)
+    dense_rows = conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0]
+    HabitLogDAO(conn).set_log_storage("sparse")
+    assert HabitLogDAO(conn).log_storage() == "sparse"
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog WHERE done = 0").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0] < dense_rows
+
+    sparse = _snapshot(conn)
+    pd.testing.assert_frame_equal(sparse.pop("columns"), dense.pop("columns"))
+    pd.testing.assert_frame_equal(sparse.pop("streaks"), dense.pop("streaks"))
+    assert sparse == dense
+
+def test_sparse_to_dense_round_trip(conn):
+    rows = "SELECT habit_id, done, complete_at, date FROM HabitLog ORDER BY habit_id, date"
+    dense = [tuple(row) for row in conn.execute(rows)]
+    dao = HabitLogDAO(conn)
+    dao.set_log_storage("sparse")
+    dao.set_log_storage("dense")
+    assert [tuple(row) for row in conn.execute(rows)] == dense
+    assert conn.execute("SELECT COUNT(*) FROM Settings WHERE key = 'log_storage'").fetchone()[0] == 1
+
+def test_sparse_writes(conn):
+    log_dao = HabitLogDAO(conn)
+    habit_dao = HabitDAO(conn)
+    log_dao.set_log_storage("sparse")
+    rows = conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0]
+    log_dao.sync_missing_logs()
+    log_dao.add_daily_habit_log()
+    habit_dao.add_habit("Stretch", "test", 1, [today_date.strftime("%A")])
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog").fetchone()[0] == rows
+
+    habit_id = conn.execute("SELECT id FROM Habit WHERE name = 'Stretch'").fetchone()[0]
+    assert {"habit_id": habit_id, "name": "Stretch", "done": 0} in habit_dao.fetch_today_habit()
+    habit_dao.update_done(habit_id, 1)
+    assert {"habit_id": habit_id, "name": "Stretch", "done": 1} in habit_dao.fetch_today_habit()
+    assert StatDAO(conn).get_current_streak(today_date, habit_id) == 1
+    habit_dao.update_done(habit_id, 0)
+    assert {"habit_id": habit_id, "name": "Stretch", "done": 0} in habit_dao.fetch_today_habit()
+    assert conn.execute("SELECT COUNT(*) FROM HabitLog WHERE habit_id = ?", (habit_id,)).fetchone()[0] == 0
+    assert StatDAO(conn).get_current_streak(today_date, habit_id) == 0
+
+def test_unknown_log_storage(conn):
+    with pytest.raises(ValueError):
+        HabitLogDAO(conn).set_log_storage("compressed")
+
+def test_sparse_keeps_misses_not_derived(conn):
+    #a miss logged before the habit's creation date and one on a day no longer scheduled
+    habit_id, day = conn.execute("SELECT habit_id, date FROM HabitLog WHERE done = 0 ORDER BY date LIMIT 1").fetchone()
+    conn.execute("UPDATE Habit SET create_at = ? WHERE id = ?", (f"{date.fromisoformat(day) + timedelta(1)} 08:00:00", habit_id))
+    other_id, other_day = conn.execute("SELECT habit_id, date FROM HabitLog WHERE done = 0 AND habit_id != ? ORDER BY date DESC LIMIT 1", (habit_id,)).fetchone()
+    conn.execute("DELETE FROM HabitSchedule WHERE habit_id = ? AND day_of_the_week = ?", (other_id, date.fromisoformat(other_day).strftime("%A")))
+    conn.commit()
+    dense = _snapshot(conn)
+
+    HabitLogDAO(conn).set_log_storage("sparse")
+    kept = {tuple(row) for row in conn.execute("SELECT habit_id, date FROM HabitLog WHERE done = 0")}
+    assert {(habit_id, day), (other_id, other_day)} <= kept
+    sparse = _snapshot(conn)
+    pd.testing.assert_frame_equal(sparse.pop("columns"), dense.pop("columns"))
+    pd.testing.assert_frame_equal(sparse.pop("streaks"), dense.pop("streaks"))
+    assert sparse == dense
+
+def test_log_version(conn):
+    log_dao = HabitLogDAO(conn)
+    habit_dao = HabitDAO(conn)
+    version = log_dao.log_version()
+    _snapshot(conn)
+    assert log_dao.log_version() == version
+
+    habit = habit_dao.fetch_today_habit()[0]
+    habit_dao.update_done(habit["habit_id"], 1 - habit["done"])
+    assert log_dao.log_version() > version
+    version = log_dao.log_version()
+    log_dao.set_log_storage("sparse")
+    assert log_dao.log_version() > version
+    version = log_dao.log_version()
+    habit_dao.add_habit("Stretch", "test", 1, [today_date.strftime("%A")])
+    assert log_dao.log_version() > version
@@ -0,0 +1,83 @@
+import pytest
+import json
+import sqlite3
+from datetime import date
+import pandas as pd
+import analytics
+import report
+from crud import HabitLogDAO
+from database.database import migrate
+from database.seed import seed_database
+
+today_date = date.today()
+
+@pytest.fixture
+def databases(tmp_path):
+    paths = []
+    for member in ["alice", "bob", "carol"]:
+        (tmp_path / member).mkdir()
+        path = tmp_path / member / "habit_tracker.db"
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        migrate(conn)
+        seed_database(conn, today_date)
+        conn.close()
+        paths.append(str(path))
+    return tmp_path, paths
+
+
+def test_summarise_database(databases):
+    path = databases[1][0]
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    habit_logs = HabitLogDAO(conn).fetch_all_habits_logs()
+    conn.close()
+
+    summary = report.summarise_database(path, today_date)
+    assert summary["logs"] == len(habit_logs)
+    assert (summary["done"], summary["not_done"], summary["completion_rate"]) == analytics.completion_rate(habit_logs)
+    assert summary["longest_streak"] == analytics.longuest_daystreak([log for log in habit_logs if log["done"]])
+    categories = analytics.category_completion_rate(habit_logs, None)
+    assert summary["categories"] == dict(zip(categories["category_name"], categories["completion_rate"]))
+
+def test_summarise_unreadable_database(tmp_path):
+    path = tmp_path / "broken.db"
+    path.write_text("not a database")
+    assert "error" in report.summarise_database(str(path))
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_report(databases, workers):
+    directory, paths = databases
+    assert report.find_databases(directory) == paths
+    seen = []
+    summaries = report.generate_report(paths, workers, today_date, progress= seen.append)
+    assert [summary["database"] for summary in summaries] == paths
+    assert seen == summaries
+
+def test_main_writes_report(databases, tmp_path, capsys):
+    directory, paths = databases
+    output = tmp_path / "report.csv"
+    assert report.main([str(directory), "--workers", "1", "--output", str(output)]) == 0
+    df = pd.read_csv(output)
+    assert list(df["database"]) == paths
+    assert any(column.startswith("category:") for column in df.columns)
+    assert "3 databases" in capsys.readouterr().out
+
+    output = tmp_path / "report.json"
+    report.main([str(directory), "--workers", "2", "--output", str(output)])
+    with open(output) as f:
+        assert len(json.load(f)) == 3
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_report_with_empty_database(databases, workers):
+    directory, paths = databases
+    empty = directory / "dave" / "habit_tracker.db"
+    empty.parent.mkdir()
+    conn = sqlite3.connect(empty)
+    migrate(conn)
+    conn.close()
+    summaries = report.generate_report(report.find_databases(directory), workers, today_date)
+    summary = next(summary for summary in summaries if summary["database"] == str(empty))
+    assert "error" not in summary
+    assert (summary["logs"], summary["completion_rate"], summary["longest_streak"], summary["categories"]) == (0, 0, 0, {})
+    assert all("error" not in summary for summary in summaries)
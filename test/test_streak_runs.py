@@ -0,0 +1,125 @@
+import pytest
+import random
+import sqlite3
+from datetime import date, timedelta
+import analytics
+from database.database import migrate
+from database.seed import seed_database
+from crud import HabitDAO, HabitLogDAO, StatDAO, ANY_HABIT_STREAK_ID
+
+today_date = date.today()
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database(conn, today_date)
+    yield conn
+    conn.close()
+
+def _runs(conn, habit_id):
+    rows = conn.execute("SELECT start_date, end_date, length FROM StreakRun WHERE habit_id = ? ORDER BY start_date", (habit_id,)).fetchall()
+    return [tuple(row) for row in rows]
+
+def _expected_runs(days):
+    runs = []
+    for day in sorted(days):
+        if runs and runs[-1][1] == day - timedelta(1):
+            runs[-1] = (runs[-1][0], day, runs[-1][2] + 1)
+        else:
+            runs.append((day, day, 1))
+    return [(start.isoformat(), end.isoformat(), length) for start, end, length in runs]
+
+
+def test_streak_runs_match_analytics(conn):
+    stat_dao = StatDAO(conn)
+    rows = stat_dao.get_habit_streak()
+    habit_logs = HabitLogDAO(conn).fetch_all_habits_logs()
+
+    assert stat_dao.get_current_streak(today_date) == analytics.current_daystreak(rows, today_date)
+    assert stat_dao.get_longest_streak() == analytics.longuest_daystreak(rows)
+    assert stat_dao.get_longest_habit_streaks() == analytics.longuest_habit_streak(habit_logs)
+
+def test_streak_runs_incremental(conn):
+    habit_dao = HabitDAO(conn)
+    conn.execute("DELETE FROM StreakRun WHERE habit_id = 1")
+    days = set()
+    random.seed(4)
+    for _ in range(300):
+        day = today_date - timedelta(days= random.randint(0, 40))
+        if random.random() < 0.6:
+            habit_dao._add_streak_day(1, day)
+            days.add(day)
+        else:
+            habit_dao._remove_streak_day(1, day)
+            days.discard(day)
+        assert _runs(conn, 1) == _expected_runs(days)
+
+def test_update_done_streak_runs(conn):
+    habit_dao = HabitDAO(conn)
+    stat_dao = StatDAO(conn)
+    HabitLogDAO(conn).add_habit_logs([(habit_id, 0, None, today_date.isoformat()) for habit_id in range(1, 6)])
+
+    for habit_id in range(1, 6):
+        habit_dao.update_done(habit_id, 1)
+    assert stat_dao.get_current_streak(today_date, habit_id= 2) >= 1
+    assert stat_dao.get_current_streak(today_date) >= 1
+
+    for habit_id in range(1, 6):
+        habit_dao.update_done(habit_id, 0)
+    rows = stat_dao.get_habit_streak()
+    assert stat_dao.get_current_streak(today_date) == analytics.current_daystreak(rows, today_date)
+    assert stat_dao.get_longest_streak() == analytics.longuest_daystreak(rows)
+    assert _runs(conn, ANY_HABIT_STREAK_ID)[-1][1] < today_date.isoformat()
+
+def test_delete_habit_streak_runs():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    conn.execute("INSERT INTO Category (id, name) VALUES (1, 'Health')")
+    conn.executemany("INSERT INTO Habit (id, name, category_id) VALUES (?, ?, 1)", [(1, "A"), (2, "B")])
+    HabitLogDAO(conn).add_habit_logs([(1, 1, None, (today_date - timedelta(day)).isoformat()) for day in range(6)]
+                                     + [(2, 1, None, (today_date - timedelta(10)).isoformat())])
+    habit_dao = HabitDAO(conn)
+    stat_dao = StatDAO(conn)
+    assert (stat_dao.get_current_streak(today_date), stat_dao.get_longest_streak()) == (6, 6)
+
+    habit_dao.delete_habit(1)
+    done_logs = [log for log in HabitLogDAO(conn).fetch_all_habits_logs() if log["done"]]
+    expected = (analytics.current_daystreak(done_logs, today_date), analytics.longuest_daystreak(done_logs))
+    assert expected == stat_dao.get_daystreaks(today_date) == (0, 1)
+    assert (stat_dao.get_current_streak(today_date), stat_dao.get_longest_streak()) == expected
+
+    #the deleted habit's log of today must not keep today in the "any habit done" runs
+    habit_dao.add_habit("C", "", 1, [today_date.strftime("%A")])
+    habit_id = conn.execute("SELECT id FROM Habit WHERE name = 'C'").fetchone()[0]
+    habit_dao.update_done(habit_id, 1)
+    assert stat_dao.get_current_streak(today_date) == 1
+    habit_dao.update_done(habit_id, 0)
+    assert (stat_dao.get_current_streak(today_date), stat_dao.get_longest_streak()) == expected
+    conn.close()
+
+@pytest.mark.parametrize("today", [today_date, today_date + timedelta(1), today_date + timedelta(2), None])
+def test_window_function_streaks_match_analytics(conn, today):
+    stat_dao = StatDAO(conn)
+    habit_logs = HabitLogDAO(conn).fetch_all_habits_logs()
+    done_logs = [log for log in habit_logs if log["done"]]
+
+    expected = analytics.habit_streaks(habit_logs, today)
+    result = stat_dao.get_habit_streaks(today)
+    assert [tuple(row.values()) for row in result] == list(expected.itertuples(index= False, name= None))
+    assert {row["habit_name"]: row["longest_streak"] for row in result} == stat_dao.get_longest_habit_streaks()
+    current, longest = stat_dao.get_daystreaks(today)
+    assert longest == analytics.longuest_daystreak(done_logs)
+    assert current == (analytics.current_daystreak(done_logs, today) if today else 0)
+    if today == today_date:
+        from logic import AnalyticsService
+        assert AnalyticsService(None, None, stat_dao, None).get_habit_streak() == current == stat_dao.get_current_streak(today)
+
+def test_window_function_streaks_empty():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    assert StatDAO(conn).get_habit_streaks(today_date) == []
+    assert StatDAO(conn).get_daystreaks(today_date) == (0, 0)